@@ -162,8 +162,117 @@ CORS_ALLOWED_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'idempotency-key',
     'origin',
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
 ]
+
+# 추천 점수 계산 설정 (부하 시 규칙 기반 점수로 자동 전환)
+AI_SCORING = {
+    'SCORING_BUDGET_MS': float(os.getenv('AI_SCORING_BUDGET_MS', 300)),      # ML 점수 계산 허용 시간
+    'MAX_INFLIGHT_ML': int(os.getenv('AI_SCORING_MAX_INFLIGHT', 8)),         # 워커당 ML 점수 계산 동시 요청 수
+    'PROBE_INTERVAL_SECONDS': float(os.getenv('AI_SCORING_PROBE_INTERVAL', 5)),
+}
+
+# 추천 요청 마감 시간 설정 (각 단계는 남은 시간만큼만 외부 호출을 기다림)
+AI_DEADLINE = {
+    'REQUEST_BUDGET_SECONDS': float(os.getenv('AI_REQUEST_BUDGET_SECONDS', 8)),  # /recommend/ 요청당 전체 예산
+    'GEMINI_TIMEOUT_SECONDS': float(os.getenv('AI_GEMINI_TIMEOUT_SECONDS', 5)),   # Gemini 호출 최대 대기 시간
+    'GEMINI_MIN_SECONDS': float(os.getenv('AI_GEMINI_MIN_SECONDS', 1)),           # 남은 시간이 이보다 적으면 Gemini 생략
+    'CORE_TIMEOUT_SECONDS': float(os.getenv('AI_CORE_TIMEOUT_SECONDS', 10)),      # Core 서비스 호출 최대 대기 시간
+}
+
+# 의미 기반 intro 매칭 (python manage.py build_semantic_index 로 인덱스 생성 후 사용)
+AI_SEMANTIC_MATCHING = {
+    'ENABLED': os.getenv('AI_SEMANTIC_MATCHING', 'false').lower() == 'true',
+    'INDEX_PATH': os.path.join(BASE_DIR, 'ml_models', 'semantic_index.joblib'),
+    'SIMILARITY_FLOOR': 0.1,    # 이 값 이하의 유사도는 0점
+    'SIMILARITY_CEILING': 0.6,  # 이 값 이상의 유사도는 1점
+}
+
+# 카테고리 추론 LLM 설정 (BACKEND=fake 이면 네트워크 없이 로컬 가짜 모델 사용)
+AI_LLM = {
+    'BACKEND': os.getenv('AI_LLM_BACKEND', 'gemini'),
+    'MODEL': os.getenv('AI_LLM_MODEL', 'gemini-1.5-flash'),
+    # 이 시간 안에 들어온 요청을 한 번에 호출 (gthread 등 스레드 워커에서만 설정: sync 워커에서는 기다리기만 함)
+    'BATCH_WINDOW_MS': float(os.getenv('AI_LLM_BATCH_WINDOW_MS', 0)),
+    'MAX_BATCH_SIZE': int(os.getenv('AI_LLM_MAX_BATCH_SIZE', 16)),
+    'MAX_CONCURRENCY': int(os.getenv('AI_LLM_MAX_CONCURRENCY', 4)),     # 워커당 동시 LLM 호출 수
+    'FAKE_LATENCY_MS': float(os.getenv('AI_LLM_FAKE_LATENCY_MS', 0)),
+}
+
+# 캐시 설정 (REDIS_URL이 있으면 워커 간 공유되는 Redis, 없으면 워커별 메모리 캐시)
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'ai_service',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ai_service',
+        }
+    }
+
+# 사용자별 intro 키워드 특징 캐시 (워커별, 최근에 점수를 계산한 사용자 수만큼 보관)
+AI_PROFILE_FEATURES = {
+    'MAX_ENTRIES': int(os.getenv('AI_PROFILE_FEATURES_MAX_ENTRIES', 100000)),
+}
+
+# 빈 결과 캐시 (네트워크가 없는 사용자, 프로필이 없는 사용자는 짧은 시간 동안 바로 빈 추천 응답)
+AI_NEGATIVE_CACHE = {
+    'ENABLED': os.getenv('AI_NEGATIVE_CACHE', 'true').lower() == 'true',
+    'CACHE_ALIAS': 'default',
+    'EMPTY_GRAPH_TTL_SECONDS': int(os.getenv('AI_EMPTY_GRAPH_TTL_SECONDS', 60)),
+    'MISSING_PROFILE_TTL_SECONDS': int(os.getenv('AI_MISSING_PROFILE_TTL_SECONDS', 60)),
+}
+
+# /recommend/ 요청 허용 제어 (REDIS_URL이 있으면 토큰 버킷을 워커 간 공유, 없으면 워커별)
+AI_ADMISSION = {
+    'ENABLED': os.getenv('AI_ADMISSION', 'true').lower() == 'true',
+    'REDIS_URL': os.getenv('REDIS_URL'),
+    'USER_RATE_PER_SECOND': float(os.getenv('AI_ADMISSION_USER_RATE', 1)),      # 사용자별 초당 허용 요청 수
+    'USER_BURST': float(os.getenv('AI_ADMISSION_USER_BURST', 5)),
+    'GLOBAL_RATE_PER_SECOND': float(os.getenv('AI_ADMISSION_GLOBAL_RATE', 50)),  # 전체 초당 허용 요청 수
+    'GLOBAL_BURST': float(os.getenv('AI_ADMISSION_GLOBAL_BURST', 100)),
+    # 워커당 동시 처리 요청 수 (gthread 등 스레드 워커용: 기본 sync 워커는 한 번에 1건만 처리하므로 효과 없음)
+    'MAX_INFLIGHT_PER_WORKER': int(os.getenv('AI_ADMISSION_MAX_INFLIGHT', 16)),
+}
+
+# 중복 추천 요청 제거 (같은 요청은 처리 중인 결과를 공유하고, 짧은 시간 동안 저장된 응답을 재전송)
+AI_IDEMPOTENCY = {
+    'ENABLED': os.getenv('AI_IDEMPOTENCY', 'true').lower() == 'true',
+    'CACHE_ALIAS': 'default',
+    'REPLAY_TTL_SECONDS': int(os.getenv('AI_IDEMPOTENCY_REPLAY_TTL_SECONDS', 10)),
+    # 처리 중 표시 유지 시간 (처리하던 워커가 죽어도 이 시간이 지나면 다른 워커가 다시 처리, gunicorn timeout 이상)
+    'LOCK_TTL_SECONDS': int(os.getenv('AI_IDEMPOTENCY_LOCK_TTL_SECONDS', 30)),
+    'POLL_INTERVAL_SECONDS': float(os.getenv('AI_IDEMPOTENCY_POLL_INTERVAL_SECONDS', 0.05)),
+}
+
+# 활성 사용자 추천 후보 사전 계산 (python manage.py precompute_candidates 를 야간 배치로 실행)
+AI_PRECOMPUTE = {
+    'ENABLED': os.getenv('AI_PRECOMPUTE', 'true').lower() == 'true',
+    'MAX_AGE_SECONDS': int(os.getenv('AI_PRECOMPUTE_MAX_AGE_SECONDS', 36 * 3600)),  # 이보다 오래된 목록은 실시간 계산
+    'ACTIVE_DAYS': int(os.getenv('AI_PRECOMPUTE_ACTIVE_DAYS', 30)),
+    # 이 수 이하의 추천 요청은 실시간 계산과 같은 결과 (RecommendationRequestSerializer의 최대값)
+    'MAX_RECOMMENDATIONS': int(os.getenv('AI_PRECOMPUTE_MAX_RECOMMENDATIONS', 10)),
+}
+
+# 후보가 아주 많은 요청의 점수 계산을 프로세스 풀로 분산 (워커마다 PROCESSES개의 자식 프로세스 사용)
+AI_SHARDED_SCORING = {
+    'ENABLED': os.getenv('AI_SHARDED_SCORING', 'false').lower() == 'true',
+    'PROCESSES': int(os.getenv('AI_SHARDED_SCORING_PROCESSES', min(os.cpu_count() or 1, 8))),
+    'MIN_CANDIDATES': int(os.getenv('AI_SHARDED_SCORING_MIN_CANDIDATES', 5000)),  # 이 수 이상이면 분산 계산
+    'MIN_SHARD_SIZE': int(os.getenv('AI_SHARDED_SCORING_MIN_SHARD_SIZE', 1000)),
+}
+
+# 지역 조건 추천용 시/도, 시/군/구 색인 (전체 프로필 수집 결과로 REFRESH_SECONDS에 한 번 갱신)
+AI_LOCATION_INDEX = {
+    'REFRESH_SECONDS': float(os.getenv('AI_LOCATION_INDEX_REFRESH_SECONDS', 60)),
+}
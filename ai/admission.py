@@ -0,0 +1,240 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# 토큰 버킷 한 번 갱신 (KEYS[1]=버킷 키, ARGV=[초당 충전량, 최대 토큰 수]) -> 기다려야 할 초 (0이면 통과)
+# 워커 간 시계 차이가 없도록 Redis 서버 시간을 사용
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+# 토큰 1개 반환 (KEYS[1]=버킷 키, ARGV=[최대 토큰 수]) - 뒤 단계에서 거절된 요청이 쓴 토큰을 되돌림
+_REDIS_TOKEN_REFUND_SCRIPT = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + 1)))
+end
+return 0
+"""
+
+
+def admission_setting(name: str, default: Any) -> Any:
+    """AI_ADMISSION 설정값 조회"""
+    return getattr(settings, 'AI_ADMISSION', {}).get(name, default)
+
+
+class LocalTokenBucketStore:
+    """워커 메모리 토큰 버킷 (워커별로 따로 집계)
+
+    토큰이 다시 가득 찬 버킷은 처음 만든 버킷과 같으므로 prune_interval마다 정리합니다.
+    """
+
+    def __init__(self, prune_interval: float = 60.0):
+        self.prune_interval = prune_interval
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}  # 키 -> (남은 토큰, 갱신 시각, 가득 차는 시각)
+        self._pruned_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: str, rate: float, burst: float) -> float:
+        """토큰 1개 사용, 부족하면 다시 시도할 수 있을 때까지의 초 반환 (0이면 통과)"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._pruned_at >= self.prune_interval:
+                self._prune(now)
+            tokens, updated_at, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+        return wait
+
+    def refund(self, key: str, rate: float, burst: float):
+        """take()로 사용한 토큰 1개 반환"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            tokens, updated_at, _ = bucket
+            tokens = min(burst, tokens + 1)
+            self._buckets[key] = (tokens, updated_at, updated_at + (burst - tokens) / rate)
+
+    def _prune(self, now: float):
+        """토큰이 다시 가득 찬(오래 쓰지 않은) 버킷 제거 (lock 안에서 호출)"""
+        idle = [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for key in idle:
+            del self._buckets[key]
+        self._pruned_at = now
+
+
+class RedisTokenBucketStore:
+    """Redis 토큰 버킷 (Lua 스크립트로 원자적으로 갱신, 모든 워커가 공유)"""
+
+    def __init__(self, url: Optional[str] = None, key_prefix: str = 'ai:admission:', client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self.key_prefix = key_prefix
+        self._client = client
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET_SCRIPT)
+        self._refund_script = self._client.register_script(_REDIS_TOKEN_REFUND_SCRIPT)
+
+    def take(self, key: str, rate: float, burst: float) -> float:
+        return float(self._script(keys=[self.key_prefix + key], args=[rate, burst]))
+
+    def refund(self, key: str, rate: float, burst: float):
+        self._refund_script(keys=[self.key_prefix + key], args=[burst])
+
+
+class AdmissionDecision:
+    """요청 허용 여부 (허용된 요청은 처리가 끝나면 release() 호출)"""
+
+    def __init__(self, allowed: bool, status_code: int = 200, retry_after: float = 0.0, reason: str = 'ok',
+                 controller: Optional['AdmissionController'] = None):
+        self.allowed = allowed
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+        self._controller = controller
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After 헤더 값 (정수 초, 최소 1초)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+    def release(self):
+        if self._controller is not None:
+            self._controller._release()
+            self._controller = None
+
+
+class AdmissionController:
+    """/recommend/ 앞단의 요청 허용 제어
+
+    - 워커당 동시 처리 수 한도 초과 -> 503 (대기열에 쌓지 않고 즉시 거절, 스레드 워커에서만 의미 있음)
+    - 사용자별 토큰 버킷 초과 -> 429
+    - 전체 토큰 버킷 초과 -> 503
+    토큰 저장소 장애 시에는 요청을 허용합니다.
+    """
+
+    def __init__(self, store, user_rate: float = 1.0, user_burst: float = 5, global_rate: float = 50.0,
+                 global_burst: float = 100, max_inflight: int = 16):
+        self.store = store
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.max_inflight = max_inflight
+        self._inflight = threading.BoundedSemaphore(max_inflight)
+
+    @classmethod
+    def from_settings(cls) -> 'AdmissionController':
+        redis_url = admission_setting('REDIS_URL', None)
+        store = None
+        if redis_url:
+            try:
+                store = RedisTokenBucketStore(redis_url)
+            except Exception as e:
+                logger.error(f"Redis 토큰 버킷 초기화 실패, 워커 메모리 토큰 버킷을 사용합니다: {e}")
+        return cls(
+            store or LocalTokenBucketStore(),
+            user_rate=admission_setting('USER_RATE_PER_SECOND', 1.0),
+            user_burst=admission_setting('USER_BURST', 5),
+            global_rate=admission_setting('GLOBAL_RATE_PER_SECOND', 50.0),
+            global_burst=admission_setting('GLOBAL_BURST', 100),
+            max_inflight=admission_setting('MAX_INFLIGHT_PER_WORKER', 16),
+        )
+
+    def try_admit(self, user_id: Any) -> AdmissionDecision:
+        """요청 허용 여부 판단 (거절된 요청은 토큰/슬롯을 쓰지 않음)"""
+        if not self._inflight.acquire(blocking=False):
+            return self._reject(503, 1.0, 'inflight')
+
+        wait = self._take(f'user:{user_id}', self.user_rate, self.user_burst)
+        if wait > 0:
+            self._inflight.release()
+            return self._reject(429, wait, 'user_rate')
+        wait = self._take('global', self.global_rate, self.global_burst)
+        if wait > 0:
+            # 처리하지 않는 요청이 사용자 한도를 쓰지 않도록 사용자 토큰은 반환
+            self._refund(f'user:{user_id}', self.user_rate, self.user_burst)
+            self._inflight.release()
+            return self._reject(503, wait, 'global_rate')
+
+        metrics.increment('admission.admitted')
+        return AdmissionDecision(True, controller=self)
+
+    def _take(self, key: str, rate: float, burst: float) -> float:
+        try:
+            return self.store.take(key, rate, burst)
+        except Exception as e:
+            metrics.increment('admission.store_errors')
+            logger.warning(f"토큰 버킷 조회 실패, 요청을 허용합니다: {e}")
+            return 0.0
+
+    def _refund(self, key: str, rate: float, burst: float):
+        try:
+            self.store.refund(key, rate, burst)
+        except Exception as e:
+            metrics.increment('admission.store_errors')
+            logger.warning(f"토큰 반환 실패: {e}")
+
+    def _release(self):
+        self._inflight.release()
+
+    @staticmethod
+    def _reject(status_code: int, retry_after: float, reason: str) -> AdmissionDecision:
+        metrics.increment('admission.shed')
+        metrics.increment(f'admission.shed.{reason}')
+        return AdmissionDecision(False, status_code=status_code, retry_after=retry_after, reason=reason)
+
+
+class _AdmitAll:
+    """허용 제어가 꺼져 있을 때 사용"""
+
+    def try_admit(self, user_id: Any) -> AdmissionDecision:
+        return AdmissionDecision(True)
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """프로세스 전역 허용 제어기 (AI_ADMISSION['ENABLED']가 꺼져 있으면 모두 허용)"""
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController.from_settings() if admission_setting('ENABLED', True) else _AdmitAll()
+    return _controller
@@ -0,0 +1,66 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+
+from . import metrics
+
+
+def deadline_setting(name: str, default: float) -> float:
+    """AI_DEADLINE 설정값 조회"""
+    return getattr(settings, 'AI_DEADLINE', {}).get(name, default)
+
+
+class Deadline:
+    """요청 단위 마감 시간 (추천 파이프라인 각 단계에 남은 시간 예산을 전달)"""
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+        self.missed_stages = []
+
+    @classmethod
+    def from_settings(cls) -> 'Deadline':
+        return cls(deadline_setting('REQUEST_BUDGET_SECONDS', 8.0))
+
+    @classmethod
+    def unlimited(cls) -> 'Deadline':
+        """마감 없는 요청 (배치 작업, 관리 명령 등)"""
+        return cls(float('inf'))
+
+    def remaining(self) -> float:
+        """남은 시간(초), 0 이상"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def remaining_ms(self) -> float:
+        return self.remaining() * 1000
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started_at) * 1000
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def allows(self, seconds: float) -> bool:
+        """남은 시간이 seconds 이상인지 (선택 단계를 실행할지 판단할 때 사용)"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """외부 호출에 넘길 timeout: 남은 시간과 cap 중 작은 값"""
+        remaining = self.remaining()
+        if cap is not None:
+            remaining = min(remaining, cap)
+        return max(remaining, 0.001)
+
+    def miss(self, stage: str):
+        """마감 때문에 단계를 건너뛰었거나 시간 초과된 경우 기록"""
+        self.missed_stages.append(stage)
+        metrics.increment('deadline.miss')
+        metrics.increment(f'deadline.miss.{stage}')
+
+    @property
+    def partial(self) -> bool:
+        """마감으로 인해 일부 단계가 생략된 결과인지"""
+        return bool(self.missed_stages)
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+SCORER_ML = 'ml'
+SCORER_RULE_BASED = 'rule_based'
+
+
+class AdaptiveScorerSelector:
+    """부하 상황에 따라 ML 모델과 규칙 기반 점수 계산 중 하나를 선택
+
+    - 모델이 없으면 규칙 기반
+    - 워커 내 동시 처리 중인 요청 수가 임계값을 넘으면 규칙 기반 (load shedding)
+    - 요청 마감까지 남은 시간이 최근 ML 점수 계산 시간보다 짧으면 규칙 기반
+    - 최근 ML 점수 계산 시간이 예산을 넘으면 규칙 기반 (probe_interval마다 ML을 다시 시도)
+    """
+
+    def __init__(self, scoring_budget_ms: float = 300, max_inflight: int = 8,
+                 probe_interval: float = 5.0, ewma_alpha: float = 0.3):
+        self.scoring_budget_ms = scoring_budget_ms
+        self.max_inflight = max_inflight
+        self.probe_interval = probe_interval
+        self.ewma_alpha = ewma_alpha
+        self._lock = threading.Lock()
+        self._inflight = 0
+        # ML 점수 계산 시간(ms)의 지수이동평균과 마지막 측정 시각
+        self._ml_latency_ms: Optional[float] = None
+        self._last_ml_at = 0.0
+
+    @classmethod
+    def from_settings(cls) -> 'AdaptiveScorerSelector':
+        config = getattr(settings, 'AI_SCORING', {})
+        return cls(
+            scoring_budget_ms=config.get('SCORING_BUDGET_MS', 300),
+            max_inflight=config.get('MAX_INFLIGHT_ML', 8),
+            probe_interval=config.get('PROBE_INTERVAL_SECONDS', 5.0),
+        )
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def ml_latency_ms(self) -> Optional[float]:
+        return self._ml_latency_ms
+
+    @contextmanager
+    def track_request(self):
+        """추천 요청 처리 구간을 동시 처리 수에 반영"""
+        with self._lock:
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def choose(self, model_available: bool, remaining_ms: Optional[float] = None) -> Tuple[str, str]:
+        """(사용할 scorer, 선택 사유) 반환 (remaining_ms: 요청 마감까지 남은 시간)"""
+        if not model_available:
+            return SCORER_RULE_BASED, 'model_unavailable'
+        if self._inflight > self.max_inflight:
+            return SCORER_RULE_BASED, 'load_shed'
+        if remaining_ms is not None and remaining_ms < (self._ml_latency_ms or 0.0):
+            return SCORER_RULE_BASED, 'deadline'
+        if self._ml_latency_ms is not None and self._ml_latency_ms > self.scoring_budget_ms:
+            # 느려진 상태가 계속되는지 주기적으로 ML을 다시 시도해 확인
+            if time.monotonic() - self._last_ml_at < self.probe_interval:
+                return SCORER_RULE_BASED, 'latency_budget'
+        return SCORER_ML, 'ok'
+
+    def record_ml_latency(self, elapsed_seconds: float, n_candidates: int):
+        """ML 점수 계산 소요 시간 기록"""
+        elapsed_ms = elapsed_seconds * 1000
+        with self._lock:
+            if self._ml_latency_ms is None:
+                self._ml_latency_ms = elapsed_ms
+            else:
+                self._ml_latency_ms += self.ewma_alpha * (elapsed_ms - self._ml_latency_ms)
+            self._last_ml_at = time.monotonic()
+        if elapsed_ms > self.scoring_budget_ms:
+            metrics.increment('scoring.latency_budget_exceeded')
+            logger.warning(f"ML 점수 계산이 예산을 초과했습니다: {elapsed_ms:.1f}ms ({n_candidates}명)")
+
+
+_selector: Optional[AdaptiveScorerSelector] = None
+_selector_lock = threading.Lock()
+
+
+def get_scorer_selector() -> AdaptiveScorerSelector:
+    """프로세스 전역 scorer 선택기"""
+    global _selector
+    if _selector is None:
+        with _selector_lock:
+            if _selector is None:
+                _selector = AdaptiveScorerSelector.from_settings()
+    return _selector
@@ -0,0 +1,170 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ConnectionFeedback, ConnectionRequest, RecommendationLog
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+# 워터마크를 현재 시각보다 늦추는 시간 (생성 중인 행이 커밋될 여유)
+EXPORT_SAFETY_LAG_SECONDS = 5
+
+# CSV는 추천 로그 한 건당 한 줄 (로그가 없는 요청은 로그 컬럼을 비운 한 줄)
+CSV_COLUMNS = [
+    'request_id', 'requester_user_id', 'request_text', 'inferred_category', 'status', 'request_created_at',
+    'log_id', 'recommended_user', 'introducer_user', 'relationship_degree', 'ai_score', 'is_selected',
+    'log_created_at', 'feedback_final_user', 'feedback_satisfaction_score', 'feedback_reward_sent',
+    'feedback_created_at',
+]
+
+
+def iter_export_records(since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """(since, until] 구간에 요청, 추천 로그, 피드백 중 하나라도 생성된 연결 요청의 레코드를 순회
+
+    추천 로그와 피드백은 요청보다 늦게 저장되므로 테이블마다 자신의 created_at으로 구간을 판단하고,
+    해당 요청의 until 시점 상태(요청 + until까지 생성된 로그/피드백) 전체를 다시 내보냅니다.
+    따라서 같은 request_id가 여러 번의 증분 내보내기에 나올 수 있으며, 받는 쪽은 request_id 기준으로
+    덮어쓰면 됩니다. 요청은 id 순서로 chunk_size개씩 키셋 페이지네이션으로 읽고(서버 측 커서를 쓰지 않는
+    MySQL에서도 메모리 일정), 페이지마다 그 요청들의 로그를 한 번에 조회합니다.
+    """
+    requests_qs = ConnectionRequest.objects.filter(_changed_between(since, until))
+    logs_qs = RecommendationLog.objects.all()
+    if until is not None:
+        logs_qs = logs_qs.filter(created_at__lte=until)
+
+    last_id = 0
+    while True:
+        page = list(requests_qs.filter(id__gt=last_id).select_related('connectionfeedback')
+                    .order_by('id')[:chunk_size])
+        if not page:
+            return
+        last_id = page[-1].id
+        logs_by_request: Dict[int, List[Dict[str, Any]]] = {}
+        for log in logs_qs.filter(request_id__in=[r.id for r in page]).order_by('request_id', 'id'):
+            logs_by_request.setdefault(log.request_id, []).append(_log_record(log))
+
+        for connection_request in page:
+            feedback = getattr(connection_request, 'connectionfeedback', None)
+            if feedback is not None and until is not None and feedback.created_at > until:
+                feedback = None
+            yield {
+                'request_id': connection_request.id,
+                'requester_user_id': connection_request.requester_user_id,
+                'request_text': connection_request.request_text,
+                'inferred_category': connection_request.inferred_category,
+                'status': connection_request.status,
+                'created_at': _isoformat(connection_request.created_at),
+                'recommendations': logs_by_request.get(connection_request.id, []),
+                'feedback': _feedback_record(feedback) if feedback is not None else None,
+            }
+
+
+def _changed_between(since: Optional[datetime], until: Optional[datetime]) -> Q:
+    """요청 자체, 추천 로그, 피드백 중 하나라도 (since, until] 구간에 생성된 요청 조건"""
+    if since is None and until is None:
+        return Q()
+
+    def window(prefix: str = '') -> Dict[str, datetime]:
+        bounds = {}
+        if since is not None:
+            bounds[f'{prefix}created_at__gt'] = since
+        if until is not None:
+            bounds[f'{prefix}created_at__lte'] = until
+        return bounds
+
+    new_logs = RecommendationLog.objects.filter(request_id=OuterRef('pk'), **window())
+    new_feedback = ConnectionFeedback.objects.filter(request_id=OuterRef('pk'), **window())
+    return Q(**window()) | Q(Exists(new_logs)) | Q(Exists(new_feedback))
+
+
+def iter_ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def iter_csv(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for record in records:
+        feedback = record['feedback'] or {}
+        request_columns = [
+            record['request_id'], record['requester_user_id'], record['request_text'],
+            record['inferred_category'], record['status'], record['created_at'],
+        ]
+        feedback_columns = [
+            feedback.get('final_user'), feedback.get('satisfaction_score'), feedback.get('reward_sent'),
+            feedback.get('created_at'),
+        ]
+        for log in record['recommendations'] or [None]:
+            log = log or {}
+            yield writer.writerow(request_columns + [
+                log.get('id'), log.get('recommended_user'), log.get('introducer_user'),
+                log.get('relationship_degree'), log.get('ai_score'), log.get('is_selected'), log.get('created_at'),
+            ] + feedback_columns)
+
+
+def iter_export(export_format: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                chunk_size: int = 2000) -> Iterator[str]:
+    """형식(ndjson/csv)에 맞춰 한 줄씩 직렬화한 내보내기 스트림"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {export_format}")
+    records = iter_export_records(since=since, until=until, chunk_size=chunk_size)
+    return iter_ndjson(records) if export_format == 'ndjson' else iter_csv(records)
+
+
+def parse_since(value: Optional[str]) -> Optional[datetime]:
+    """since 파라미터(ISO 8601) 파싱, 시간대가 없으면 기본 시간대로 간주"""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"since 형식이 올바르지 않습니다: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_watermark(safety_lag_seconds: float = EXPORT_SAFETY_LAG_SECONDS) -> datetime:
+    """이번 내보내기의 상한 시각 (다음 증분 내보내기의 since로 사용)
+
+    created_at은 INSERT 직전에 정해지므로, 방금 생성 중인 행을 놓치지 않도록 현재보다 조금 이전으로 잡습니다.
+    """
+    return timezone.now() - timedelta(seconds=safety_lag_seconds)
+
+
+def _log_record(log: RecommendationLog) -> Dict[str, Any]:
+    return {
+        'id': log.id,
+        'recommended_user': log.recommended_user,
+        'introducer_user': log.introducer_user,
+        'relationship_degree': log.relationship_degree,
+        'ai_score': log.ai_score,
+        'is_selected': log.is_selected,
+        'created_at': _isoformat(log.created_at),
+    }
+
+
+def _feedback_record(feedback) -> Dict[str, Any]:
+    return {
+        'id': feedback.id,
+        'final_user': feedback.final_user,
+        'satisfaction_score': feedback.satisfaction_score,
+        'reward_sent': feedback.reward_sent,
+        'created_at': _isoformat(feedback.created_at),
+    }
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class _Echo:
+    """csv.writer가 쓴 줄을 그대로 반환하는 버퍼 (스트리밍용)"""
+
+    def write(self, value):
+        return value
@@ -0,0 +1,53 @@
+import json
+import re
+import time
+from typing import Any, Dict, Optional
+
+from .llm_gateway import infer_category_by_keywords
+
+_NUMBERED_LINE = re.compile(r'^(\d+)\.\s(.*)$')
+
+
+class FakeUsageMetadata:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, usage_metadata: FakeUsageMetadata):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeGenerativeModel:
+    """오프라인 개발/테스트용 가짜 Gemini 모델
+
+    genai.GenerativeModel.generate_content와 같은 형태로 호출되며,
+    번호가 붙은 요청들을 로컬 키워드 규칙으로 분류해 JSON 배열로 답합니다.
+    """
+
+    def __init__(self, system_instruction: str = '', latency: float = 0.0):
+        self.system_instruction = system_instruction
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                         request_options: Optional[Dict[str, Any]] = None) -> FakeResponse:
+        self.calls += 1
+        timeout = (request_options or {}).get('timeout')
+        if self.latency:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError("가짜 LLM 응답 시간 초과")
+            time.sleep(self.latency)
+
+        results = []
+        for line in prompt.splitlines():
+            match = _NUMBERED_LINE.match(line.strip())
+            if match:
+                results.append({'index': int(match.group(1)), 'category': infer_category_by_keywords(match.group(2))})
+        text = json.dumps(results, ensure_ascii=False)
+        # 토큰 수는 대략 4글자당 1토큰으로 추정
+        usage = FakeUsageMetadata((len(self.system_instruction) + len(prompt)) // 4, len(text) // 4)
+        return FakeResponse(text, usage)
@@ -0,0 +1,164 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 모델 입력으로 사용하는 원시 컬럼 (학습 CSV와 서빙 요청이 공유)
+NUMERIC_FEATURES = ('relationship_degree',)
+CATEGORICAL_FEATURES = ('category', 'requester_age', 'candidate_gender')
+
+# 학습 데이터 생성 시 사용하는 기본 어휘 (모델 번들이 없을 때의 대체 어휘)
+DEFAULT_VOCABULARY = {
+    'category': ['repair', 'cleaning', 'pest_control', 'tech_service', 'life_helper', 'senior_support'],
+    'requester_age': ['20s', '30s', '40s', '50s+'],
+    'candidate_gender': ['male', 'female'],
+}
+
+
+class FeatureEncoder:
+    """학습 시점의 어휘로 고정된 원-핫 인코더 (pandas 없이 NumPy 배열로 직접 인코딩)"""
+
+    def __init__(self, feature_names: Sequence[str], numeric_features: Sequence[str] = NUMERIC_FEATURES,
+                 categorical_features: Sequence[str] = CATEGORICAL_FEATURES):
+        self.feature_names = [str(name) for name in feature_names]
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+
+        # 컬럼 이름 -> 인덱스 매핑 (feature_names 순서가 곧 모델 입력 순서)
+        self._numeric_index: Dict[str, int] = {}
+        self._categorical_index: Dict[str, Dict[str, int]] = {name: {} for name in self.categorical_features}
+        # 접두사가 겹치는 경우를 대비해 긴 이름부터 매칭
+        prefixes = sorted(self.categorical_features, key=len, reverse=True)
+        for column, feature_name in enumerate(self.feature_names):
+            if feature_name in self.numeric_features:
+                self._numeric_index[feature_name] = column
+                continue
+            for prefix in prefixes:
+                if feature_name.startswith(f'{prefix}_'):
+                    self._categorical_index[prefix][feature_name[len(prefix) + 1:]] = column
+                    break
+            else:
+                raise ValueError(f"알 수 없는 feature 컬럼입니다: {feature_name}")
+
+        # 학습 어휘에 없는 값은 조용히 0이 되지 않도록 기록
+        self.unknown_counts: Dict[Tuple[str, Any], int] = {}
+
+    @classmethod
+    def fit(cls, records: Iterable[Dict[str, Any]], numeric_features: Sequence[str] = NUMERIC_FEATURES,
+            categorical_features: Sequence[str] = CATEGORICAL_FEATURES) -> 'FeatureEncoder':
+        """학습 데이터에서 어휘를 수집해 인코더 생성 (pd.get_dummies와 동일한 컬럼 순서)"""
+        vocabulary = {name: set() for name in categorical_features}
+        for record in records:
+            for name in categorical_features:
+                value = record.get(name)
+                if value is not None:
+                    vocabulary[name].add(str(value))
+        return cls.from_vocabulary({name: sorted(values) for name, values in vocabulary.items()},
+                                   numeric_features=numeric_features)
+
+    @classmethod
+    def from_vocabulary(cls, vocabulary: Dict[str, List[str]],
+                        numeric_features: Sequence[str] = NUMERIC_FEATURES) -> 'FeatureEncoder':
+        """카테고리별 어휘 목록으로 인코더 생성"""
+        feature_names = list(numeric_features)
+        for name, values in vocabulary.items():
+            feature_names.extend(f'{name}_{value}' for value in sorted(values))
+        return cls(feature_names, numeric_features=numeric_features, categorical_features=list(vocabulary))
+
+    @classmethod
+    def from_feature_names(cls, feature_names: Sequence[str]) -> 'FeatureEncoder':
+        """기존 모델의 feature_names_in_으로 인코더 복원 (인코더 없이 저장된 모델 호환용)"""
+        return cls(feature_names)
+
+    @classmethod
+    def default(cls) -> 'FeatureEncoder':
+        """기본 어휘로 만든 인코더 (모델 로딩 실패 시 규칙 기반 점수 계산용)"""
+        return cls.from_vocabulary(DEFAULT_VOCABULARY)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FeatureEncoder':
+        return cls(data['feature_names'], numeric_features=data['numeric_features'],
+                   categorical_features=data['categorical_features'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """모델 번들에 함께 저장할 수 있는 순수 데이터 형태"""
+        return {
+            'feature_names': list(self.feature_names),
+            'numeric_features': list(self.numeric_features),
+            'categorical_features': list(self.categorical_features),
+        }
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    def column(self, feature: str, value: Optional[str] = None) -> Optional[int]:
+        """feature(및 범주 값)에 해당하는 컬럼 인덱스, 없으면 None"""
+        if value is None:
+            return self._numeric_index.get(feature)
+        return self._categorical_index.get(feature, {}).get(str(value))
+
+    def categorical_columns(self, feature: str) -> Dict[str, int]:
+        """범주형 feature의 값 -> 컬럼 인덱스 매핑"""
+        return dict(self._categorical_index.get(feature, {}))
+
+    def encode_one(self, record: Dict[str, Any]) -> np.ndarray:
+        """단일 행을 (1, n_features) 배열로 인코딩"""
+        return self.encode_batch([record])
+
+    def encode_batch(self, records: Sequence[Dict[str, Any]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """여러 행을 미리 할당된 (n_rows, n_features) 배열로 인코딩"""
+        n_rows = len(records)
+        if out is None:
+            out = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        else:
+            if out.shape != (n_rows, self.n_features):
+                raise ValueError(f"출력 배열 크기가 맞지 않습니다: {out.shape} != {(n_rows, self.n_features)}")
+            out.fill(0)
+
+        numeric_items = list(self._numeric_index.items())
+        categorical_items = list(self._categorical_index.items())
+        for row, record in enumerate(records):
+            for name, column in numeric_items:
+                value = record.get(name)
+                if value is not None:
+                    out[row, column] = float(value)
+            for name, columns in categorical_items:
+                value = record.get(name)
+                if value is None:
+                    continue
+                column = columns.get(str(value))
+                if column is None:
+                    self._record_unknown(name, value)
+                    continue
+                out[row, column] = 1.0
+        return out
+
+    def _record_unknown(self, feature: str, value: Any):
+        key = (feature, value)
+        count = self.unknown_counts.get(key, 0)
+        if count == 0:
+            logger.warning(f"학습 어휘에 없는 값이 들어왔습니다 (0으로 인코딩): {feature}={value!r}")
+        self.unknown_counts[key] = count + 1
+
+
+@lru_cache(maxsize=None)
+def load_model_bundle(model_path: str) -> Tuple[Any, FeatureEncoder]:
+    """모델 파일을 프로세스당 한 번만 로딩하여 (모델, 인코더) 반환
+
+    학습 스크립트가 저장한 {'model', 'feature_encoder'} 번들과
+    모델 객체만 저장된 기존 파일을 모두 지원합니다.
+    """
+    import joblib
+
+    artifact = joblib.load(model_path)
+    if isinstance(artifact, dict):
+        model = artifact['model']
+        encoder = FeatureEncoder.from_dict(artifact['feature_encoder'])
+    else:
+        model = artifact
+        encoder = FeatureEncoder.from_feature_names(model.feature_names_in_)
+    return model, encoder
@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# (HTTP 상태 코드, 응답 본문, 추가 헤더)
+ResponseTuple = Tuple[int, Any, Dict[str, str]]
+
+SOURCE_COMPUTED = 'computed'
+SOURCE_COALESCED = 'coalesced'
+SOURCE_REPLAYED = 'replayed'
+SOURCE_IN_PROGRESS = 'in_progress'
+# 같은 Idempotency-Key로 다른 내용의 요청이 들어옴
+SOURCE_MISMATCH = 'mismatch'
+
+_LOCK_SUFFIX = ':lock'
+
+
+def idempotency_setting(name: str, default: Any) -> Any:
+    """AI_IDEMPOTENCY 설정값 조회"""
+    return getattr(settings, 'AI_IDEMPOTENCY', {}).get(name, default)
+
+
+class _InflightCall:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.response: Optional[ResponseTuple] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """같은 추천 요청을 한 번만 처리하는 중복 제거 계층
+
+    - 처리를 시작한 요청은 공유 캐시에 처리 중 표시(cache.add)를 남기고, 다른 워커에 들어온 같은 요청은
+      새로 계산하지 않고 저장될 응답을 기다려 공유 (REDIS_URL이 없으면 캐시가 워커별이라 워커 안에서만)
+    - 같은 워커 안의 동시 요청(스레드 워커)은 메모리에서 바로 결과를 공유
+    - 처리가 끝난 완전한 성공 응답은 짧은 시간 동안 캐시에 저장해 재요청에 그대로 재전송
+    키는 Idempotency-Key 헤더가 있으면 그 값, 없으면 요청 내용의 해시이고,
+    같은 Idempotency-Key로 내용이 다른 요청이 오면 재전송하지 않고 'mismatch'를 반환합니다.
+    """
+
+    def __init__(self, cache_alias: str = 'default', replay_ttl: int = 10, lock_ttl: float = 30,
+                 poll_interval: float = 0.05):
+        self.cache_alias = cache_alias
+        self.replay_ttl = replay_ttl
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InflightCall] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'RequestCoalescer':
+        return cls(
+            cache_alias=idempotency_setting('CACHE_ALIAS', 'default'),
+            replay_ttl=idempotency_setting('REPLAY_TTL_SECONDS', 10),
+            lock_ttl=idempotency_setting('LOCK_TTL_SECONDS', 30),
+            poll_interval=idempotency_setting('POLL_INTERVAL_SECONDS', 0.05),
+        )
+
+    @staticmethod
+    def key_for(user_id: int, request_text: str, max_recommendations: int,
+                idempotency_key: Optional[str] = None, location: str = '') -> str:
+        """사용자 단위로 구분한 중복 제거 키"""
+        if idempotency_key:
+            digest = hashlib.sha256(idempotency_key.encode('utf-8')).hexdigest()
+            return f'ai:idempotency:{user_id}:key:{digest}'
+        return f'ai:idempotency:{user_id}:body:{RequestCoalescer.fingerprint_for(request_text, max_recommendations, location)}'
+
+    @staticmethod
+    def fingerprint_for(request_text: str, max_recommendations: int, location: str = '') -> str:
+        """요청 내용 해시 (같은 Idempotency-Key로 다른 내용이 왔는지 확인용)"""
+        content = f'{max_recommendations}\x00{location}\x00{request_text}'
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def run(self, key: str, compute: Callable[[], ResponseTuple], timeout: Optional[float] = None,
+            fingerprint: str = '') -> Tuple[Optional[ResponseTuple], str]:
+        """(응답, 출처) 반환
+
+        처리 중인 같은 요청을 timeout 안에 받지 못하면 (None, 'in_progress'),
+        같은 키로 내용이 다른 요청이면 (None, 'mismatch')
+        """
+        stored = self._get(key)
+        if stored is not None:
+            return self._replay(stored, fingerprint, SOURCE_REPLAYED)
+
+        with self._lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[key] = _InflightCall(fingerprint)
+
+        if not is_leader:
+            if call.fingerprint != fingerprint:
+                metrics.increment('idempotency.mismatch')
+                return None, SOURCE_MISMATCH
+            metrics.increment('idempotency.coalesced')
+            if not call.done.wait(timeout):
+                metrics.increment('idempotency.wait_timeouts')
+                return None, SOURCE_IN_PROGRESS
+            if call.error is not None:
+                raise call.error
+            return call.response, SOURCE_COALESCED
+
+        try:
+            call.response, source = self._run_leader(key, compute, timeout, fingerprint)
+            return call.response, source
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def _run_leader(self, key: str, compute: Callable[[], ResponseTuple], timeout: Optional[float],
+                    fingerprint: str) -> Tuple[Optional[ResponseTuple], str]:
+        """다른 워커가 처리 중이면 저장될 응답을 기다리고, 아니면 처리 중 표시 후 직접 계산"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waited = False
+        while True:
+            lock_state = self._acquire(key, fingerprint)
+            if lock_state is True:
+                break
+            if lock_state != fingerprint:
+                metrics.increment('idempotency.mismatch')
+                return None, SOURCE_MISMATCH
+            if not waited:
+                metrics.increment('idempotency.coalesced')
+                waited = True
+            # 다른 워커가 처리 중: 응답이 저장되거나 처리 중 표시가 사라질 때까지 대기
+            while True:
+                stored = self._get(key)
+                if stored is not None:
+                    return self._replay(stored, fingerprint, SOURCE_COALESCED)
+                if deadline is not None and time.monotonic() >= deadline:
+                    metrics.increment('idempotency.wait_timeouts')
+                    return None, SOURCE_IN_PROGRESS
+                if self._get(key + _LOCK_SUFFIX) is None:
+                    # 처리하던 요청이 실패했거나 성공 응답이 아니어서 저장되지 않음 -> 직접 처리
+                    break
+                time.sleep(self.poll_interval)
+
+        try:
+            response = compute()
+            if self._is_replayable(response):
+                self._set(key, (fingerprint, response), self.replay_ttl)
+            return response, SOURCE_COMPUTED
+        finally:
+            self._delete(key + _LOCK_SUFFIX)
+
+    @staticmethod
+    def _is_replayable(response: ResponseTuple) -> bool:
+        """재전송용으로 저장할 응답인지 (성공했고 생략된 단계가 없는 완전한 결과만)
+
+        마감으로 일부 단계를 건너뛴 결과나 Core 서비스 장애로 저장되지 않은 빈 결과를 저장하면
+        재시도해도 같은 결과만 받게 되므로 저장하지 않습니다.
+        """
+        status_code, body, _ = response
+        if not 200 <= status_code < 300:
+            return False
+        if isinstance(body, dict) and (body.get('partial') or body.get('request_id') is None):
+            return False
+        return True
+
+    def _acquire(self, key: str, fingerprint: str):
+        """처리 중 표시를 남기면 True, 이미 다른 요청이 처리 중이면 그 요청의 내용 해시 반환"""
+        try:
+            cache = caches[self.cache_alias]
+            if cache.add(key + _LOCK_SUFFIX, fingerprint, timeout=self.lock_ttl):
+                return True
+            holder = cache.get(key + _LOCK_SUFFIX)
+        except Exception as e:
+            logger.warning(f"중복 요청 처리 중 표시 실패, 바로 처리합니다: {e}")
+            return True
+        # 조회 사이에 표시가 사라졌으면 다시 시도
+        return fingerprint if holder is None else holder
+
+    @staticmethod
+    def _replay(stored: Tuple[str, ResponseTuple], fingerprint: str, source: str) -> Tuple[Optional[ResponseTuple], str]:
+        stored_fingerprint, response = stored
+        if stored_fingerprint != fingerprint:
+            metrics.increment('idempotency.mismatch')
+            return None, SOURCE_MISMATCH
+        metrics.increment(f'idempotency.{source}')
+        return response, source
+
+    def _get(self, key: str) -> Any:
+        try:
+            return caches[self.cache_alias].get(key)
+        except Exception as e:
+            logger.warning(f"중복 요청 캐시 조회 실패: {e}")
+            return None
+
+    def _set(self, key: str, value: Any, timeout: float):
+        try:
+            caches[self.cache_alias].set(key, value, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"중복 요청 응답 캐시 저장 실패: {e}")
+
+    def _delete(self, key: str):
+        try:
+            caches[self.cache_alias].delete(key)
+        except Exception as e:
+            logger.warning(f"중복 요청 처리 중 표시 삭제 실패: {e}")
+
+
+_coalescer: Optional[RequestCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_request_coalescer() -> Optional[RequestCoalescer]:
+    """프로세스 전역 중복 제거 계층 (설정에서 꺼져 있으면 None)"""
+    global _coalescer
+    if not idempotency_setting('ENABLED', True):
+        return None
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                _coalescer = RequestCoalescer.from_settings()
+    return _coalescer
@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+VALID_CATEGORIES = ['repair', 'cleaning', 'pest_control', 'tech_service', 'life_helper', 'senior_support']
+
+# 모델 클라이언트를 만들 때 한 번만 설정하는 system instruction
+SYSTEM_INSTRUCTION = """
+당신은 '건너건너'라는 생활 서비스 연결 플랫폼의 요청 분석 AI입니다.
+사용자의 요청 텍스트를 분석하여 아래 6가지 생활 서비스 카테고리 중 가장 적합한 것 하나만 골라 적절한 답으로 답해주세요.
+다른 설명은 절대 추가하지 마세요.
+
+카테고리:
+- repair: 수리·유지보수 (전기, 배관, 가전제품, 샷시, 열쇠 등)
+- cleaning: 청소·폐기 (입주청소, 쓰레기처리, 대청소 등)
+- pest_control: 해충·방역 (바퀴벌레, 쥐, 모기, 소독 등)
+- tech_service: 기술 서비스 (포스기, 와이파이, CCTV, 컴퓨터 등)
+- life_helper: 생활 도우미 (짐나르기, 반려동물 산책, 심부름 등)
+- senior_support: 고령자·외국인 지원 (번역, 관공서 동행, 병원 안내 등)
+
+여러 요청이 번호와 함께 주어지면 각 요청의 번호(index)와 카테고리(category)를 JSON 배열로 답해주세요.
+"""
+
+# 구조화 출력 스키마 (카테고리는 enum으로 제한)
+RESPONSE_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'properties': {
+            'index': {'type': 'INTEGER'},
+            'category': {'type': 'STRING', 'enum': VALID_CATEGORIES},
+        },
+        'required': ['index', 'category'],
+    },
+}
+
+# 로컬 키워드 기반 카테고리 추론용 키워드 (Gemini API 대안, 가짜 LLM에서도 사용)
+CATEGORY_KEYWORDS = {
+    'pest_control': ['바퀴벌레', 'cockroach', '쥐', 'rat', '방역', 'pest', '해충', '소독', '개미', 'ant'],
+    'repair': ['수리', 'repair', 'fix', '고장', '전기', 'electrical', '배관', 'plumbing', '가전'],
+    'cleaning': ['청소', 'clean', '정리', 'organize', '이사', 'moving', '입주청소', '대청소'],
+    'tech_service': ['cctv', '와이파이', 'wifi', '컴퓨터', 'computer', '포스기', '설치', 'install'],
+    'senior_support': ['번역', 'translate', '통역', '병원', 'hospital', '관공서', '동행', '어르신'],
+    'life_helper': ['심부름', '배송', 'delivery', '짐나르기', '반려동물', 'pet', '도움']
+}
+
+
+def infer_category_by_keywords(request_text: str) -> str:
+    """로컬 키워드 기반 카테고리 추론"""
+    text = request_text.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return 'life_helper'  # 기본값
+
+
+def llm_setting(name: str, default: Any) -> Any:
+    """AI_LLM 설정값 조회"""
+    return getattr(settings, 'AI_LLM', {}).get(name, default)
+
+
+def build_batch_prompt(texts: Sequence[str]) -> str:
+    """여러 요청을 번호를 붙여 한 번에 분류하는 프롬프트"""
+    # 요청 안의 줄바꿈은 번호 구분과 섞이지 않도록 공백으로 치환
+    lines = [f"{index}. {' '.join(text.split())}" for index, text in enumerate(texts)]
+    return "다음 사용자 요청들을 각각 분류해주세요.\n\n" + "\n".join(lines)
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.items: List[tuple] = []   # (요청 텍스트, Future)
+        self.closed = threading.Event()
+
+
+class LLMGateway:
+    """카테고리 추론용 LLM 호출 게이트웨이
+
+    - 모델 클라이언트는 system instruction과 함께 프로세스당 한 번만 생성
+    - 짧은 시간 창(batch window) 안에 들어온 요청을 하나의 호출로 묶어 JSON(enum)으로 분류 (스레드 워커용)
+    - 동시 호출 수 제한, 토큰/지연 시간 집계
+    """
+
+    def __init__(self, client_factory, batch_window: float = 0.0, max_batch_size: int = 16,
+                 max_concurrency: int = 4):
+        self._client_factory = client_factory
+        self._client = None
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._pending: Optional[_PendingBatch] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def classify(self, text: str, timeout: Optional[float] = None) -> Optional[str]:
+        """요청 한 건 분류 (같은 시간 창의 다른 요청과 묶어서 호출), 실패하면 None"""
+        future: Future = Future()
+        with self._lock:
+            batch = self._pending
+            is_leader = batch is None
+            if is_leader:
+                batch = self._pending = _PendingBatch()
+            batch.items.append((text, future))
+            if len(batch.items) >= self.max_batch_size:
+                self._pending = None
+                batch.closed.set()
+
+        if is_leader:
+            # 첫 요청이 시간 창 동안 기다렸다가 모인 요청을 대표로 호출
+            # (시간 창이 0이면 기다리지 않음: 한 번에 한 요청만 처리하는 sync 워커에서는 모일 요청이 없음)
+            if self.batch_window > 0:
+                batch.closed.wait(self.batch_window)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+            self._execute(batch.items, timeout)
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            metrics.increment('llm.timeouts')
+            return None
+
+    def classify_many(self, texts: Sequence[str], timeout: Optional[float] = None) -> List[Optional[str]]:
+        """여러 요청을 max_batch_size 단위로 나눠 분류 (배치 작업용)"""
+        results: List[Optional[str]] = []
+        for start in range(0, len(texts), self.max_batch_size):
+            chunk = [(text, Future()) for text in texts[start:start + self.max_batch_size]]
+            self._execute(chunk, timeout)
+            results.extend(future.result() for _, future in chunk)
+        return results
+
+    def _execute(self, items: List[tuple], timeout: Optional[float]):
+        """묶인 요청들을 한 번의 LLM 호출로 분류하고 각 Future에 결과 설정"""
+        results: Dict[int, str] = {}
+        if not self._semaphore.acquire(timeout=timeout):
+            metrics.increment('llm.rejected')
+            logger.warning(f"LLM 동시 호출 한도 초과로 {len(items)}건을 로컬 추론으로 넘깁니다.")
+        else:
+            started = time.perf_counter()
+            try:
+                response = self.client.generate_content(
+                    build_batch_prompt([text for text, _ in items]),
+                    generation_config={
+                        'response_mime_type': 'application/json',
+                        'response_schema': RESPONSE_SCHEMA,
+                    },
+                    request_options={'timeout': timeout} if timeout else None
+                )
+                results = self._parse(response.text, len(items))
+                self._record_usage(response, len(items), time.perf_counter() - started)
+            except Exception as e:
+                metrics.increment('llm.errors')
+                logger.error(f"Gemini API 호출 중 오류 발생: {e}")
+            finally:
+                self._semaphore.release()
+
+        for index, (_, future) in enumerate(items):
+            if not future.done():
+                future.set_result(results.get(index))
+
+    @staticmethod
+    def _parse(text: str, size: int) -> Dict[int, str]:
+        """JSON 응답에서 유효한 (번호 -> 카테고리)만 추출"""
+        results = {}
+        for item in json.loads(text):
+            index, category = item.get('index'), str(item.get('category', '')).strip().lower()
+            if isinstance(index, int) and 0 <= index < size and category in VALID_CATEGORIES:
+                results[index] = category
+        return results
+
+    @staticmethod
+    def _record_usage(response, batch_size: int, elapsed_seconds: float):
+        metrics.increment('llm.calls')
+        metrics.increment('llm.texts', batch_size)
+        metrics.increment('llm.latency_ms', round(elapsed_seconds * 1000, 1))
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            metrics.increment('llm.prompt_tokens', getattr(usage, 'prompt_token_count', 0) or 0)
+            metrics.increment('llm.output_tokens', getattr(usage, 'candidates_token_count', 0) or 0)
+
+
+def _gemini_client_factory():
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+    # 사용할 모델을 지정합니다. (무료 버전용)
+    return genai.GenerativeModel(llm_setting('MODEL', 'gemini-1.5-flash'), system_instruction=SYSTEM_INSTRUCTION)
+
+
+def _fake_client_factory():
+    from .fake_llm import FakeGenerativeModel
+
+    return FakeGenerativeModel(system_instruction=SYSTEM_INSTRUCTION,
+                               latency=llm_setting('FAKE_LATENCY_MS', 0) / 1000)
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """프로세스 전역 LLM 게이트웨이 (AI_LLM['BACKEND']가 'fake'면 오프라인 가짜 모델 사용)"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                backend = llm_setting('BACKEND', 'gemini')
+                _gateway = LLMGateway(
+                    _fake_client_factory if backend == 'fake' else _gemini_client_factory,
+                    batch_window=llm_setting('BATCH_WINDOW_MS', 0) / 1000,
+                    max_batch_size=llm_setting('MAX_BATCH_SIZE', 16),
+                    max_concurrency=llm_setting('MAX_CONCURRENCY', 4),
+                )
+    return _gateway
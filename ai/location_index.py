@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+
+
+def location_index_setting(name: str, default: Any) -> Any:
+    """AI_LOCATION_INDEX 설정값 조회"""
+    return getattr(settings, 'AI_LOCATION_INDEX', {}).get(name, default)
+
+
+def matches_location(profile: Dict[str, Any], location: str) -> bool:
+    """프로필의 시/도(province_name) 또는 시/군/구(city_name)에 location이 포함되는지 여부"""
+    return location in (profile.get('city_name') or '') or location in (profile.get('province_name') or '')
+
+
+class LocationIndex:
+    """시/도, 시/군/구 이름 -> 사용자 id 역색인
+
+    프로필을 받아올 때(ingest) 지역이 바뀐 사용자만 갱신하고, 지역 조건이 있는 요청은
+    후보 생성 단계에서 다른 지역 후보를 프로필 조회/점수 계산 전에 제외합니다.
+    아직 색인되지 않은 사용자는 지역을 모르므로 제외하지 않습니다.
+    """
+
+    def __init__(self, refresh_seconds: float = 60):
+        self.refresh_seconds = refresh_seconds
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._locations: Dict[int, Tuple[str, str]] = {}     # 사용자 id -> (시/도, 시/군/구)
+        self._by_province: Dict[str, Set[int]] = {}
+        self._by_city: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    @classmethod
+    def from_settings(cls) -> 'LocationIndex':
+        return cls(refresh_seconds=location_index_setting('REFRESH_SECONDS', 60))
+
+    def refresh_due(self) -> bool:
+        """이번 전체 프로필 수집 결과로 색인을 갱신할 차례인지 여부 (refresh_seconds에 한 번만 True)
+
+        전체 사용자를 순회하는 비용을 요청마다 내지 않기 위해 갱신 주기를 둡니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+                return False
+            self._refreshed_at = now
+            return True
+
+    def ingest(self, profiles: Iterable[Dict[str, Any]]):
+        """프로필 수집/갱신 시 지역이 바뀐 사용자만 색인 갱신"""
+        for profile in profiles:
+            self.add(profile)
+
+    def add(self, profile: Dict[str, Any]):
+        """프로필 한 건 색인 (지역이 그대로면 아무것도 하지 않음)"""
+        user_id = profile.get('id')
+        if user_id is None:
+            return
+        location = (profile.get('province_name') or '', profile.get('city_name') or '')
+        previous = self._locations.get(user_id)
+        if previous == location:
+            return
+        with self._lock:
+            if previous is not None:
+                self._discard(self._by_province, previous[0], user_id)
+                self._discard(self._by_city, previous[1], user_id)
+            self._locations[user_id] = location
+            self._by_province.setdefault(location[0], set()).add(user_id)
+            self._by_city.setdefault(location[1], set()).add(user_id)
+
+    def user_ids(self, location: str) -> Set[int]:
+        """이름에 location이 포함된 시/도 또는 시/군/구에 사는 사용자 id (matches_location과 같은 기준)"""
+        with self._lock:
+            matched = set()
+            for index in (self._by_province, self._by_city):
+                for name, user_ids in index.items():
+                    if location in name:
+                        matched |= user_ids
+            return matched
+
+    def filter_candidates(self, candidates: Dict[int, int], location: str) -> Dict[int, int]:
+        """(후보 -> 소개자) 매핑에서 다른 지역으로 색인된 후보 제외"""
+        matched = self.user_ids(location)
+        return {
+            candidate_id: introducer_id for candidate_id, introducer_id in candidates.items()
+            if candidate_id in matched or candidate_id not in self._locations
+        }
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[int]], name: str, user_id: int):
+        user_ids = index.get(name)
+        if user_ids is None:
+            return
+        user_ids.discard(user_id)
+        if not user_ids:
+            del index[name]
+
+
+_index: Optional[LocationIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """프로세스 전역 지역 색인"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocationIndex.from_settings()
+    return _index
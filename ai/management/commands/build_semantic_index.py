@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.semantic import SemanticIntroIndex, default_index_path
+from ai.services import AIRecommendationService
+
+
+class Command(BaseCommand):
+    help = "Core 서비스의 전체 사용자 intro로 의미 매칭 인덱스를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help="인덱스 저장 경로 (기본: AI_SEMANTIC_MATCHING['INDEX_PATH'])")
+        parser.add_argument('--components', type=int, default=128, help="LSA 차원 수 (0이면 TF-IDF 그대로 사용)")
+
+    def handle(self, *args, **options):
+        profiles = AIRecommendationService()._fetch_all_user_profiles_from_core_service()
+        if not profiles:
+            raise CommandError("Core 서비스에서 사용자 프로필을 가져오지 못했습니다.")
+
+        index = SemanticIntroIndex.build(list(profiles.values()), n_components=options['components'])
+        output = options['output'] or default_index_path()
+        index.save(output)
+        self.stdout.write(self.style.SUCCESS(f"의미 매칭 인덱스 저장 완료: {len(index)}명 -> {output}"))
@@ -0,0 +1,52 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.exports import EXPORT_FORMATS, export_watermark, iter_export, parse_since
+
+
+class Command(BaseCommand):
+    help = "연결 요청/추천 로그/피드백을 NDJSON 또는 CSV로 스트리밍 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson', help="출력 형식")
+        parser.add_argument('--output', default='-', help="출력 파일 경로 (기본: 표준 출력)")
+        parser.add_argument('--since', default=None,
+                            help="이 시각(ISO 8601) 이후 요청/추천 로그/피드백이 생긴 요청만 내보내기 "
+                                 "(같은 request_id가 이전 내보내기에도 있을 수 있음)")
+        parser.add_argument('--state-file', default=None,
+                            help="증분 내보내기용 워터마크 파일 (있으면 since로 읽고, 완료 후 갱신)")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="한 번에 읽을 요청 수")
+
+    def handle(self, *args, **options):
+        since_value = options['since']
+        state_file = options['state_file']
+        if since_value is None and state_file and os.path.exists(state_file):
+            with open(state_file, encoding='utf-8') as f:
+                since_value = f.read().strip()
+        try:
+            since = parse_since(since_value)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        until = export_watermark()
+        lines = iter_export(options['format'], since=since, until=until, chunk_size=options['chunk_size'])
+
+        output = options['output']
+        if output == '-':
+            for line in lines:
+                sys.stdout.write(line)
+        else:
+            # 실패 시 이전 내보내기 결과를 덮어쓰지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = output + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                for line in lines:
+                    f.write(line)
+            os.replace(tmp_path, output)
+
+        # 워터마크는 내보내기가 끝난 뒤에만 갱신
+        if state_file:
+            with open(state_file, 'w', encoding='utf-8') as f:
+                f.write(until.isoformat())
+        self.stderr.write(f"내보내기 완료 (watermark: {until.isoformat()})")
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.precompute import CandidatePrecomputer, active_user_ids, precompute_setting
+from ai.services import AIRecommendationService
+
+
+class Command(BaseCommand):
+    help = "활성 사용자의 카테고리별 추천 후보를 미리 계산해 저장합니다. (야간 배치용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--active-days', type=int, default=None,
+                            help="최근 며칠 동안 추천을 요청한 사용자를 대상으로 할지 (기본: AI_PRECOMPUTE['ACTIVE_DAYS'])")
+        parser.add_argument('--user-ids', type=int, nargs='*', default=None, help="대상 사용자 id를 직접 지정")
+        parser.add_argument('--max-recommendations', type=int, default=None,
+                            help="실시간 계산과 같은 결과를 보장할 최대 추천 수 "
+                                 "(기본: AI_PRECOMPUTE['MAX_RECOMMENDATIONS'])")
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        if user_ids is None:
+            user_ids = active_user_ids(options['active_days'] or precompute_setting('ACTIVE_DAYS', 30))
+        if not user_ids:
+            self.stdout.write("대상 사용자가 없습니다.")
+            return
+
+        started = time.perf_counter()
+        precomputer = CandidatePrecomputer(
+            AIRecommendationService(),
+            max_recommendations=options['max_recommendations'] or precompute_setting('MAX_RECOMMENDATIONS', 10)
+        )
+        try:
+            saved = precomputer.run(user_ids)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"후보 목록 저장 완료: {saved}/{len(user_ids)}명 ({time.perf_counter() - started:.1f}초)"
+        ))
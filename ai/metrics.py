@@ -0,0 +1,28 @@
+import threading
+from typing import Dict
+
+# 프로세스(워커) 단위 카운터. gunicorn 워커마다 별도로 집계됩니다.
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+
+
+def increment(name: str, value: float = 1):
+    """카운터 증가"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def get(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> Dict[str, float]:
+    """현재 카운터 값 복사본"""
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def reset():
+    with _lock:
+        _counters.clear()
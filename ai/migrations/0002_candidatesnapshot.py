@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requester_user_id', models.BigIntegerField()),
+                ('category', models.CharField(max_length=50)),
+                ('candidates', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('requester_user_id', 'category'), name='unique_candidate_snapshot')],
+            },
+        ),
+    ]
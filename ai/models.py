@@ -28,4 +28,18 @@ class ConnectionFeedback(models.Model):
     final_user = models.BigIntegerField()
     satisfaction_score = models.IntegerField()
     reward_sent = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class CandidateSnapshot(models.Model):
+    # 활성 사용자의 (요청자, 카테고리)별 추천 후보를 미리 계산해 둔 목록 (precompute_candidates 명령으로 갱신)
+    requester_user_id = models.BigIntegerField()
+    category = models.CharField(max_length=50)
+    # [{'recommended_user': 프로필, 'introducer_user': 프로필, 'ml_score': 연결 성공 확률}, ...] 그래프 탐색 순서
+    candidates = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['requester_user_id', 'category'], name='unique_candidate_snapshot'),
+        ]
@@ -0,0 +1,89 @@
+import logging
+import threading
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+KIND_EMPTY_GRAPH = 'empty_graph'
+KIND_MISSING_PROFILE = 'missing_profile'
+
+
+def negative_cache_setting(name: str, default: Any) -> Any:
+    """AI_NEGATIVE_CACHE 설정값 조회"""
+    return getattr(settings, 'AI_NEGATIVE_CACHE', {}).get(name, default)
+
+
+class NegativeResultCache:
+    """추천 후보가 나올 수 없는 요청자를 짧은 TTL로 기억하는 캐시
+
+    - empty_graph: Core 서비스가 답한 그래프에 2촌 후보가 없는 사용자
+    - missing_profile: /users/all 응답에 프로필이 없는 사용자
+    Core 서비스 호출이 실패한 경우는 기록하지 않으며, 캐시 장애는 캐시 미스로 취급합니다.
+    """
+
+    def __init__(self, cache_alias: str = 'default', empty_graph_ttl: int = 60, missing_profile_ttl: int = 60):
+        self.cache_alias = cache_alias
+        self.ttls = {KIND_EMPTY_GRAPH: empty_graph_ttl, KIND_MISSING_PROFILE: missing_profile_ttl}
+
+    @classmethod
+    def from_settings(cls) -> 'NegativeResultCache':
+        return cls(
+            cache_alias=negative_cache_setting('CACHE_ALIAS', 'default'),
+            empty_graph_ttl=negative_cache_setting('EMPTY_GRAPH_TTL_SECONDS', 60),
+            missing_profile_ttl=negative_cache_setting('MISSING_PROFILE_TTL_SECONDS', 60),
+        )
+
+    def contains(self, kind: str, user_id: int) -> bool:
+        try:
+            hit = caches[self.cache_alias].get(self._key(kind, user_id)) is not None
+        except Exception as e:
+            logger.warning(f"빈 결과 캐시 조회 실패: {e}")
+            return False
+        if hit:
+            metrics.increment(f'negative_cache.hit.{kind}')
+        return hit
+
+    def add(self, kind: str, user_id: int):
+        try:
+            caches[self.cache_alias].set(self._key(kind, user_id), 1, timeout=self.ttls[kind])
+        except Exception as e:
+            logger.warning(f"빈 결과 캐시 저장 실패: {e}")
+            return
+        metrics.increment(f'negative_cache.store.{kind}')
+
+    def is_isolated(self, user_id: int) -> bool:
+        return self.contains(KIND_EMPTY_GRAPH, user_id)
+
+    def mark_isolated(self, user_id: int):
+        self.add(KIND_EMPTY_GRAPH, user_id)
+
+    def is_missing_profile(self, user_id: int) -> bool:
+        return self.contains(KIND_MISSING_PROFILE, user_id)
+
+    def mark_missing_profile(self, user_id: int):
+        self.add(KIND_MISSING_PROFILE, user_id)
+
+    @staticmethod
+    def _key(kind: str, user_id: int) -> str:
+        return f'ai:negative:{kind}:{user_id}'
+
+
+_negative_cache: Optional[NegativeResultCache] = None
+_negative_cache_lock = threading.Lock()
+
+
+def get_negative_cache() -> Optional[NegativeResultCache]:
+    """프로세스 전역 빈 결과 캐시 (설정에서 꺼져 있으면 None)"""
+    global _negative_cache
+    if not negative_cache_setting('ENABLED', True):
+        return None
+    if _negative_cache is None:
+        with _negative_cache_lock:
+            if _negative_cache is None:
+                _negative_cache = NegativeResultCache.from_settings()
+    return _negative_cache
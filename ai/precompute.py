@@ -0,0 +1,153 @@
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from . import metrics
+from .llm_gateway import VALID_CATEGORIES
+from .models import CandidateSnapshot, ConnectionRequest
+
+logger = logging.getLogger(__name__)
+
+# 요청 시점 ML 점수는 min(1, 성공 확률 x 프로필 가중치)이고, 프로필 매칭 점수가 -0.1 ~ 1.0이므로
+# 가중치(1 + 매칭 점수 x 0.5)는 0.95 ~ 1.5배
+MIN_PROFILE_WEIGHT = 0.95
+MAX_PROFILE_WEIGHT = 1.5
+# 점수는 소수점 3자리로 반올림해 비교하므로 하한/상한 비교에 두는 여유
+SCORE_ROUNDING_MARGIN = 0.001
+# 추천 임계값은 최소 0.4이므로 성공 확률이 0.4 / 1.5 미만인 후보는 어떤 요청 텍스트로도 추천될 수 없어 저장하지 않음
+# (반올림해서 0.4가 되는 점수도 추천되므로 여유를 둠)
+MIN_RECOMMENDABLE_PROBA = (0.4 - SCORE_ROUNDING_MARGIN) / MAX_PROFILE_WEIGHT
+
+
+def precompute_setting(name: str, default: Any) -> Any:
+    """AI_PRECOMPUTE 설정값 조회"""
+    return getattr(settings, 'AI_PRECOMPUTE', {}).get(name, default)
+
+
+def active_user_ids(days: int) -> List[int]:
+    """최근 days일 동안 추천을 요청한 사용자 id"""
+    since = timezone.now() - timedelta(days=days)
+    return list(
+        ConnectionRequest.objects.filter(created_at__gte=since)
+        .order_by('requester_user_id').values_list('requester_user_id', flat=True).distinct()
+    )
+
+
+def load_fresh_snapshots(user_id: int, max_age_seconds: float) -> Dict[str, CandidateSnapshot]:
+    """요청자의 카테고리별 후보 목록 중 max_age_seconds 이내에 계산된 것만 반환"""
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    snapshots = CandidateSnapshot.objects.filter(requester_user_id=user_id, computed_at__gte=cutoff)
+    return {snapshot.category: snapshot for snapshot in snapshots}
+
+
+class CandidatePrecomputer:
+    """활성 사용자의 (요청자, 카테고리)별 추천 후보를 미리 계산해 CandidateSnapshot에 저장
+
+    그래프 탐색, 프로필 조회, 카테고리별 ML 성공 확률 계산을 미리 해 두고,
+    요청 시점에는 요청 텍스트 매칭과 임계값 적용만 수행합니다.
+    max_recommendations개 이하를 요청하면 실시간 계산과 같은 결과가 나오도록, 어떤 요청 텍스트로도
+    상위 max_recommendations개에 들 수 없다고 증명되는 후보만 제외합니다.
+    """
+
+    def __init__(self, service, max_recommendations: int = 10, batch_size: int = 200):
+        self.service = service
+        self.max_recommendations = max_recommendations
+        self.batch_size = batch_size
+
+    def run(self, user_ids: Iterable[int]) -> int:
+        """후보 목록을 계산해 저장하고 저장한 요청자 수 반환"""
+        if self.service.model is None:
+            raise RuntimeError("추천 모델이 로드되지 않아 후보를 미리 계산할 수 없습니다.")
+        # 사용자 id -> 프로필 (컬럼형 표, 조회할 때만 dict 생성)
+        profiles = self.service._fetch_all_user_profiles_from_core_service()
+        if profiles is None:
+            raise RuntimeError("Core 서비스에서 사용자 프로필을 가져오지 못했습니다.")
+
+        computed_at = timezone.now()
+        user_ids = list(user_ids)
+        saved = 0
+        for start in range(0, len(user_ids), self.batch_size):
+            snapshots = []
+            for user_id in user_ids[start:start + self.batch_size]:
+                requester_profile = profiles.get(user_id)
+                if requester_profile is None:
+                    continue
+                candidates = self._fetch_candidates(user_id)
+                if candidates is None:
+                    # 그래프를 받지 못한 요청자는 기존 목록을 그대로 두고 (오래되면 실시간 계산) 건너뜀
+                    logger.warning(f"네트워크 그래프를 가져오지 못해 후보 계산을 건너뜁니다: user_id={user_id}")
+                    metrics.increment('precompute.graph_errors')
+                    continue
+                snapshots.extend(
+                    CandidateSnapshot(requester_user_id=user_id, category=category, candidates=entries,
+                                      computed_at=computed_at)
+                    for category, entries in self.build(requester_profile, candidates, profiles).items()
+                )
+                saved += 1
+            self._save(snapshots)
+        metrics.increment('precompute.users', saved)
+        return saved
+
+    def _fetch_candidates(self, user_id: int) -> Optional[Dict[int, int]]:
+        """(2촌 후보 -> 소개자) 매핑, 그래프 조회에 실패하면 None
+
+        빈 결과를 실제로 연결이 없는 경우와 구분해야 하므로 빈 결과 캐시는 읽거나 기록하지 않습니다.
+        """
+        graph_data = self.service._fetch_network_graph_from_core_service(user_id, depth=2)
+        if not graph_data or 'edges' not in graph_data:
+            return None
+        candidates, _ = self.service._find_second_degree_candidates(user_id, graph_data['edges'])
+        return candidates
+
+    def build(self, requester_profile: Dict[str, Any], candidates: Dict[int, int],
+              profiles: Mapping[int, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """카테고리별 후보 목록 생성 (6개 카테고리를 한 번의 배치로 예측, 실시간 계산과 같은 그래프 순서 유지)
+
+        요청 시점 점수는 성공 확률 x 0.95 ~ 1.5이므로, 성공 확률 하한 기준 상위 max_recommendations번째 점수보다
+        상한이 확실히 낮은 후보는 어떤 요청에서도 상위 max_recommendations개에 들 수 없어 제외합니다.
+        """
+        candidate_ids = [c for c in candidates if c in profiles and candidates[c] in profiles]
+        if not candidate_ids:
+            return {category: [] for category in VALID_CATEGORIES}
+
+        requester_age = requester_profile.get('age_band', '30s')
+        features = self.service.feature_encoder.encode_batch([{
+            'relationship_degree': 2,
+            'category': category,
+            'requester_age': requester_age,
+            'candidate_gender': profiles[candidate_id].get('gender', 'male')
+        } for category in VALID_CATEGORIES for candidate_id in candidate_ids])
+        success_proba = self.service._predict_success_proba(features).reshape(len(VALID_CATEGORIES), -1)
+
+        lower_bounds = np.minimum(1.0, success_proba * MIN_PROFILE_WEIGHT)
+        upper_bounds = np.minimum(1.0, success_proba * MAX_PROFILE_WEIGHT)
+        results = {}
+        for row, category in enumerate(VALID_CATEGORIES):
+            keep = success_proba[row] >= MIN_RECOMMENDABLE_PROBA
+            if len(candidate_ids) > self.max_recommendations:
+                # max_recommendations명 이상이 확실히 앞서는 후보는 제외 (같은 점수 가능성이 있으면 유지)
+                cutoff = np.sort(lower_bounds[row])[-self.max_recommendations]
+                keep &= upper_bounds[row] + SCORE_ROUNDING_MARGIN >= cutoff
+            results[category] = [{
+                'recommended_user': profiles[candidate_ids[i]],
+                'introducer_user': profiles[candidates[candidate_ids[i]]],
+                'ml_score': float(success_proba[row, i]),
+            } for i in np.flatnonzero(keep)]
+        return results
+
+    @staticmethod
+    def _save(snapshots: List[CandidateSnapshot]):
+        if not snapshots:
+            return
+        # MySQL은 충돌 대상 컬럼을 지정하지 않음 (유니크 제약으로 판단)
+        unique_fields = ['requester_user_id', 'category'] \
+            if connection.features.supports_update_conflicts_with_target else None
+        CandidateSnapshot.objects.bulk_create(
+            snapshots, update_conflicts=True, unique_fields=unique_fields,
+            update_fields=['candidates', 'computed_at']
+        )
@@ -0,0 +1,208 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+# 카테고리별 핵심 키워드 정의 (1차 매칭) - 더욱 확장된 키워드
+PRIMARY_KEYWORDS = {
+    'repair': ['수리', '전기', '배관', '수도', '가전', '고장', '수선', '보수', '정비', '교체', '냉장고', '세탁기', 'tv', '에어컨', '보일러', '온수기', '기사', 'repair', 'fix', 'broken', 'plumbing', 'electrical'],
+    'cleaning': ['청소', '정리', '대청소', '입주청소', '이사청소', '비우기', '정돈', '깔끔', 'clean', 'cleaning', 'organize'],
+    'pest_control': ['방역', '바퀴벌레', '쥐', '개미', '모기', '벌', '해충', '소독', '퇴치', '박멸', 'pest', 'cockroach', 'ant', 'control'],
+    'tech_service': ['포스기', '프린터', '와이파이', 'cctv', '앱', '컴퓨터', '기술', '설치', '점검', 'wifi', 'install', 'tech', '전자제품'],
+    'life_helper': ['짐나르기', '반려동물', '산책', '심부름', '물건구매', '배송', '전달', '도움', '서비스', '알바', '대행', '촬영', '사진'],
+    'senior_support': ['번역', '통역', '어르신', '관공서', '동행', '병원', '약국', '안내', '지원', 'translate', '외국인']
+}
+
+# 2차 연관 키워드 정의 (관련 있지만 우선순위 낮음)
+SECONDARY_KEYWORDS = {
+    'repair': ['도구', '전문가', '기사', '숙련', '경험'],
+    'cleaning': ['깔끔', '완벽', '꼼꼼', '청결', '위생'],
+    'pest_control': ['전문', '안전', '효과적', '깨끗'],
+    'tech_service': ['전문가', '신속', '숙련', '해결'],
+    'life_helper': ['친절', '빠른', '안전', '신뢰'],
+    'senior_support': ['정중', '친절', '배려', '세심']
+}
+
+CATEGORIES = list(PRIMARY_KEYWORDS)
+
+
+def profile_features_setting(name: str, default: Any) -> Any:
+    """AI_PROFILE_FEATURES 설정값 조회"""
+    return getattr(settings, 'AI_PROFILE_FEATURES', {}).get(name, default)
+
+
+class ProfileFeatures:
+    """사용자 한 명의 intro에서 미리 계산한 키워드 특징 (intro 원문은 보관하지 않음)"""
+
+    __slots__ = ('intro_hash', 'hits', 'primary_counts', 'secondary_counts')
+
+    def __init__(self, intro_hash: int, hits: int, primary_counts: Tuple[int, ...], secondary_counts: Tuple[int, ...]):
+        self.intro_hash = intro_hash                # 소문자로 변환한 intro의 해시 (intro가 바뀌었는지 확인용)
+        self.hits = hits                            # 카테고리별 1차 키워드 포함 여부 비트셋 (키워드 위치 = 비트 위치)
+        self.primary_counts = primary_counts        # 카테고리별 1차 키워드 포함 개수
+        self.secondary_counts = secondary_counts    # 카테고리별 2차 키워드 포함 개수
+
+
+class RequestKeywords:
+    """요청 텍스트에서 한 번만 계산하는 매칭용 키워드"""
+
+    __slots__ = ('long_words', 'related_masks')
+
+    def __init__(self, request_text: str):
+        request_keywords = set(request_text.lower().split())
+        # 3글자 이상만 유효
+        self.long_words = [word for word in request_keywords if len(word) > 2]
+        # 요청 텍스트와 연관된 1차 키워드 비트마스크 (ProfileFeatures.hits와 같은 비트 위치)
+        self.related_masks = {}
+        bit = 0
+        for category, keywords in PRIMARY_KEYWORDS.items():
+            mask = 0
+            for keyword in keywords:
+                if any(word in keyword or keyword in word for word in self.long_words):
+                    mask |= 1 << bit
+                bit += 1
+            self.related_masks[category] = mask
+
+
+@lru_cache(maxsize=256)
+def request_keywords(request_text: str) -> RequestKeywords:
+    return RequestKeywords(request_text)
+
+
+class ProfileFeatureCache:
+    """사용자 id별 intro 키워드 특징 캐시 (최근에 사용한 max_entries명까지 보관)
+
+    처음 점수를 계산할 때나 intro가 바뀌었을 때만 다시 계산하고,
+    요청 시점에는 미리 계산한 비트셋과 요청 키워드만 조합해 매칭 점수를 만듭니다.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.categories = CATEGORIES
+        self._category_index = {category: i for i, category in enumerate(self.categories)}
+
+        # 1차 키워드는 (카테고리, 키워드) 순서대로 비트 위치를 부여하고, 2차 키워드는 개수만 저장
+        self._primary_keywords = [PRIMARY_KEYWORDS[c] for c in self.categories]
+        self._secondary_keywords = [SECONDARY_KEYWORDS.get(c, []) for c in self.categories]
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[int, ProfileFeatures]' = OrderedDict()
+
+    @classmethod
+    def from_settings(cls) -> 'ProfileFeatureCache':
+        return cls(max_entries=profile_features_setting('MAX_ENTRIES', 100_000))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compute(self, intro: str) -> ProfileFeatures:
+        """intro 한 개의 키워드 특징 계산"""
+        intro = (intro or '').lower()
+        hits = 0
+        bit = 0
+        primary_counts = []
+        for keywords in self._primary_keywords:
+            count = 0
+            for keyword in keywords:
+                if keyword in intro:
+                    hits |= 1 << bit
+                    count += 1
+                bit += 1
+            primary_counts.append(count)
+        secondary_counts = tuple(
+            sum(1 for keyword in keywords if keyword in intro) for keywords in self._secondary_keywords
+        )
+        return ProfileFeatures(hash(intro), hits, tuple(primary_counts), secondary_counts)
+
+    def ingest(self, profiles: Iterable[Dict[str, Any]]):
+        """미리 계산해 둘 프로필 (intro가 바뀐 사용자만 다시 계산)"""
+        for profile in profiles:
+            if profile.get('id') is not None:
+                self._lookup(profile.get('id'), (profile.get('intro') or '').lower())
+
+    def get(self, profile: Dict[str, Any]) -> ProfileFeatures:
+        """프로필의 키워드 특징 (캐시에 없거나 intro가 바뀌었으면 새로 계산)"""
+        return self._lookup(profile.get('id'), (profile.get('intro') or '').lower())
+
+    def _lookup(self, user_id: Optional[int], intro: str) -> ProfileFeatures:
+        """소문자 intro의 특징 (user_id가 있으면 캐시하고, 넘치면 가장 오래 사용하지 않은 사용자부터 제거)"""
+        if user_id is None:
+            return self.compute(intro)
+        intro_hash = hash(intro)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.intro_hash == intro_hash:
+                self._entries.move_to_end(user_id)
+                return entry
+        entry = self.compute(intro)
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def match_score(self, request_text: str, category: str, profile: Dict[str, Any],
+                    keywords: Optional[RequestKeywords] = None) -> float:
+        """요청 내용과 후보자 프로필의 매칭 점수 (미리 계산한 특징 사용)"""
+        intro = (profile.get('intro') or '').lower()
+        if not intro:
+            return 0.0
+        entry = self._lookup(profile.get('id'), intro)
+        keywords = keywords or request_keywords(request_text)
+
+        match_score = 0.0
+
+        # 1차: 직접 요청 키워드 매칭 (최고 가중치)
+        for word in keywords.long_words:
+            if word in intro:
+                match_score += 0.5  # 직접 매칭 시 높은 점수
+
+        category_index = self._category_index.get(category)
+        total_primary = sum(entry.primary_counts)
+        if category_index is not None:
+            # 2차: 카테고리별 핵심 키워드 매칭 (요청과 연관되면 0.4, 아니면 0.25)
+            primary_count = entry.primary_counts[category_index]
+            if primary_count:
+                related_hits = (entry.hits & keywords.related_masks.get(category, 0)).bit_count()
+                match_score += 0.4 * related_hits + 0.25 * (primary_count - related_hits)
+            # 2차 키워드 매칭 (중간 가중치)
+            match_score += 0.1 * entry.secondary_counts[category_index]
+            total_primary -= primary_count
+
+        # 다른 카테고리 키워드 매칭 (낮은 가중치 - 2순위)
+        match_score += 0.05 * total_primary
+
+        # 매너온도 보정 (높은 매너온도 = 신뢰도 높음)
+        manner_temp = profile.get('manner_temperature', 50)
+        if manner_temp >= 70:
+            match_score += 0.1
+        elif manner_temp >= 60:
+            match_score += 0.05
+        elif manner_temp <= 40:
+            match_score -= 0.1
+
+        return min(1.0, match_score)
+
+    def match_scores(self, request_text: str, category: str, profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """후보 여러 명의 매칭 점수 (요청 키워드는 한 번만 계산)"""
+        keywords = request_keywords(request_text)
+        return np.array([self.match_score(request_text, category, profile, keywords) for profile in profiles],
+                        dtype=np.float64)
+
+
+_cache: Optional[ProfileFeatureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_feature_cache() -> ProfileFeatureCache:
+    """프로세스 전역 프로필 특징 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProfileFeatureCache.from_settings()
+    return _cache
@@ -0,0 +1,211 @@
+import codecs
+import json
+import re
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 컬럼으로 저장하는 프로필 필드 (응답에 그대로 내보내므로 이 순서로 dict를 복원)
+PROFILE_FIELDS = ('id', 'username', 'name', 'email', 'province_name', 'city_name', 'gender', 'age_band', 'intro',
+                  'manner_temperature')
+# 값 종류가 적은 필드는 intern해서 사용자끼리 같은 문자열 객체를 공유
+INTERNED_FIELDS = frozenset(('province_name', 'city_name', 'gender', 'age_band'))
+
+_MISSING = object()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# 숫자 뒤에 이어질 수 있는 문자 (조각 경계에서 '12.'|'5'처럼 숫자가 잘린 경우 확인용)
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class ProfileTable(Mapping):
+    """사용자 id -> 프로필 컬럼형 표
+
+    사용자마다 dict를 유지하지 않고 필드별 리스트에 값을 저장합니다. 조회할 때만 dict를 만들어 반환하고
+    (호출마다 새 dict), 정해진 필드 외의 값은 행별 extras에 보관합니다.
+    """
+
+    __slots__ = ('_rows', '_columns', '_extras')
+
+    def __init__(self):
+        self._rows: Dict[int, int] = {}                                   # 사용자 id -> 행 번호
+        self._columns: Dict[str, List[Any]] = {field: [] for field in PROFILE_FIELDS}
+        self._extras: List[Optional[Dict[str, Any]]] = []
+
+    @classmethod
+    def from_profiles(cls, profiles: Iterable[Dict[str, Any]]) -> 'ProfileTable':
+        table = cls()
+        for profile in profiles:
+            table.append(profile)
+        return table
+
+    def append(self, profile: Dict[str, Any]):
+        """프로필 한 건 추가 (id가 없으면 무시, 같은 id가 다시 오면 마지막 값 사용)"""
+        user_id = profile.get('id')
+        if user_id is None:
+            return
+        row = self._rows.get(user_id)
+        if row is None:
+            self._rows[user_id] = len(self._extras)
+        get = profile.get
+        for field, column in self._columns.items():
+            value = get(field, _MISSING)
+            if field in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            if row is None:
+                column.append(value)
+            else:
+                column[row] = value
+        extras = None
+        if not profile.keys() <= self._columns.keys():
+            extras = {key: value for key, value in profile.items() if key not in self._columns}
+        if row is None:
+            self._extras.append(extras)
+        else:
+            self._extras[row] = extras
+
+    def __getitem__(self, user_id: int) -> Dict[str, Any]:
+        row = self._rows[user_id]
+        profile = {}
+        for field, column in self._columns.items():
+            value = column[row]
+            if value is not _MISSING:
+                profile[field] = value
+        extras = self._extras[row]
+        if extras:
+            profile.update(extras)
+        return profile
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = 'results') -> Iterator[Any]:
+    """JSON 객체 응답 본문을 조각(chunk) 단위로 읽으면서 최상위 key 배열의 원소를 하나씩 반환
+
+    본문 전체나 전체 원소 리스트를 메모리에 만들지 않습니다. key가 없으면 아무것도 반환하지 않습니다.
+    """
+    reader = _JSONStreamReader(chunks)
+    reader.expect('{')
+    if reader.consume('}'):
+        return
+    while True:
+        name = reader.decode()
+        reader.expect(':')
+        if name == key:
+            reader.expect('[')
+            yield from reader.iter_array()
+        else:
+            reader.decode()
+        if reader.consume('}'):
+            return
+        reader.expect(',')
+
+
+class _JSONStreamReader:
+    """바이트 조각을 UTF-8로 이어 붙이며 JSON 값을 하나씩 꺼내는 읽기 도우미"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """다음 조각을 읽어 버퍼에 추가 (더 읽을 것이 없으면 False)"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._utf8.decode(b'', final=True)
+        else:
+            text = self._utf8.decode(chunk)
+        # 이미 읽은 부분은 버림
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        """공백을 건너뛰고 다음 문자가 있으면 True"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return True
+            if not self._fill():
+                return False
+
+    def consume(self, char: str) -> bool:
+        """다음 문자가 char이면 읽고 True"""
+        if self._skip_whitespace() and self._buffer[self._pos] == char:
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, char: str):
+        if not self.consume(char):
+            found = self._buffer[self._pos:self._pos + 20] if self._pos < len(self._buffer) else '본문 끝'
+            raise ValueError(f"JSON 형식이 올바르지 않습니다: '{char}' 위치에 {found!r}")
+
+    def iter_array(self) -> Iterator[Any]:
+        """'[' 다음부터 ']'까지 배열 원소를 하나씩 반환 (원소마다 호출되므로 C 스캐너를 직접 사용)"""
+        if self.consume(']'):
+            return
+        scan_once = self._decoder.scan_once
+        skip = _WHITESPACE.match
+        while True:
+            buffer = self._buffer
+            try:
+                value, end = scan_once(buffer, skip(buffer, self._pos).end())
+            except (StopIteration, json.JSONDecodeError):
+                # 원소가 조각 경계에 걸림
+                if not self._fill():
+                    raise ValueError("JSON 형식이 올바르지 않습니다: 배열 원소를 읽을 수 없습니다")
+                continue
+            if type(value) in (int, float) and self._number_may_continue(buffer, end):
+                if not self._fill():
+                    raise ValueError("JSON 형식이 올바르지 않습니다: 배열이 닫히지 않았습니다")
+                continue
+            end = skip(buffer, end).end()
+            if end == len(buffer):
+                # 구분자(',' 또는 ']')가 아직 도착하지 않음 (숫자 원소는 뒤에 자릿수가 더 올 수도 있음)
+                if not self._fill():
+                    raise ValueError("JSON 형식이 올바르지 않습니다: 배열이 닫히지 않았습니다")
+                continue
+            separator = buffer[end]
+            if separator not in ',]':
+                raise ValueError(f"JSON 형식이 올바르지 않습니다: 배열 구분자 위치에 {separator!r}")
+            self._pos = end + 1
+            yield value
+            if separator == ']':
+                return
+
+    def decode(self) -> Any:
+        """다음 JSON 값 하나를 읽어 반환 (값이 조각 경계에 걸리면 다음 조각을 더 읽고 다시 시도)"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 숫자/리터럴이 버퍼 끝에서 끝났으면 뒤에 더 이어질 수 있으므로 다음 조각 확인
+            may_continue = end == len(self._buffer) or \
+                (type(value) in (int, float) and self._number_may_continue(self._buffer, end))
+            if may_continue and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _number_may_continue(self, buffer: str, end: int) -> bool:
+        """end에서 끝난 숫자가 조각 경계에서 잘렸을 수 있는지 ('12.', '1e', '1.5E-' 뒤에 자릿수가 올 수 있음)"""
+        return not self._eof and _NUMBER_TAIL.match(buffer, end).end() == len(buffer)
@@ -0,0 +1,154 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticIntroIndex:
+    """후보자 intro를 char n-gram TF-IDF(+LSA) 벡터로 미리 임베딩한 인덱스
+
+    오프라인에서 build()로 만들어 저장하고, 요청 시에는 요청 텍스트 벡터와
+    후보 행렬의 행렬-벡터 곱 한 번으로 전체 후보의 유사도를 계산합니다.
+    """
+
+    def __init__(self, vectorizer, svd, user_ids: np.ndarray, matrix: np.ndarray):
+        self.vectorizer = vectorizer
+        self.svd = svd                   # None이면 TF-IDF 희소 행렬을 그대로 사용
+        self.user_ids = user_ids
+        self.matrix = matrix             # (n_users, dim) L2 정규화된 임베딩
+        self._row_index = {int(user_id): row for row, user_id in enumerate(user_ids)}
+
+    @classmethod
+    def build(cls, profiles: Sequence[Dict[str, Any]], n_components: int = 128) -> 'SemanticIntroIndex':
+        """프로필 intro로 벡터라이저를 학습하고 임베딩 행렬 생성"""
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        profiles = [p for p in profiles if p.get('id') is not None and p.get('intro')]
+        intros = [p['intro'].lower() for p in profiles]
+        user_ids = np.array([p['id'] for p in profiles], dtype=np.int64)
+
+        # 한국어 조사/어미 변화에 강하도록 단어 경계 안의 문자 n-gram 사용
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3), sublinear_tf=True, min_df=1)
+        tfidf = vectorizer.fit_transform(intros)
+
+        svd = None
+        if 0 < n_components < min(tfidf.shape):
+            svd = TruncatedSVD(n_components=n_components, random_state=42)
+            matrix = svd.fit_transform(tfidf)
+        else:
+            matrix = tfidf.toarray()
+        return cls(vectorizer, svd, user_ids, _normalize(matrix.astype(np.float32)))
+
+    @classmethod
+    def load(cls, path: str) -> 'SemanticIntroIndex':
+        import joblib
+
+        data = joblib.load(path)
+        return cls(data['vectorizer'], data['svd'], data['user_ids'], data['matrix'])
+
+    def save(self, path: str):
+        import joblib
+
+        joblib.dump({
+            'vectorizer': self.vectorizer,
+            'svd': self.svd,
+            'user_ids': self.user_ids,
+            'matrix': self.matrix,
+        }, path)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._row_index
+
+    def embed(self, text: str) -> np.ndarray:
+        """요청 텍스트 임베딩 (dim,)"""
+        vector = self.vectorizer.transform([text.lower()])
+        vector = self.svd.transform(vector) if self.svd is not None else vector.toarray()
+        return _normalize(vector.astype(np.float32))[0]
+
+    def similarities(self, text: str, user_ids: Optional[Sequence[int]] = None) -> np.ndarray:
+        """요청 텍스트와 후보들의 코사인 유사도 (인덱스에 없는 후보는 NaN)"""
+        query = self.embed(text)
+        if user_ids is None:
+            return self.matrix @ query
+        rows = np.array([self._row_index.get(int(user_id), -1) for user_id in user_ids], dtype=np.intp)
+        scores = np.full(len(rows), np.nan, dtype=np.float32)
+        known = rows >= 0
+        if known.any():
+            scores[known] = self.matrix[rows[known]] @ query
+        return scores
+
+    def top_k(self, text: str, k: int = 10) -> List[int]:
+        """전체 인덱스에서 유사도가 높은 사용자 id k명 (argpartition으로 부분 정렬)"""
+        scores = self.similarities(text)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [int(self.user_ids[row]) for row in top]
+
+
+class SemanticMatcher:
+    """키워드 매칭 점수에 의미 유사도를 결합 (인덱스에 없는 후보는 키워드 점수 유지)"""
+
+    def __init__(self, index: SemanticIntroIndex, similarity_floor: float = 0.1, similarity_ceiling: float = 0.6):
+        self.index = index
+        self.similarity_floor = similarity_floor
+        self.similarity_ceiling = similarity_ceiling
+
+    def match_scores(self, request_text: str, user_ids: Sequence[int], keyword_scores: np.ndarray) -> np.ndarray:
+        """max(키워드 점수, 유사도를 0~1로 보정한 점수)"""
+        similarities = self.index.similarities(request_text, user_ids)
+        semantic_scores = np.clip(
+            (similarities - self.similarity_floor) / (self.similarity_ceiling - self.similarity_floor), 0.0, 1.0
+        )
+        return np.where(np.isnan(similarities), keyword_scores, np.maximum(keyword_scores, semantic_scores))
+
+
+def semantic_setting(name: str, default: Any) -> Any:
+    """AI_SEMANTIC_MATCHING 설정값 조회"""
+    return getattr(settings, 'AI_SEMANTIC_MATCHING', {}).get(name, default)
+
+
+def default_index_path() -> str:
+    return semantic_setting('INDEX_PATH', os.path.join(settings.BASE_DIR, 'ml_models', 'semantic_index.joblib'))
+
+
+@lru_cache(maxsize=None)
+def _load_matcher(path: str) -> Optional[SemanticMatcher]:
+    try:
+        index = SemanticIntroIndex.load(path)
+    except FileNotFoundError:
+        logger.warning(f"의미 매칭 인덱스 파일이 없어 키워드 매칭만 사용합니다: {path}")
+        return None
+    except Exception as e:
+        logger.error(f"의미 매칭 인덱스 로딩 실패, 키워드 매칭만 사용합니다: {e}")
+        return None
+    logger.info(f"의미 매칭 인덱스 로딩 성공: {len(index)}명")
+    return SemanticMatcher(
+        index,
+        similarity_floor=semantic_setting('SIMILARITY_FLOOR', 0.1),
+        similarity_ceiling=semantic_setting('SIMILARITY_CEILING', 0.6),
+    )
+
+
+def get_semantic_matcher() -> Optional[SemanticMatcher]:
+    """설정에서 켜져 있고 인덱스 파일이 있으면 SemanticMatcher, 아니면 None"""
+    if not semantic_setting('ENABLED', False):
+        return None
+    return _load_matcher(default_index_path())
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -23,6 +23,22 @@ class RecommendationRequestSerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
     request_text = serializers.CharField(max_length=1000)
     max_recommendations = serializers.IntegerField(default=5, min_value=1, max_value=10)
+    # 시/도 또는 시/군/구 이름 (예: '서울특별시', '강남구'), 비우면 지역 제한 없음
+    location = serializers.CharField(max_length=50, required=False, allow_blank=True, default='')
+
+class BulkRecommendationItemSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    request_text = serializers.CharField(max_length=1000)
+
+class BulkRecommendationRequestSerializer(serializers.Serializer):
+    """여러 요청자의 추천을 한 번에 요청 (배치 작업용)"""
+    requests = BulkRecommendationItemSerializer(many=True, allow_empty=False)
+    max_recommendations = serializers.IntegerField(default=5, min_value=1, max_value=10)
+    
+    def validate_requests(self, value):
+        if len(value) > 1000:
+            raise serializers.ValidationError("한 번에 최대 1000건까지 요청할 수 있습니다.")
+        return value
 
 class UserProfileSerializer(serializers.Serializer):
     """Core 서비스의 사용자 프로필"""
@@ -48,4 +64,68 @@ class EnhancedRecommendationSerializer(serializers.Serializer):
 class RecommendationResponseSerializer(serializers.Serializer):
     request_id = serializers.IntegerField()
     recommendations = EnhancedRecommendationSerializer(many=True)
-    inferred_category = serializers.CharField()
\ No newline at end of file
+    inferred_category = serializers.CharField()
+    scorer = serializers.CharField(allow_null=True)  # 점수를 계산한 scorer (ml / rule_based)
+    partial = serializers.BooleanField(default=False)  # 마감 시간 때문에 일부 단계를 생략한 결과인지
+
+class BulkRecommendationResponseSerializer(RecommendationResponseSerializer):
+    user_id = serializers.IntegerField()
+
+
+# --- 응답 고속 렌더링 ---
+# 추천 결과는 서비스 내부에서 만든 신뢰할 수 있는 데이터이므로 DRF 필드 검증 없이
+# 위 응답 Serializer와 같은 JSON을 만드는 경로입니다. 필드를 바꿀 때는 두 곳을 함께 수정해야 합니다.
+# (값 변환 규칙도 DRF와 동일: None은 그대로, 필수 키가 없으면 KeyError, default/allow_null 필드는 기본값)
+
+_USER_PROFILE_FIELDS = (
+    ('id', int), ('username', str), ('name', str), ('email', str), ('province_name', str),
+    ('city_name', str), ('gender', str), ('age_band', str), ('intro', str), ('manner_temperature', int),
+)
+
+
+def _to_representation(value, convert):
+    return None if value is None else convert(value)
+
+
+def _to_bool(value):
+    if value in serializers.BooleanField.TRUE_VALUES:
+        return True
+    if value in serializers.BooleanField.FALSE_VALUES:
+        return False
+    return bool(value)
+
+
+def _user_profile_data(profile):
+    if profile is None:
+        return None
+    return {name: _to_representation(profile[name], convert) for name, convert in _USER_PROFILE_FIELDS}
+
+
+def _recommendation_data(recommendation):
+    if recommendation is None:
+        return None
+    return {
+        'id': _to_representation(recommendation['id'], int),
+        'recommended_user': _user_profile_data(recommendation['recommended_user']),
+        'introducer_user': _user_profile_data(recommendation['introducer_user']),
+        'relationship_degree': _to_representation(recommendation['relationship_degree'], int),
+        'ai_score': _to_representation(recommendation['ai_score'], float),
+    }
+
+
+def recommendation_response_data(result):
+    """RecommendationResponseSerializer(result).data와 같은 결과를 plain dict로 생성"""
+    return {
+        'request_id': _to_representation(result['request_id'], int),
+        'recommendations': [_recommendation_data(r) for r in result['recommendations']],
+        'inferred_category': _to_representation(result['inferred_category'], str),
+        'scorer': _to_representation(result.get('scorer'), str),
+        'partial': _to_representation(result.get('partial', False), _to_bool),
+    }
+
+
+def bulk_recommendation_response_data(result):
+    """BulkRecommendationResponseSerializer(result).data와 같은 결과를 plain dict로 생성"""
+    data = recommendation_response_data(result)
+    data['user_id'] = _to_representation(result['user_id'], int)
+    return data
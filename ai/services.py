@@ -1,256 +1,293 @@
+import math
+import multiprocessing
 import random
 import os
-import joblib
-import pandas as pd
+import time
+import warnings
+import numpy as np
 import requests
 from django.conf import settings
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from django.db.models import Q
 from .models import Relationships, ConnectionRequest, RecommendationLog
-import google.generativeai as genai 
+from . import metrics
+from .deadline import Deadline, deadline_setting
+from .degradation import SCORER_ML, SCORER_RULE_BASED, get_scorer_selector
+from .features import FeatureEncoder, load_model_bundle
+from .llm_gateway import VALID_CATEGORIES, get_llm_gateway, infer_category_by_keywords, llm_setting
+from .location_index import get_location_index, matches_location
+from .negative_cache import get_negative_cache
+from .precompute import load_fresh_snapshots, precompute_setting
+from .profile_features import get_profile_feature_cache
+from .profile_table import ProfileTable, iter_json_array
+from .semantic import get_semantic_matcher
+from .sharded_scoring import discard_sharded_executor, get_sharded_executor
 import logging
 logger = logging.getLogger(__name__)
 
+# /users/all 응답을 스트리밍으로 읽을 때 한 번에 받는 바이트 수
+PROFILE_STREAM_CHUNK_SIZE = 64 * 1024
+# 스트리밍 파싱 중 이 수의 사용자마다 요청 마감 시간 확인
+PROFILE_STREAM_DEADLINE_CHECK_EVERY = 1000
+
+# 규칙 기반 점수의 카테고리별 기본 가중치
+RULE_CATEGORY_WEIGHTS = {
+    'repair': 0.2,          # 수리
+    'cleaning': 0.15,       # 청소 
+    'pest_control': 0.2,    # 방역
+    'tech_service': 0.2,    # 기술 서비스
+    'life_helper': 0.1,     # 생활 도우미
+    'senior_support': 0.2   # 고령자 지원
+}
+
+def default_model_path() -> str:
+    """추천 모델 번들 경로"""
+    return os.path.join(settings.BASE_DIR, 'ml_models', 'recommendation_model.joblib')
+
 class AIRecommendationService:
     """AI 기반 연결 추천 서비스 (Gemini 1.5 Pro API 연동)"""
     
     def __init__(self):
-        """서비스 초기화 시 Gemini API 키를 설정합니다."""
-        api_key = os.getenv('GOOGLE_API_KEY')
-        if not api_key:
+        """서비스 초기화 시 Gemini API 키를 확인합니다. (클라이언트는 LLM 게이트웨이에서 한 번만 생성)"""
+        if llm_setting('BACKEND', 'gemini') == 'gemini' and not os.getenv('GOOGLE_API_KEY'):
             raise ValueError("GOOGLE_API_KEY가 설정되지 않았습니다.")
-        genai.configure(api_key=api_key) # Gemini 설정 방식으로 변경
+        self.llm_gateway = get_llm_gateway()
+        
+        # 요청 처리 중 조회한 사용자 프로필 (같은 요청 안에서 /users/all 재호출 방지)
+        self._profile_cache: Dict[int, Dict[str, Any]] = {}
+        # Core 서비스가 정상 응답했지만 프로필이 없던 사용자 id
+        self._missing_profile_ids: set = set()
+        # 후보가 없는 요청자/프로필 없는 요청자를 짧게 기억하는 캐시 (꺼져 있으면 None)
+        self.negative_cache = get_negative_cache()
+        # 사용자별 intro 키워드 특징 (프로세스 전역, 프로필 수집 시 갱신)
+        self.profile_features = get_profile_feature_cache()
+        # 시/도, 시/군/구 -> 사용자 id 역색인 (프로세스 전역, 프로필 수집 시 갱신)
+        self.location_index = get_location_index()
         
         # 머신러닝 모델 로딩 
-        model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'recommendation_model.joblib')
+        model_path = default_model_path()
         try:
-            self.model = joblib.load(model_path)
-            # 모델에서 직접 feature names 가져오기
-            self.model_columns = list(self.model.feature_names_in_)
-            logger.info(f"추천 모델 로딩 성공: {len(self.model_columns)}개 features")
-            logger.info(f"Features: {self.model_columns}")
+            # 모델과 학습 어휘로 만든 인코더는 프로세스당 한 번만 로딩
+            self.model, self.feature_encoder = load_model_bundle(model_path)
+            self.model_columns = self.feature_encoder.feature_names
+            logger.debug(f"추천 모델 로딩 성공: {len(self.model_columns)}개 features")
         except FileNotFoundError:
             self.model = None
+            self.feature_encoder = FeatureEncoder.default()
             logger.error(f"모델 파일을 찾을 수 없습니다: {model_path}")
         except Exception as e:
             self.model = None
+            self.feature_encoder = FeatureEncoder.default()
             logger.error(f"모델 로딩 실패: {e}")
         
-    def _call_gemini_api(self, request_text: str) -> str:
-        """Gemini API를 호출하여 카테고리를 추론하는 내부 메서드"""
-        # Gemini에게 역할을 부여하고, 원하는 작업과 출력 형식을 명확히 지시
-        system_prompt = """
-        당신은 '건너건너'라는 생활 서비스 연결 플랫폼의 요청 분석 AI입니다.
-        사용자의 요청 텍스트를 분석하여 아래 6가지 생활 서비스 카테고리 중 가장 적합한 것 하나만 골라 적절한 답으로 답해주세요.
-        다른 설명은 절대 추가하지 마세요.
-        
-        카테고리:
-        - repair: 수리·유지보수 (전기, 배관, 가전제품, 샷시, 열쇠 등)
-        - cleaning: 청소·폐기 (입주청소, 쓰레기처리, 대청소 등)
-        - pest_control: 해충·방역 (바퀴벌레, 쥐, 모기, 소독 등)
-        - tech_service: 기술 서비스 (포스기, 와이파이, CCTV, 컴퓨터 등)
-        - life_helper: 생활 도우미 (짐나르기, 반려동물 산책, 심부름 등)
-        - senior_support: 고령자·외국인 지원 (번역, 관공서 동행, 병원 안내 등)
-        """
+    def _call_gemini_api(self, request_text: str, timeout: Optional[float] = None) -> str:
+        """Gemini API를 호출하여 카테고리를 추론하는 내부 메서드
         
-        try:
-            # 사용할 모델을 지정합니다. (무료 버전용)
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            # 프롬프트와 함께 요청을 보냅니다.
-            response = model.generate_content(f"{system_prompt}\n\n사용자 요청: {request_text}")
-            
-            # Gemini의 답변에서 텍스트만 추출하고 공백을 제거합니다.
-            category = response.text.strip().lower()
-            
-            # 유효한 카테고리인지 확인하는 안전장치
-            valid_categories = ['repair', 'cleaning', 'pest_control', 'tech_service', 'life_helper', 'senior_support']
-            if category in valid_categories:
-                return category
-            return 'life_helper' # 유효하지 않은 답변일 경우 기본값 반환
-
-        except Exception as e:
-            logger.error(f"Gemini API 호출 중 오류 발생: {e}")
-            return 'life_helper' # API 오류 시 기본값 반환
+        같은 시간에 들어온 요청들은 게이트웨이에서 하나의 호출로 묶여 JSON(enum)으로 분류됩니다.
+        """
+        category = self.llm_gateway.classify(request_text, timeout=timeout)
+        if category in VALID_CATEGORIES:
+            return category
+        return 'life_helper' # 유효하지 않은 답변이나 API 오류 시 기본값 반환
     
-    def infer_category(self, request_text: str) -> str:
+    def infer_category(self, request_text: str, deadline: Optional[Deadline] = None) -> str:
         """요청 텍스트에서 카테고리 추론"""
-        # 1차: Gemini API 시도
-        gemini_result = self._call_gemini_api(request_text)
-        if gemini_result != 'life_helper':  # 기본값이 아니면 성공
-            return gemini_result
+        # 1차: Gemini API 시도 (남은 시간이 부족하면 생략)
+        deadline = deadline or Deadline.unlimited()
+        if deadline.allows(deadline_setting('GEMINI_MIN_SECONDS', 1.0)):
+            gemini_result = self._call_gemini_api(
+                request_text, timeout=deadline.timeout(deadline_setting('GEMINI_TIMEOUT_SECONDS', 5.0))
+            )
+            if gemini_result != 'life_helper':  # 기본값이 아니면 성공
+                return gemini_result
+            if deadline.expired:
+                deadline.miss('infer_category')
+        else:
+            deadline.miss('infer_category')
             
         # 2차: 로컬 키워드 기반 추론 (API 실패 시 대안)
         return self._infer_category_locally(request_text)
     
+    def infer_categories(self, request_texts: List[str], deadline: Optional[Deadline] = None) -> List[str]:
+        """여러 요청 텍스트의 카테고리를 LLM 배치 호출로 한 번에 추론"""
+        deadline = deadline or Deadline.unlimited()
+        results: List[Optional[str]] = [None] * len(request_texts)
+        if deadline.allows(deadline_setting('GEMINI_MIN_SECONDS', 1.0)):
+            results = self.llm_gateway.classify_many(
+                request_texts, timeout=deadline.timeout(deadline_setting('GEMINI_TIMEOUT_SECONDS', 5.0))
+            )
+        else:
+            deadline.miss('infer_category')
+        # 기본값(life_helper)이거나 실패한 요청은 로컬 키워드 추론으로 보완
+        return [
+            category if category in VALID_CATEGORIES and category != 'life_helper' else self._infer_category_locally(text)
+            for category, text in zip(results, request_texts)
+        ]
+    
     def _infer_category_locally(self, request_text: str) -> str:
         """로컬 키워드 기반 카테고리 추론 (Gemini API 대안)"""
-        text = request_text.lower()
-        
-        # 키워드 기반 카테고리 매칭
-        category_keywords = {
-            'pest_control': ['바퀴벌레', 'cockroach', '쥐', 'rat', '방역', 'pest', '해충', '소독', '개미', 'ant'],
-            'repair': ['수리', 'repair', 'fix', '고장', '전기', 'electrical', '배관', 'plumbing', '가전'],
-            'cleaning': ['청소', 'clean', '정리', 'organize', '이사', 'moving', '입주청소', '대청소'],
-            'tech_service': ['cctv', '와이파이', 'wifi', '컴퓨터', 'computer', '포스기', '설치', 'install'],
-            'senior_support': ['번역', 'translate', '통역', '병원', 'hospital', '관공서', '동행', '어르신'],
-            'life_helper': ['심부름', '배송', 'delivery', '짐나르기', '반려동물', 'pet', '도움']
-        }
-        
-        for category, keywords in category_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return category
-                
-        return 'life_helper'  # 기본값
+        return infer_category_by_keywords(request_text)
     
-    def _calculate_profile_match_score(self, request_text: str, category: str, candidate_profile: Dict[str, Any]) -> float:
-        """요청 내용과 후보자 프로필의 매칭 점수 계산 - 개선된 intro 분석"""
-        intro = candidate_profile.get('intro', '').lower()
-        name = candidate_profile.get('name', '').lower()
-        
-        if not intro:
-            return 0.0
-        
-        # 요청 텍스트에서 핵심 키워드 추출
-        request_keywords = set(request_text.lower().replace(',', ' ').replace('.', ' ').split())
-        
-        # 카테고리별 핵심 키워드 정의 (1차 매칭) - 더욱 확장된 키워드
-        primary_keywords = {
-            'repair': ['수리', '전기', '배관', '수도', '가전', '고장', '수선', '보수', '정비', '교체', '냉장고', '세탁기', 'tv', '에어컨', '보일러', '온수기', '기사', 'repair', 'fix', 'broken', 'plumbing', 'electrical'],
-            'cleaning': ['청소', '정리', '대청소', '입주청소', '이사청소', '비우기', '정돈', '깔끔', 'clean', 'cleaning', 'organize'],
-            'pest_control': ['방역', '바퀴벌레', '쥐', '개미', '모기', '벌', '해충', '소독', '퇴치', '박멸', 'pest', 'cockroach', 'ant', 'control'],
-            'tech_service': ['포스기', '프린터', '와이파이', 'cctv', '앱', '컴퓨터', '기술', '설치', '점검', 'wifi', 'install', 'tech', '전자제품'],
-            'life_helper': ['짐나르기', '반려동물', '산책', '심부름', '물건구매', '배송', '전달', '도움', '서비스', '알바', '대행', '촬영', '사진'],
-            'senior_support': ['번역', '통역', '어르신', '관공서', '동행', '병원', '약국', '안내', '지원', 'translate', '외국인']
-        }
-        
-        # 2차 연관 키워드 정의 (관련 있지만 우선순위 낮음)
-        secondary_keywords = {
-            'repair': ['도구', '전문가', '기사', '숙련', '경험'],
-            'cleaning': ['깔끔', '완벽', '꼼꼼', '청결', '위생'],
-            'pest_control': ['전문', '안전', '효과적', '깨끗'],
-            'tech_service': ['전문가', '신속', '숙련', '해결'],
-            'life_helper': ['친절', '빠른', '안전', '신뢰'],
-            'senior_support': ['정중', '친절', '배려', '세심']
-        }
-        
-        # 요청 텍스트에서 중요한 키워드 추출
-        request_keywords = set(request_text.lower().split())
-        
-        match_score = 0.0
-        
-        # 1차: 직접 요청 키워드 매칭 (최고 가중치)
-        direct_matches = 0
-        for req_word in request_keywords:
-            if len(req_word) > 2 and req_word in intro:  # 3글자 이상만 유효
-                direct_matches += 1
-                match_score += 0.5  # 직접 매칭 시 높은 점수
-        
-        # 2차: 카테고리별 핵심 키워드 매칭 (높은 가중치)
-        primary_matches = 0
-        for keyword in primary_keywords.get(category, []):
-            if keyword in intro:
-                primary_matches += 1
-                # 요청 텍스트와 연관성 체크
-                is_related = any(req_word in keyword or keyword in req_word for req_word in request_keywords if len(req_word) > 2)
-                match_score += 0.4 if is_related else 0.25
-        
-        # 2차 키워드 매칭 (중간 가중치)  
-        secondary_matches = 0
-        for keyword in secondary_keywords.get(category, []):
-            if keyword in intro:
-                secondary_matches += 1
-                match_score += 0.1
-        
-        # 다른 카테고리 키워드 매칭 (낮은 가중치 - 2순위)
-        for other_category, keywords in primary_keywords.items():
-            if other_category != category:
-                for keyword in keywords:
-                    if keyword in intro:
-                        match_score += 0.05  # 관련 분야로 2순위
-        
-        # 매너온도 보정 (높은 매너온도 = 신뢰도 높음)
-        manner_temp = candidate_profile.get('manner_temperature', 50)
-        if manner_temp >= 70:
-            match_score += 0.1
-        elif manner_temp >= 60:
-            match_score += 0.05
-        elif manner_temp <= 40:
-            match_score -= 0.1
-        
-        return min(1.0, match_score)
+    def _predict_success_proba(self, features: np.ndarray) -> np.ndarray:
+        """인코딩된 feature 배열에 대한 연결 성공 확률"""
+        with warnings.catch_warnings():
+            # feature_names_in_이 있는 기존 모델에 배열을 넣을 때의 경고 무시 (컬럼 순서는 인코더가 보장)
+            warnings.simplefilter('ignore', UserWarning)
+            return self.model.predict_proba(features)[:, 1]
     
-    def calculate_ai_score(self, requester_id: int, candidate_profile: Dict[str, Any], introducer_id: int, 
-                        relationship_degree: int, category: str, request_text: str = "",
-                        requester_profile: Dict[str, Any] = None) -> float: # <-- requester_profile 추가
-        """[개선된 버전] ML 모델을 사용하여 AI 점수(성공 확률)를 계산합니다."""
-        
-        if not self.model:
-            raise ValueError("추천 모델이 로드되지 않았습니다. 서비스를 초기화할 수 없습니다.")
-
-        try:
-            # 1. 모델에 입력할 원시 데이터 준비
-            # '30s' 대신 실제 요청자의 나이대(age_band)를 사용합니다.
-            requester_age_band = requester_profile.get('age_band', '30s') if requester_profile else '30s' # <-- 변경된 부분
-            
-            input_data = {
-                'relationship_degree': relationship_degree,
-                'category': category,
-                'requester_age': requester_age_band, # <-- 변경된 부분
-                'candidate_gender': candidate_profile.get('gender', 'male')
-            }
-            
-            # --- (이하 로직은 기존과 동일) ---
-            input_df = pd.DataFrame([input_data])
-            input_encoded = pd.get_dummies(input_df)
-            input_final = input_encoded.reindex(columns=self.model_columns, fill_value=0)
-            
-            ml_score = self.model.predict_proba(input_final)[0, 1]
-            
-            profile_match_score = self._calculate_profile_match_score(request_text, category, candidate_profile)
-            
-            profile_weight = 1.0 + profile_match_score * 0.5
-            final_score = ml_score * profile_weight
-            
-            return round(float(min(1.0, final_score)), 3)
-
-        except Exception as e:
-            logger.error(f"ML 모델 점수 계산 중 오류 발생: {e}")
-            raise RuntimeError(f"ML 모델 점수 계산 실패: {e}")
+    def _ml_scores(self, features: np.ndarray, profile_match_scores: np.ndarray) -> np.ndarray:
+        """인코딩된 feature 배열에 대한 ML 점수 (성공 확률 x 프로필 가중치, 배치 계산)"""
+        return self._combine_ml_scores(self._predict_success_proba(features), profile_match_scores)
+    
+    @staticmethod
+    def _combine_ml_scores(success_proba: np.ndarray, profile_match_scores: np.ndarray) -> np.ndarray:
+        """성공 확률에 프로필 매칭 가중치(1.0 ~ 1.5배)를 적용한 최종 ML 점수"""
+        profile_weight = 1.0 + profile_match_scores * 0.5
+        return np.minimum(1.0, success_proba * profile_weight)
+    
+    def score_candidates(self, candidate_profiles: List[Dict[str, Any]], relationship_degree: int, category: str,
+                         request_text: str = "", requester_profile: Dict[str, Any] = None,
+                         deadline: Optional[Deadline] = None,
+                         rule_based_reason: Optional[str] = None) -> Tuple[List[float], str]:
+        """후보 전체를 한 번에 점수 계산하고 (점수 목록, 사용한 scorer) 반환
+        
+        모델이 없거나 부하/지연 예산을 넘으면 규칙 기반 점수로 자동 전환합니다.
+        rule_based_reason을 주면 모델을 쓰지 않고 바로 규칙 기반으로 계산합니다.
+        """
+        n = len(candidate_profiles)
+        return self._score_pairs(candidate_profiles, [requester_profile] * n, [category] * n, [request_text] * n,
+                                 relationship_degree=relationship_degree, deadline=deadline,
+                                 rule_based_reason=rule_based_reason)
+    
+    def _score_pairs(self, candidate_profiles: List[Dict[str, Any]], requester_profiles: List[Optional[Dict[str, Any]]],
+                     categories: List[str], request_texts: List[str], relationship_degree: int = 2,
+                     deadline: Optional[Deadline] = None,
+                     rule_based_reason: Optional[str] = None) -> Tuple[List[float], str]:
+        """(요청자, 후보) 쌍 전체를 한 번의 벡터 연산으로 점수 계산 (여러 요청자의 후보를 섞어도 됨)"""
+        if not candidate_profiles:
+            return [], SCORER_ML if self.model else SCORER_RULE_BASED
+        
+        features = self._pair_features(candidate_profiles, requester_profiles, categories, relationship_degree)
+        profile_match_scores = self._profile_match_scores(candidate_profiles, categories, request_texts)
+        
+        selector = get_scorer_selector()
+        if rule_based_reason:
+            scorer, reason = SCORER_RULE_BASED, rule_based_reason
+        else:
+            scorer, reason = self._choose_scorer(deadline)
+        if scorer == SCORER_ML:
+            started = time.perf_counter()
+            try:
+                scores = self._ml_scores(features, profile_match_scores)
+                selector.record_ml_latency(time.perf_counter() - started, len(candidate_profiles))
+            except Exception as e:
+                logger.error(f"ML 모델 점수 계산 중 오류 발생, 규칙 기반으로 전환합니다: {e}")
+                scorer, reason = SCORER_RULE_BASED, 'ml_error'
+        if scorer == SCORER_RULE_BASED:
+            scores = self._rule_based_scores(features, profile_match_scores)
+        
+        self._record_scorer(scorer, reason)
+        return [round(float(score), 3) for score in scores], scorer
+    
+    def _choose_scorer(self, deadline: Optional[Deadline]) -> Tuple[str, str]:
+        """모델 상태/부하/남은 시간에 따라 (scorer, 선택 사유) 결정"""
+        scorer, reason = get_scorer_selector().choose(self.model is not None,
+                                                      deadline.remaining_ms() if deadline else None)
+        if reason == 'deadline':
+            deadline.miss('ml_scoring')
+        return scorer, reason
     
-    def _calculate_rule_based_score(self, requester_id: int, candidate_profile: Dict[str, Any], 
-                                  introducer_id: int, relationship_degree: int, category: str, 
-                                  request_text: str = "") -> float:
-        """기존 규칙 기반 AI 점수 계산 (ML 모델의 백업용)"""
+    @staticmethod
+    def _record_scorer(scorer: str, reason: str):
+        metrics.increment(f'scoring.{scorer}')
+        if scorer == SCORER_RULE_BASED:
+            logger.info(f"규칙 기반 점수 계산 사용: reason={reason}")
+            metrics.increment(f'scoring.rule_based.{reason}')
+    
+    def _pair_features(self, candidate_profiles: List[Dict[str, Any]], requester_profiles: List[Optional[Dict[str, Any]]],
+                       categories: List[str], relationship_degree: int) -> np.ndarray:
+        """(요청자, 후보) 쌍을 모델 입력 feature 배열로 인코딩"""
+        return self.feature_encoder.encode_batch([{
+            'relationship_degree': relationship_degree,
+            'category': category,
+            'requester_age': requester_profile.get('age_band', '30s') if requester_profile else '30s',
+            'candidate_gender': profile.get('gender', 'male')
+        } for profile, requester_profile, category in zip(candidate_profiles, requester_profiles, categories)])
+    
+    def _profile_match_scores(self, candidate_profiles: List[Dict[str, Any]], categories: List[str],
+                              request_texts: List[str]) -> np.ndarray:
+        """(요청 텍스트, 후보) 쌍의 프로필 매칭 점수 (키워드 + 설정 시 의미 유사도)"""
+        profile_match_scores = np.array([
+            self.profile_features.match_score(request_text, category, profile)
+            for profile, category, request_text in zip(candidate_profiles, categories, request_texts)
+        ], dtype=np.float64)
+        semantic_matcher = get_semantic_matcher()
+        if semantic_matcher is not None:
+            # 키워드가 놓친 표현 차이를 의미 유사도로 보완 (인덱스에 없는 후보는 키워드 점수 유지)
+            rows_by_text: Dict[str, List[int]] = {}
+            for row, request_text in enumerate(request_texts):
+                rows_by_text.setdefault(request_text, []).append(row)
+            for request_text, rows in rows_by_text.items():
+                profile_match_scores[rows] = semantic_matcher.match_scores(
+                    request_text, [candidate_profiles[row]['id'] for row in rows], profile_match_scores[rows]
+                )
+        return profile_match_scores
+    
+    def _rule_based_scores(self, features: np.ndarray, profile_match_scores: np.ndarray) -> np.ndarray:
+        """인코딩된 feature 배열에 대한 규칙 기반 점수 (배치 계산)"""
         base_score = 0.4  # 기본 점수를 높여서 기본 추천도 가능하게
         
         # 1. 관계 거리 점수 (가까울수록 높음)
-        degree_score = max(0, (4 - relationship_degree) * 0.15)
-        
-        # 2. 프로필 매칭 점수 (가장 중요한 요소)
-        profile_match_score = self._calculate_profile_match_score(request_text, category, candidate_profile)
-        
-        # 3. 카테고리별 기본 가중치 
-        category_weight = {
-            'repair': 0.2,          # 수리
-            'cleaning': 0.15,       # 청소 
-            'pest_control': 0.2,    # 방역
-            'tech_service': 0.2,    # 기술 서비스
-            'life_helper': 0.1,     # 생활 도우미
-            'senior_support': 0.2   # 고령자 지원
-        }.get(category, 0.1)
-        
-        # 4. 최종 점수 계산 (프로필 매칭을 가장 중요시)
-        final_score = base_score + degree_score + (profile_match_score * 0.6) + category_weight
-        
-        # 5. 최종 점수 정규화 (0.0 ~ 1.0)
-        return min(1.0, max(0.0, final_score))
+        degree_column = self.feature_encoder.column('relationship_degree')
+        degree_score = np.maximum(0, (4 - features[:, degree_column]) * 0.15)
+        
+        # 2. 카테고리별 기본 가중치 (어휘에 없는 카테고리는 0.1)
+        category_weight = np.full(len(features), 0.1)
+        for category, column in self.feature_encoder.categorical_columns('category').items():
+            weight = RULE_CATEGORY_WEIGHTS.get(category, 0.1)
+            category_weight = np.where(features[:, column] > 0, weight, category_weight)
+        
+        # 3. 최종 점수 계산 (프로필 매칭을 가장 중요시)
+        final_score = base_score + degree_score + (profile_match_scores * 0.6) + category_weight
+        
+        # 4. 최종 점수 정규화 (0.0 ~ 1.0)
+        return np.clip(final_score, 0.0, 1.0)
     
-    def _fetch_user_profiles_from_core_service(self, user_ids: List[int]) -> List[Dict[str, Any]]:
+    def _fetch_user_profiles_from_core_service(self, user_ids: List[int],
+                                               deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """
         Core 서비스의 /all API를 호출하여 모든 사용자 정보를 가져온 뒤,
         필요한 사용자들의 정보만 필터링하여 반환합니다.
+        같은 요청에서 이미 조회한 사용자만 필요하면 다시 호출하지 않습니다.
         """
+        if all(user_id in self._profile_cache for user_id in user_ids):
+            return [self._profile_cache[user_id] for user_id in user_ids]
+        
+        # 필요한 user_id만 남기며 스트리밍 파싱 (전체 사용자 dict 리스트를 만들지 않음)
+        user_ids_set = set(user_ids)
+        fetched = self._fetch_all_user_profiles_from_core_service(deadline=deadline, user_ids=user_ids_set)
+        if fetched is None:
+            return [self._profile_cache[user_id] for user_id in user_ids if user_id in self._profile_cache]
+        
+        filtered_users = list(fetched.values())
+        self._profile_cache.update((user['id'], user) for user in filtered_users)
+        self._missing_profile_ids.update(user_ids_set - {user['id'] for user in filtered_users})
+        self.profile_features.ingest(filtered_users)
+        
+        return filtered_users
+    
+    def _fetch_all_user_profiles_from_core_service(self, deadline: Optional[Deadline] = None,
+                                                   user_ids: Optional[Set[int]] = None) -> Optional[ProfileTable]:
+        """Core 서비스의 /all API에서 사용자 프로필 표를 가져옵니다. (실패하면 None)
+        
+        응답을 스트리밍으로 파싱하면서 user_ids가 있으면 그 사용자만 보관하고,
+        갱신 주기가 되었으면 전체 사용자로 지역 색인을 갱신합니다.
+        """
+        deadline = deadline or Deadline.unlimited()
+        if deadline.expired:
+            deadline.miss('fetch_profiles')
+            return None
+        
         core_service_url = "http://13.124.106.69:8000/users/all" 
         
         try:
@@ -260,32 +297,46 @@ class AIRecommendationService:
                 'Accept': 'application/json'
             }
             
-            response = requests.get(core_service_url, timeout=10, headers=headers)
-            response.raise_for_status() 
-            api_data = response.json()
-            
-            # API 응답에서 results 키의 사용자 리스트를 가져옵니다.
-            all_users = api_data.get('results', [])
-            
-            # 필요한 user_id만 필터링
-            user_ids_set = set(user_ids)
-            filtered_users = [
-                user for user in all_users 
-                if user.get('id') in user_ids_set
-            ]
-            
-            return filtered_users
+            response = requests.get(core_service_url, headers=headers, stream=True,
+                                    timeout=deadline.timeout(deadline_setting('CORE_TIMEOUT_SECONDS', 10.0)))
+            try:
+                response.raise_for_status()
+                refresh_location_index = self.location_index.refresh_due()
+                profiles = ProfileTable()
+                # API 응답의 results 배열을 한 명씩 읽어 표에 추가
+                users = iter_json_array(response.iter_content(chunk_size=PROFILE_STREAM_CHUNK_SIZE), 'results')
+                for count, user in enumerate(users, 1):
+                    if count % PROFILE_STREAM_DEADLINE_CHECK_EVERY == 0 and deadline.expired:
+                        # 일부만 읽은 표를 쓰면 나머지 사용자를 프로필 없음으로 잘못 기록하므로 버림
+                        logger.warning(f"사용자 프로필 수신 중 마감 시간 초과: {count}명까지 읽음")
+                        deadline.miss('fetch_profiles')
+                        return None
+                    if refresh_location_index:
+                        self.location_index.add(user)
+                    if user_ids is None or user.get('id') in user_ids:
+                        profiles.append(user)
+                return profiles
+            finally:
+                response.close()
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Core 서비스 호출 실패: {e}")
-            return []
+            if deadline.expired:
+                deadline.miss('fetch_profiles')
+            return None
             
         except Exception as e:
             logger.error(f"사용자 프로필 조회 중 오류: {e}")
-            return []
+            return None
     
-    def _fetch_network_graph_from_core_service(self, center_user_id: int, depth: int = 2) -> Dict[str, Any]:
+    def _fetch_network_graph_from_core_service(self, center_user_id: int, depth: int = 2,
+                                               deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Core 서비스에서 네트워크 그래프 데이터를 가져오는 메서드"""
+        deadline = deadline or Deadline.unlimited()
+        if deadline.expired:
+            deadline.miss('fetch_graph')
+            return {}
+        
         core_graph_url = f"http://13.124.106.69:8000/network/graph"
         
         try:
@@ -294,13 +345,16 @@ class AIRecommendationService:
                 'center': center_user_id
             }
             
-            response = requests.get(core_graph_url, params=params, timeout=10)
+            response = requests.get(core_graph_url, params=params,
+                                    timeout=deadline.timeout(deadline_setting('CORE_TIMEOUT_SECONDS', 10.0)))
             response.raise_for_status()
             graph_data = response.json()
             return graph_data
             
         except requests.exceptions.RequestException as e:
             logger.error(f"네트워크 그래프 조회 실패: {e}")
+            if deadline.expired:
+                deadline.miss('fetch_graph')
             return {}
             
         except Exception as e:
@@ -309,21 +363,130 @@ class AIRecommendationService:
 
     def find_potential_connections(self, requester_id: int, category: str, request_text: str = "",
                                 location: str = None, max_recommendations: int = 5,
-                                requester_profile: Dict[str, Any] = None) -> List[Dict[str, Any]]: # <-- requester_profile 추가
+                                requester_profile: Dict[str, Any] = None,
+                                deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]: # <-- requester_profile 추가
         """잠재적 연결 대상(2촌)을 찾고, 필터링 및 점수 계산 후 최종 추천 목록 반환"""
+        candidates, _ = self._generate_candidates(requester_id, deadline=deadline)
+        candidates = self._filter_candidates_by_location(candidates, location)
+        if not candidates: return []
+        # 소개자 프로필도 응답에 필요하므로 후보와 함께 한 번에 조회
+        self._fetch_user_profiles_from_core_service(list(candidates) + list(set(candidates.values())),
+                                                    deadline=deadline)
+        return self._rank_candidates(candidates, category, request_text, location, max_recommendations,
+                                     requester_profile, deadline)
+    
+    def _generate_candidates(self, requester_id: int,
+                             deadline: Optional[Deadline] = None) -> Tuple[Dict[int, int], set]:
+        """그래프를 조회해 (2촌 후보 -> 소개자) 매핑과 1촌 목록 생성
         
-        # --- (그래프 조회 및 후보 찾는 로직은 기존과 동일) ---
-        graph_data = self._fetch_network_graph_from_core_service(requester_id, depth=2)
+        후보가 없다고 최근에 확인된 요청자는 그래프를 다시 조회하지 않습니다.
+        (Core 서비스 호출 실패는 빈 결과로 기록하지 않음)
+        """
+        if self.negative_cache is not None and self.negative_cache.is_isolated(requester_id):
+            return {}, set()
+        graph_data = self._fetch_network_graph_from_core_service(requester_id, depth=2, deadline=deadline)
         if not graph_data or 'edges' not in graph_data:
-            return []
-        edges = graph_data['edges']
+            return {}, set()
+        candidates, first_degree_friends = self._find_second_degree_candidates(requester_id, graph_data['edges'])
+        if not candidates and self.negative_cache is not None:
+            self.negative_cache.mark_isolated(requester_id)
+        return candidates, first_degree_friends
+    
+    def _filter_candidates_by_location(self, candidates: Dict[int, int], location: Optional[str]) -> Dict[int, int]:
+        """지역 조건이 있으면 지역 색인으로 다른 지역 후보를 프로필 조회 전에 제외"""
+        if not location or not candidates:
+            return candidates
+        filtered = self.location_index.filter_candidates(candidates, location)
+        metrics.increment('location_index.pruned', len(candidates) - len(filtered))
+        return filtered
+    
+    def _rank_candidates(self, candidates: Dict[int, int], category: str, request_text: str, location: Optional[str],
+                         max_recommendations: int, requester_profile: Optional[Dict[str, Any]],
+                         deadline: Optional[Deadline]) -> List[Dict[str, Any]]:
+        """이미 조회한 후보 프로필로 점수를 계산하고 최종 추천 목록 반환"""
+        candidate_profiles = [self._profile_cache[c] for c in candidates if c in self._profile_cache]
+        if location:
+            # 색인되지 않았던 후보는 받아온 프로필로 다시 확인
+            candidate_profiles = [p for p in candidate_profiles if matches_location(p, location)]
+        
+        # 후보가 아주 많으면 프로세스 풀로 나눠 계산 (실패하면 아래 인라인 계산)
+        executor = get_sharded_executor(self, len(candidate_profiles))
+        rule_based_reason = None
+        if executor is not None:
+            try:
+                recommendations = self._rank_candidates_sharded(executor, candidates, candidate_profiles, category,
+                                                                request_text, max_recommendations, requester_profile,
+                                                                deadline)
+            except multiprocessing.TimeoutError:
+                # 마감 안에 샤드가 끝나지 않으면 더 기다리지 않고 인라인 규칙 기반 점수로 응답
+                logger.warning(f"샤딩 점수 계산이 마감 시간을 넘어 규칙 기반으로 전환합니다: {len(candidate_profiles)}명")
+                deadline.miss('sharded_scoring')
+                metrics.increment('scoring.sharded_timeouts')
+                discard_sharded_executor(executor)
+                rule_based_reason = 'deadline'
+            else:
+                if recommendations is not None:
+                    return recommendations
+
+        # 5. 최종 추천 목록 생성 및 점수 계산 (후보 전체를 한 번에 계산)
+        scores, scorer = self.score_candidates(
+            candidate_profiles,
+            relationship_degree=2,
+            category=category,
+            request_text=request_text,
+            requester_profile=requester_profile,
+            deadline=deadline,
+            rule_based_reason=rule_based_reason
+        )
+        recommendations = [{
+            'recommended_user_id': profile['id'],
+            'introducer_user_id': candidates[profile['id']],
+            'relationship_degree': 2,
+            'ai_score': ai_score,
+            'scorer': scorer
+        } for profile, ai_score in zip(candidate_profiles, scores)]
+        return self._select_recommendations(recommendations, max_recommendations)
+    
+    def _rank_candidates_sharded(self, executor, candidates: Dict[int, int], candidate_profiles: List[Dict[str, Any]],
+                                 category: str, request_text: str, max_recommendations: int,
+                                 requester_profile: Optional[Dict[str, Any]],
+                                 deadline: Optional[Deadline]) -> Optional[List[Dict[str, Any]]]:
+        """샤드별 상위 후보만 받아 병합한 최종 추천 목록 (실패하면 None, 마감까지 끝나지 않으면 multiprocessing.TimeoutError)"""
+        scorer, reason = self._choose_scorer(deadline)
+        timeout = deadline.remaining() if deadline and math.isfinite(deadline.remaining()) else None
+        started = time.perf_counter()
+        try:
+            top, _ = executor.top_k(candidate_profiles, requester_profile, category, request_text,
+                                    relationship_degree=2, scorer=scorer, k=max_recommendations, timeout=timeout)
+        except multiprocessing.TimeoutError:
+            raise
+        except Exception as e:
+            logger.error(f"샤딩 점수 계산 실패, 인라인 계산으로 전환합니다: {e}")
+            metrics.increment('scoring.sharded_errors')
+            return None
+        if scorer == SCORER_ML:
+            get_scorer_selector().record_ml_latency(time.perf_counter() - started, len(candidate_profiles))
+        self._record_scorer(scorer, reason)
+        metrics.increment('scoring.sharded')
+        
+        recommendations = [{
+            'recommended_user_id': candidate_profiles[index]['id'],
+            'introducer_user_id': candidates[candidate_profiles[index]['id']],
+            'relationship_degree': 2,
+            'ai_score': ai_score,
+            'scorer': scorer
+        } for index, ai_score in top]
+        return self._select_recommendations(recommendations, max_recommendations)
+    
+    def _find_second_degree_candidates(self, requester_id: int,
+                                       edges: List[Dict[str, Any]]) -> Tuple[Dict[int, int], set]:
+        """그래프 간선에서 (2촌 후보 -> 소개자) 매핑과 1촌 목록 계산"""
         first_degree_friends = set()
         for edge in edges:
             source, target = edge['source'], edge['target']
             if source == requester_id: first_degree_friends.add(target)
             elif target == requester_id: first_degree_friends.add(source)
-        if not first_degree_friends: return []
-
+        
         candidates = {}
         connected_users = {requester_id} | first_degree_friends
         for introducer_id in first_degree_friends:
@@ -333,34 +496,11 @@ class AIRecommendationService:
                 if source == introducer_id and target not in connected_users: candidate_id = target
                 elif target == introducer_id and source not in connected_users: candidate_id = source
                 if candidate_id and candidate_id not in candidates: candidates[candidate_id] = introducer_id
-        all_candidate_ids = list(candidates.keys())
-        if not all_candidate_ids: return []
-        candidate_profiles = self._fetch_user_profiles_from_core_service(all_candidate_ids)
-        if location:
-            candidate_profiles = [p for p in candidate_profiles if p.get('city_name') and location in p.get('city_name')]
-
-        # 5. 최종 추천 목록 생성 및 점수 계산
-        recommendations = []
-        for profile in candidate_profiles:
-            candidate_id = profile['id']
-            introducer_id = candidates[candidate_id]
-
-            ai_score = self.calculate_ai_score(
-                requester_id=requester_id, 
-                candidate_profile=profile, 
-                introducer_id=introducer_id,
-                relationship_degree=2,
-                category=category,
-                request_text=request_text,
-                requester_profile=requester_profile  # <-- 변경된 부분: requester_profile 전달
-            )
-            recommendations.append({
-                'recommended_user_id': candidate_id,
-                'introducer_user_id': introducer_id,
-                'relationship_degree': 2,
-                'ai_score': ai_score
-            })
-            
+        return candidates, first_degree_friends
+    
+    def _select_recommendations(self, recommendations: List[Dict[str, Any]],
+                                max_recommendations: int) -> List[Dict[str, Any]]:
+        """점수순 정렬 후 최고 점수 대비 임계값 이상만 max_recommendations개 반환"""
         # --- (정렬 및 필터링 로직은 기존과 동일) ---
         recommendations.sort(key=lambda x: x['ai_score'], reverse=True)
         if not recommendations: return []
@@ -371,19 +511,58 @@ class AIRecommendationService:
 
     
     def create_recommendation_request(self, user_id: int, request_text: str, 
-                                   max_recommendations: int = 5) -> Dict[str, Any]:
-        """추천 요청 생성 및 처리"""
+                                   max_recommendations: int = 5,
+                                   location: Optional[str] = None,
+                                   deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """추천 요청 생성 및 처리 (deadline이 지나면 생략 가능한 단계를 건너뛰고 부분 결과 반환)
         
-        # 카테고리 추론
-        category = self.infer_category(request_text)
-        
-        # 1. 요청자 프로필 가져오기 (추가된 부분)
-        requester_profiles = self._fetch_user_profiles_from_core_service([user_id])
-        if not requester_profiles:
-            logger.error(f"요청자 프로필을 찾을 수 없습니다: user_id={user_id}")
-            return {'request_id': None, 'recommendations': [], 'inferred_category': category}
+        location이 있으면 시/도 또는 시/군/구 이름에 location이 포함된 후보만 추천합니다.
+        """
+        deadline = deadline or Deadline.unlimited()
+        with get_scorer_selector().track_request():
+            return self._create_recommendation_request(user_id, request_text, max_recommendations, location,
+                                                       deadline)
     
-        requester_profile = requester_profiles[0]
+    def _create_recommendation_request(self, user_id: int, request_text: str, max_recommendations: int,
+                                       location: Optional[str], deadline: Deadline) -> Dict[str, Any]:
+        # 비용이 적은 확인(빈 결과 캐시 -> 그래프 -> 프로필)을 Gemini 호출과 DB 저장보다 먼저 수행
+        # 1. 최근에 후보가 없거나 프로필이 없다고 확인된 요청자는 바로 빈 응답
+        if self.negative_cache is not None and self.negative_cache.is_missing_profile(user_id):
+            return self._empty_result(request_text, deadline)
+        
+        # 2. 미리 계산해 둔 후보 목록이 있으면 그래프/프로필 조회와 ML 예측 없이 사용
+        #    (목록은 지역 조건 없이 상위 MAX_RECOMMENDATIONS개까지만 보장하므로 그 범위의 요청만)
+        category = None
+        if (precompute_setting('ENABLED', True) and not location
+                and max_recommendations <= precompute_setting('MAX_RECOMMENDATIONS', 10)):
+            snapshots = load_fresh_snapshots(user_id, precompute_setting('MAX_AGE_SECONDS', 36 * 3600))
+            if snapshots:
+                category = self.infer_category(request_text, deadline=deadline)
+                if category in snapshots:
+                    metrics.increment('precompute.hit')
+                    return self._recommend_from_snapshot(user_id, request_text, category, snapshots[category],
+                                                         max_recommendations, deadline)
+            metrics.increment('precompute.miss')
+        
+        # 3. 그래프에서 2촌 후보 생성 (지역 조건이 있으면 다른 지역 후보는 여기서 제외)
+        candidates, _ = self._generate_candidates(user_id, deadline=deadline)
+        candidates = self._filter_candidates_by_location(candidates, location)
+        if not candidates:
+            return self._empty_result(request_text, deadline, category)
+        
+        # 4. 요청자/후보/소개자 프로필을 한 번에 가져오기
+        self._fetch_user_profiles_from_core_service([user_id] + list(candidates) + list(set(candidates.values())),
+                                                    deadline=deadline)
+        requester_profile = self._profile_cache.get(user_id)
+        if requester_profile is None:
+            logger.error(f"요청자 프로필을 찾을 수 없습니다: user_id={user_id}")
+            if user_id in self._missing_profile_ids and self.negative_cache is not None:
+                self.negative_cache.mark_missing_profile(user_id)
+            return self._empty_result(request_text, deadline, category)
+        
+        # 5. 카테고리 추론
+        if category is None:
+            category = self.infer_category(request_text, deadline=deadline)
         
         # 연결 요청 생성
         connection_request = ConnectionRequest.objects.create(
@@ -393,29 +572,96 @@ class AIRecommendationService:
             status='pending'
         )
         
-        # 추천 생성 (request_text와 location 파라미터 추가)
-        potential_connections = self.find_potential_connections(
-            requester_id=user_id, 
-            category=category, 
-            request_text=request_text, 
-            location=None, 
+        # 추천 생성 (후보 프로필은 3단계에서 이미 조회)
+        potential_connections = self._rank_candidates(
+            candidates,
+            category=category,
+            request_text=request_text,
+            location=location,
             max_recommendations=max_recommendations,
-            requester_profile=requester_profile
+            requester_profile=requester_profile,
+            deadline=deadline
         )
         
-        recommendation_logs = []
-        enhanced_recommendations = []
-        
         # 모든 관련 사용자 ID 수집 (추천자 + 소개자)
         all_user_ids = set()
         for conn in potential_connections:
             all_user_ids.add(conn['recommended_user_id'])
             all_user_ids.add(conn['introducer_user_id'])
         
-        # Core 서비스에서 사용자 프로필 가져오기
-        user_profiles = self._fetch_user_profiles_from_core_service(list(all_user_ids))
+        # Core 서비스에서 사용자 프로필 가져오기 (대부분 후보 조회 시 이미 받아둔 프로필)
+        user_profiles = self._fetch_user_profiles_from_core_service(list(all_user_ids), deadline=deadline)
         user_profile_dict = {profile['id']: profile for profile in user_profiles}
         
+        # 마감으로 프로필을 받지 못한 추천은 응답에서 제외 (부분 결과)
+        potential_connections = [
+            conn for conn in potential_connections
+            if conn['recommended_user_id'] in user_profile_dict and conn['introducer_user_id'] in user_profile_dict
+        ]
+        enhanced_recommendations = self._save_recommendations(connection_request, potential_connections,
+                                                              user_profile_dict)
+        
+        return {
+            'request_id': connection_request.id,
+            'recommendations': enhanced_recommendations,  # 향상된 데이터 사용
+            'inferred_category': category,
+            # 어떤 scorer가 점수를 계산했는지 기록 (후보가 없으면 None)
+            'scorer': potential_connections[0]['scorer'] if potential_connections else None,
+            # 마감 때문에 일부 단계를 생략했는지 여부
+            'partial': deadline.partial
+        }
+    
+    def _recommend_from_snapshot(self, user_id: int, request_text: str, category: str, snapshot,
+                                 max_recommendations: int, deadline: Deadline) -> Dict[str, Any]:
+        """미리 계산한 후보 목록에 요청 텍스트 매칭과 임계값만 적용해 추천 생성"""
+        entries = snapshot.candidates
+        if not entries:
+            return self._empty_result(request_text, deadline, category)
+        
+        candidate_profiles = [entry['recommended_user'] for entry in entries]
+        self.profile_features.ingest(candidate_profiles)
+        n = len(candidate_profiles)
+        profile_match_scores = self._profile_match_scores(candidate_profiles, [category] * n, [request_text] * n)
+        scores = self._combine_ml_scores(np.array([entry['ml_score'] for entry in entries]), profile_match_scores)
+        metrics.increment(f'scoring.{SCORER_ML}')
+        
+        potential_connections = self._select_recommendations([{
+            'recommended_user_id': entry['recommended_user']['id'],
+            'introducer_user_id': entry['introducer_user']['id'],
+            'relationship_degree': 2,
+            'ai_score': round(float(score), 3),
+            'scorer': SCORER_ML
+        } for entry, score in zip(entries, scores)], max_recommendations)
+        user_profile_dict = {}
+        for entry in entries:
+            user_profile_dict[entry['recommended_user']['id']] = entry['recommended_user']
+            user_profile_dict[entry['introducer_user']['id']] = entry['introducer_user']
+        
+        connection_request = ConnectionRequest.objects.create(
+            requester_user_id=user_id,
+            request_text=request_text,
+            inferred_category=category,
+            status='pending'
+        )
+        return {
+            'request_id': connection_request.id,
+            'recommendations': self._save_recommendations(connection_request, potential_connections,
+                                                          user_profile_dict),
+            'inferred_category': category,
+            'scorer': SCORER_ML if potential_connections else None,
+            'partial': deadline.partial
+        }
+    
+    def _empty_result(self, request_text: str, deadline: Deadline, category: Optional[str] = None) -> Dict[str, Any]:
+        """추천 후보가 없는 요청의 응답 (Gemini 호출과 연결 요청 저장 없이, 카테고리를 모르면 로컬 추론)"""
+        return {'request_id': None, 'recommendations': [],
+                'inferred_category': category or self._infer_category_locally(request_text),
+                'scorer': None, 'partial': deadline.partial}
+    
+    def _save_recommendations(self, connection_request: ConnectionRequest, potential_connections: List[Dict[str, Any]],
+                              user_profile_dict: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """추천 로그를 저장하고 프론트엔드용 추천 데이터 목록 반환"""
+        enhanced_recommendations = []
         for conn in potential_connections:
             # 데이터베이스에 로그 저장
             log = RecommendationLog.objects.create(
@@ -425,7 +671,6 @@ class AIRecommendationService:
                 relationship_degree=conn['relationship_degree'],
                 ai_score=conn['ai_score']
             )
-            recommendation_logs.append(log)
             
             # 프론트엔드용 향상된 추천 데이터 생성
             enhanced_rec = {
@@ -436,9 +681,86 @@ class AIRecommendationService:
                 'ai_score': conn['ai_score']
             }
             enhanced_recommendations.append(enhanced_rec)
+        return enhanced_recommendations
+    
+    def create_bulk_recommendations(self, items: List[Dict[str, Any]], max_recommendations: int = 5,
+                                    deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """여러 요청자의 추천을 한 번에 생성하여 요청 순서대로 하나씩 반환
         
-        return {
-            'request_id': connection_request.id,
-            'recommendations': enhanced_recommendations,  # 향상된 데이터 사용
-            'inferred_category': category
-        }
\ No newline at end of file
+        /users/all 조회와 카테고리 추론은 한 번만, 그래프는 요청자별로 한 번만 가져오고
+        모든 (요청자, 후보) 쌍을 한 번의 벡터 연산으로 점수 계산합니다.
+        """
+        deadline = deadline or Deadline.unlimited()
+        with get_scorer_selector().track_request():
+            yield from self._create_bulk_recommendations(items, max_recommendations, deadline)
+    
+    def _create_bulk_recommendations(self, items: List[Dict[str, Any]], max_recommendations: int,
+                                     deadline: Deadline) -> Iterator[Dict[str, Any]]:
+        # 1. 전체 사용자 프로필은 한 번만 조회해 모든 요청자가 공유
+        # (전체 사용자는 dict 대신 컬럼형 표로 보관하고 필요한 프로필만 dict로 꺼냄)
+        profiles = self._fetch_all_user_profiles_from_core_service(deadline=deadline) or ProfileTable()
+        
+        # 2. 카테고리 배치 추론
+        categories = self.infer_categories([item['request_text'] for item in items], deadline=deadline)
+        
+        # 3. 요청자별 후보 생성 (같은 요청자의 그래프는 재사용)
+        requester_candidates: Dict[int, Dict[int, int]] = {}
+        plans = []
+        pair_profiles, pair_requesters, pair_categories, pair_texts = [], [], [], []
+        for item, category in zip(items, categories):
+            user_id = item['user_id']
+            requester_profile = profiles.get(user_id)
+            if requester_profile is None:
+                plans.append(None)
+                continue
+            if user_id not in requester_candidates:
+                requester_candidates[user_id], _ = self._generate_candidates(user_id, deadline=deadline)
+            candidates = requester_candidates[user_id]
+            candidate_profiles = [profiles[c] for c in candidates if c in profiles]
+            plans.append((candidates, len(pair_profiles), candidate_profiles))
+            pair_profiles.extend(candidate_profiles)
+            pair_requesters.extend([requester_profile] * len(candidate_profiles))
+            pair_categories.extend([category] * len(candidate_profiles))
+            pair_texts.extend([item['request_text']] * len(candidate_profiles))
+        
+        # 4. 모든 (요청자, 후보) 쌍을 한 번에 점수 계산
+        scores, scorer = self._score_pairs(pair_profiles, pair_requesters, pair_categories, pair_texts,
+                                           relationship_degree=2, deadline=deadline)
+        
+        # 5. 요청자별로 선별/저장 후 순서대로 반환
+        for item, category, plan in zip(items, categories, plans):
+            user_id = item['user_id']
+            if plan is None:
+                logger.error(f"요청자 프로필을 찾을 수 없습니다: user_id={user_id}")
+                yield {'user_id': user_id, 'request_id': None, 'recommendations': [], 'inferred_category': category,
+                       'scorer': None, 'partial': deadline.partial}
+                continue
+            
+            candidates, start, candidate_profiles = plan
+            recommendations = self._select_recommendations([{
+                'recommended_user_id': profile['id'],
+                'introducer_user_id': candidates[profile['id']],
+                'relationship_degree': 2,
+                'ai_score': ai_score,
+                'scorer': scorer
+            } for profile, ai_score in zip(candidate_profiles, scores[start:start + len(candidate_profiles)])],
+                max_recommendations)
+            recommendations = [
+                conn for conn in recommendations
+                if conn['recommended_user_id'] in profiles and conn['introducer_user_id'] in profiles
+            ]
+            
+            connection_request = ConnectionRequest.objects.create(
+                requester_user_id=user_id,
+                request_text=item['request_text'],
+                inferred_category=category,
+                status='pending'
+            )
+            yield {
+                'user_id': user_id,
+                'request_id': connection_request.id,
+                'recommendations': self._save_recommendations(connection_request, recommendations, profiles),
+                'inferred_category': category,
+                'scorer': scorer if recommendations else None,
+                'partial': deadline.partial
+            }
@@ -0,0 +1,135 @@
+import atexit
+import copy
+import heapq
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .degradation import SCORER_ML
+
+logger = logging.getLogger(__name__)
+
+# 점수 계산에 필요한 프로필 키 (샤드로 보낼 때 나머지 필드는 제외)
+SHARD_PROFILE_KEYS = ('id', 'gender', 'intro', 'manner_temperature')
+
+# 프로세스 풀을 만들 때 설정하는 서비스 (모델, 인코더, 키워드 테이블, 의미 매칭 인덱스)
+# 자식 프로세스는 fork로 물려받으므로 작업마다 pickle하지 않습니다.
+_shared_service = None
+
+
+def sharded_scoring_setting(name: str, default: Any) -> Any:
+    """AI_SHARDED_SCORING 설정값 조회"""
+    return getattr(settings, 'AI_SHARDED_SCORING', {}).get(name, default)
+
+
+def _score_shard(task: tuple) -> Tuple[List[Tuple[int, float]], float]:
+    """(자식 프로세스) 샤드 하나의 점수를 계산하고 상위 top_k개의 (전체 인덱스, 점수) 반환"""
+    start, profiles, requester_profile, category, request_text, relationship_degree, scorer, top_k = task
+    service = _shared_service
+    n = len(profiles)
+    features = service._pair_features(profiles, [requester_profile] * n, [category] * n, relationship_degree)
+    profile_match_scores = service._profile_match_scores(profiles, [category] * n, [request_text] * n)
+
+    started = time.perf_counter()
+    if scorer == SCORER_ML:
+        scores = service._ml_scores(features, profile_match_scores)
+    else:
+        scores = service._rule_based_scores(features, profile_match_scores)
+    elapsed = time.perf_counter() - started
+
+    # 인라인 경로와 같은 반올림/정렬 기준 (점수 내림차순, 같은 점수는 원래 순서)
+    rounded = [round(float(score), 3) for score in scores]
+    top = heapq.nsmallest(top_k, range(n), key=lambda i: (-rounded[i], i))
+    return [(start + i, rounded[i]) for i in top], elapsed
+
+
+class ShardedScoringExecutor:
+    """후보가 아주 많은 요청의 점수 계산을 프로세스 풀로 나눠 실행하고 샤드별 상위 K개를 병합
+
+    전체 상위 K개는 각 샤드 상위 K개의 합집합 안에 있으므로 병합 결과는 인라인 계산과 같습니다.
+    """
+
+    def __init__(self, service, processes: int = 4, min_shard_size: int = 1000):
+        global _shared_service
+        self.processes = processes
+        self.min_shard_size = min_shard_size
+        # 요청 단위 프로필 캐시는 공유할 필요가 없으므로 비운 얕은 복사본을 보관
+        _shared_service = copy.copy(service)
+        _shared_service._profile_cache = {}
+        self._pool = multiprocessing.get_context('fork').Pool(processes)
+
+    @classmethod
+    def from_settings(cls, service) -> 'ShardedScoringExecutor':
+        return cls(
+            service,
+            processes=sharded_scoring_setting('PROCESSES', min(os.cpu_count() or 1, 8)),
+            min_shard_size=sharded_scoring_setting('MIN_SHARD_SIZE', 1000),
+        )
+
+    def top_k(self, candidate_profiles: List[Dict[str, Any]], requester_profile: Optional[Dict[str, Any]],
+              category: str, request_text: str, relationship_degree: int, scorer: str,
+              k: int, timeout: Optional[float] = None) -> Tuple[List[Tuple[int, float]], float]:
+        """(candidate_profiles 인덱스, 점수) 상위 k개와 가장 오래 걸린 샤드의 점수 계산 시간 반환
+
+        timeout 안에 모든 샤드가 끝나지 않으면 multiprocessing.TimeoutError
+        """
+        n = len(candidate_profiles)
+        shard_count = max(1, min(self.processes, n // self.min_shard_size))
+        shard_size = math.ceil(n / shard_count)
+        profiles = [{key: profile[key] for key in SHARD_PROFILE_KEYS if key in profile} for profile in candidate_profiles]
+        requester = {'age_band': requester_profile['age_band']} \
+            if requester_profile and 'age_band' in requester_profile else None
+        tasks = [
+            (start, profiles[start:start + shard_size], requester, category, request_text, relationship_degree,
+             scorer, k)
+            for start in range(0, n, shard_size)
+        ]
+        results = self._pool.map_async(_score_shard, tasks).get(timeout=timeout)
+        merged = heapq.nsmallest(k, (item for shard_top, _ in results for item in shard_top),
+                                 key=lambda item: (-item[1], item[0]))
+        return merged, max(elapsed for _, elapsed in results)
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+
+_executor: Optional[ShardedScoringExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_sharded_executor(service, n_candidates: int) -> Optional[ShardedScoringExecutor]:
+    """후보 수가 기준 이상이면 워커 전역 샤딩 실행기 반환 (처음 사용할 때 프로세스 풀 생성)
+
+    설정에서 꺼져 있거나 후보 수가 MIN_CANDIDATES 미만이면 None (인라인 계산)
+    """
+    global _executor
+    if not sharded_scoring_setting('ENABLED', False):
+        return None
+    if n_candidates < sharded_scoring_setting('MIN_CANDIDATES', 5000):
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ShardedScoringExecutor.from_settings(service)
+                atexit.register(_executor.close)
+    return _executor
+
+
+def discard_sharded_executor(executor: ShardedScoringExecutor):
+    """시간 초과된 샤드가 남은 프로세스 풀 종료 (다음 요청은 새 풀 사용)
+
+    끝나지 않은 작업이 풀에 남아 있으면 이후 요청이 그 뒤에서 기다리다 모두 시간 초과되므로 풀째 버립니다.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    atexit.unregister(executor.close)
+    executor.close()
@@ -1,3 +1,451 @@
-from django.test import TestCase
+import json
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .fake_llm import FakeGenerativeModel
+from .idempotency import SOURCE_COALESCED, SOURCE_COMPUTED, SOURCE_MISMATCH, SOURCE_REPLAYED, RequestCoalescer
+from .llm_gateway import LLMGateway, build_batch_prompt
+from .models import CandidateSnapshot
+from .admission import AdmissionController, LocalTokenBucketStore, RedisTokenBucketStore
+from .deadline import Deadline
+from .precompute import CandidatePrecomputer
+from .profile_table import ProfileTable, iter_json_array
+from . import sharded_scoring
+
+
+class FakeGenerativeModelTests(SimpleTestCase):
+    """가짜 Gemini 모델 응답 형식"""
+
+    def test_classifies_numbered_lines(self):
+        model = FakeGenerativeModel(system_instruction='분류')
+        response = model.generate_content(build_batch_prompt(['바퀴벌레 잡아주세요', '컴퓨터\n설치', '아무거나']))
+        self.assertEqual(json.loads(response.text), [
+            {'index': 0, 'category': 'pest_control'},
+            {'index': 1, 'category': 'tech_service'},
+            {'index': 2, 'category': 'life_helper'},
+        ])
+        self.assertEqual(model.calls, 1)
+        self.assertGreater(response.usage_metadata.prompt_token_count, 0)
+
+    def test_times_out_when_slower_than_timeout(self):
+        model = FakeGenerativeModel(latency=0.05)
+        with self.assertRaises(TimeoutError):
+            model.generate_content(build_batch_prompt(['청소']), request_options={'timeout': 0.01})
+
+
+class LLMGatewayParseTests(SimpleTestCase):
+    """LLM JSON 응답에서 유효한 항목만 추출"""
+
+    def test_keeps_valid_items_only(self):
+        text = json.dumps([
+            {'index': 0, 'category': ' Repair '},
+            {'index': 1, 'category': 'unknown'},
+            {'index': 5, 'category': 'cleaning'},
+            {'index': '2', 'category': 'cleaning'},
+            {'index': 2},
+            {'index': 3, 'category': 'senior_support'},
+        ])
+        self.assertEqual(LLMGateway._parse(text, 4), {0: 'repair', 3: 'senior_support'})
+
+    def test_invalid_json_raises(self):
+        with self.assertRaises(ValueError):
+            LLMGateway._parse('repair', 1)
+
+
+class LLMGatewayBatchingTests(SimpleTestCase):
+    """같은 시간 창의 요청 묶음 호출"""
+
+    def test_single_request_does_not_wait_without_window(self):
+        model = FakeGenerativeModel()
+        gateway = LLMGateway(lambda: model)
+        self.assertEqual(gateway.classify('전기 수리 부탁', timeout=1), 'repair')
+        self.assertEqual(model.calls, 1)
+
+    def test_concurrent_requests_share_one_call(self):
+        model = FakeGenerativeModel()
+        gateway = LLMGateway(lambda: model, batch_window=5.0, max_batch_size=4)
+        texts = ['바퀴벌레', '컴퓨터 고장', '입주청소', '병원 동행']
+        results = [None] * len(texts)
+
+        def classify(index):
+            results[index] = gateway.classify(texts[index], timeout=5)
+
+        threads = [threading.Thread(target=classify, args=(index,)) for index in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 묶음이 max_batch_size에 도달하면 시간 창을 기다리지 않고 바로 호출
+        self.assertEqual(results, ['pest_control', 'repair', 'cleaning', 'senior_support'])
+        self.assertEqual(model.calls, 1)
+
+    def test_classify_many_splits_by_max_batch_size(self):
+        model = FakeGenerativeModel()
+        gateway = LLMGateway(lambda: model, max_batch_size=2)
+        self.assertEqual(gateway.classify_many(['청소', '방역', '통역']), ['cleaning', 'pest_control', 'senior_support'])
+        self.assertEqual(model.calls, 2)
+
+    def test_failed_call_returns_none(self):
+        model = FakeGenerativeModel(latency=0.05)
+        gateway = LLMGateway(lambda: model)
+        self.assertIsNone(gateway.classify('청소', timeout=0.01))
+
+
+def _split_chunks(body: bytes, sizes):
+    """body를 sizes 크기 순서대로 (반복하며) 잘라낸 조각 목록"""
+    chunks, start, index = [], 0, 0
+    while start < len(body):
+        size = sizes[index % len(sizes)]
+        chunks.append(body[start:start + size])
+        start += size
+        index += 1
+    return chunks
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    """조각 경계와 상관없이 json.loads와 같은 결과"""
+
+    NUMBERS = [0, -0, 7, -12, 12.5, -3.25, 1e5, 1.5e+3, -2.5E-2, 6.02e23, 123456789, 0.001]
+
+    def make_body(self, rng: random.Random) -> bytes:
+        results = []
+        for user_id in range(1, 40):
+            results.append(rng.choice([
+                rng.choice(self.NUMBERS),
+                {'id': user_id, 'intro': rng.choice(['전기 수리', 'a"b\\c', '', '\u00e9\n탭\t']),
+                 'manner_temperature': rng.choice(self.NUMBERS), 'tags': [True, False, None]},
+                [rng.choice(self.NUMBERS), 'x'],
+            ]))
+        document = {'count': rng.choice(self.NUMBERS), 'next': None, 'results': results, 'total': 1.25e2}
+        return json.dumps(document, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 1])).encode('utf-8')
+
+    def test_every_two_chunk_split(self):
+        body = b'{"count": 12.5e3, "results": [12.5, 1e5, -3.25E-2, 0, {"a": 1.5e+3, "s": "\xea\xb0\x80"}, 7], "n": 1}'
+        expected = json.loads(body)['results']
+        for cut in range(len(body) + 1):
+            self.assertEqual(list(iter_json_array([body[:cut], body[cut:]])), expected, cut)
+
+    def test_random_chunk_sizes(self):
+        rng = random.Random(42)
+        for _ in range(30):
+            body = self.make_body(rng)
+            expected = json.loads(body)['results']
+            for _ in range(10):
+                sizes = [rng.randint(1, 16) for _ in range(rng.randint(1, 5))]
+                self.assertEqual(list(iter_json_array(_split_chunks(body, sizes))), expected, sizes)
+
+    def test_missing_key_and_empty_array(self):
+        self.assertEqual(list(iter_json_array([b'{"count": 0, "res', b'ults": []}'])), [])
+        self.assertEqual(list(iter_json_array([b'{"count": 1.5}'])), [])
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"results": [1, 2.']))
+
+
+class ProfileTableTests(SimpleTestCase):
+    """컬럼형 프로필 표"""
+
+    def test_round_trip_and_overwrite(self):
+        table = ProfileTable.from_profiles([
+            {'id': 1, 'name': 'a', 'intro': '청소', 'extra': 1},
+            {'id': 2, 'name': 'b'},
+            {'name': 'no id'},
+            {'id': 1, 'name': 'c'},
+        ])
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[1], {'id': 1, 'name': 'c'})
+        self.assertEqual(table[2], {'id': 2, 'name': 'b'})
+        self.assertNotIn(3, table)
+
+
+@override_settings(AI_LLM={'BACKEND': 'fake'})
+class CandidatePrecomputerTests(TestCase):
+    """활성 사용자 후보 목록 사전 계산"""
+
+    def setUp(self):
+        from .services import AIRecommendationService
+
+        caches['default'].clear()
+        self.service = AIRecommendationService()
+        if self.service.model is None:
+            self.skipTest("추천 모델 파일이 없습니다.")
+        self.profiles = ProfileTable.from_profiles(
+            {'id': user_id, 'gender': 'male', 'age_band': '30s', 'intro': '전기 수리'} for user_id in range(1, 120)
+        )
+        self.graphs = {
+            # 1 -> 2 -> 10..109 (2촌 후보 100명)
+            1: {'edges': [{'source': 1, 'target': 2}] + [{'source': 2, 'target': c} for c in range(10, 110)]},
+            3: {'edges': []},   # 실제로 연결이 없는 요청자
+            99: {},             # 그래프 조회 실패
+        }
+
+    def run_precompute(self, user_ids):
+        with mock.patch.object(self.service, '_fetch_all_user_profiles_from_core_service', return_value=self.profiles), \
+                mock.patch.object(self.service, '_fetch_network_graph_from_core_service',
+                                  side_effect=lambda user_id, depth=2: self.graphs[user_id]):
+            return CandidatePrecomputer(self.service).run(user_ids)
+
+    def test_failed_graph_fetch_keeps_existing_snapshot(self):
+        computed_at = timezone.now() - timedelta(hours=1)
+        CandidateSnapshot.objects.create(requester_user_id=99, category='repair', candidates=[{'ml_score': 0.5}],
+                                         computed_at=computed_at)
+
+        self.assertEqual(self.run_precompute([1, 3, 99]), 2)
+
+        snapshot = CandidateSnapshot.objects.get(requester_user_id=99)
+        self.assertEqual(snapshot.candidates, [{'ml_score': 0.5}])
+        self.assertEqual(snapshot.computed_at, computed_at)
+        self.assertEqual(CandidateSnapshot.objects.filter(requester_user_id=1).count(), 6)
+        self.assertTrue(any(s.candidates for s in CandidateSnapshot.objects.filter(requester_user_id=1)))
+        self.assertEqual([s.candidates for s in CandidateSnapshot.objects.filter(requester_user_id=3)], [[]] * 6)
+
+    def test_ignores_negative_cache(self):
+        if self.service.negative_cache is None:
+            self.skipTest("빈 결과 캐시가 꺼져 있습니다.")
+        self.service.negative_cache.mark_isolated(1)
+        self.assertEqual(self.run_precompute([1]), 1)
+        self.assertTrue(any(s.candidates for s in CandidateSnapshot.objects.filter(requester_user_id=1)))
+
+
+@override_settings(AI_LLM={'BACKEND': 'fake'},
+                   AI_SHARDED_SCORING={'ENABLED': True, 'MIN_CANDIDATES': 10, 'PROCESSES': 1, 'MIN_SHARD_SIZE': 10})
+class ShardedScoringTimeoutTests(SimpleTestCase):
+    """샤드가 마감 안에 끝나지 않을 때"""
+
+    def setUp(self):
+        from .services import AIRecommendationService
+
+        self.service = AIRecommendationService()
+        parent_pid = os.getpid()
+        pair_features = self.service._pair_features
+
+        def slow_in_pool(profiles, requester_profiles, categories, relationship_degree):
+            # 프로세스 풀 안에서 'repair' 샤드만 멈춘 것처럼 오래 걸림
+            if os.getpid() != parent_pid and categories[0] == 'repair':
+                time.sleep(60)
+            return pair_features(profiles, requester_profiles, categories, relationship_degree)
+
+        self.service._pair_features = slow_in_pool
+        self.service._profile_cache = {
+            user_id: {'id': user_id, 'gender': 'male', 'intro': '전기 수리', 'manner_temperature': 70}
+            for user_id in range(10, 40)
+        }
+        self.candidates = {user_id: 2 for user_id in self.service._profile_cache}
+        self.addCleanup(self.close_executor)
+
+    @staticmethod
+    def close_executor():
+        if sharded_scoring._executor is not None:
+            sharded_scoring.discard_sharded_executor(sharded_scoring._executor)
+
+    def rank(self, category, deadline):
+        return self.service._rank_candidates(self.candidates, category, '전기 수리', None, 5, None, deadline)
+
+    def test_timeout_falls_back_and_next_request_uses_new_pool(self):
+        deadline = Deadline(1.0)
+        recommendations = self.rank('repair', deadline)
+        self.assertEqual(deadline.missed_stages, ['sharded_scoring'])
+        self.assertEqual({r['scorer'] for r in recommendations}, {'rule_based'})
+        self.assertIsNone(sharded_scoring._executor)
+
+        # 멈춘 샤드 뒤에서 기다리지 않고 새 풀에서 바로 계산
+        deadline = Deadline(10.0)
+        started = time.monotonic()
+        recommendations = self.rank('cleaning', deadline)
+        self.assertFalse(deadline.partial)
+        self.assertLess(time.monotonic() - started, 10.0)
+        self.assertEqual(len(recommendations), 5)
+        self.assertIsNotNone(sharded_scoring._executor)
+
+
+class RequestCoalescerTests(SimpleTestCase):
+    """중복 추천 요청 제거 (두 인스턴스는 같은 캐시를 쓰는 서로 다른 워커)"""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.calls = 0
+        self.key = RequestCoalescer.key_for(1, '전기 수리', 5, 'key-1')
+        self.fingerprint = RequestCoalescer.fingerprint_for('전기 수리', 5)
+
+    def compute(self, partial=False, delay=0.0):
+        def run():
+            self.calls += 1
+            time.sleep(delay)
+            return 201, {'request_id': self.calls, 'recommendations': [], 'partial': partial}, {}
+        return run
+
+    def test_replays_complete_response(self):
+        coalescer = RequestCoalescer(poll_interval=0.01)
+        first = coalescer.run(self.key, self.compute(), 1, self.fingerprint)
+        second = RequestCoalescer(poll_interval=0.01).run(self.key, self.compute(), 1, self.fingerprint)
+        self.assertEqual(first[1], SOURCE_COMPUTED)
+        self.assertEqual(second, (first[0], SOURCE_REPLAYED))
+        self.assertEqual(self.calls, 1)
+
+    def test_partial_response_is_not_replayed(self):
+        coalescer = RequestCoalescer(poll_interval=0.01)
+        coalescer.run(self.key, self.compute(partial=True), 1, self.fingerprint)
+        response, source = coalescer.run(self.key, self.compute(), 1, self.fingerprint)
+        self.assertEqual(source, SOURCE_COMPUTED)
+        self.assertEqual(response[1]['request_id'], 2)
+
+    def test_other_worker_waits_for_leader(self):
+        leader, follower = RequestCoalescer(poll_interval=0.01), RequestCoalescer(poll_interval=0.01)
+        thread = threading.Thread(target=leader.run, args=(self.key, self.compute(delay=0.2), 5, self.fingerprint))
+        thread.start()
+        time.sleep(0.05)
+        response, source = follower.run(self.key, self.compute(), 5, self.fingerprint)
+        thread.join()
+        self.assertEqual(source, SOURCE_COALESCED)
+        self.assertEqual(response[1]['request_id'], 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_mismatched_body_is_rejected(self):
+        coalescer = RequestCoalescer(poll_interval=0.01)
+        coalescer.run(self.key, self.compute(), 1, self.fingerprint)
+        other = RequestCoalescer.fingerprint_for('청소', 5)
+        self.assertEqual(coalescer.run(self.key, self.compute(), 1, other), (None, SOURCE_MISMATCH))
+        self.assertEqual(self.calls, 1)
+
+    def test_takes_over_when_lock_disappears(self):
+        # 다른 워커가 처리 중 표시만 남기고 응답을 저장하지 못한 채 끝남
+        cache = caches['default']
+        cache.add(self.key + ':lock', self.fingerprint, timeout=30)
+        threading.Timer(0.1, cache.delete, args=(self.key + ':lock',)).start()
+        response, source = RequestCoalescer(poll_interval=0.01).run(self.key, self.compute(), 5, self.fingerprint)
+        self.assertEqual(source, SOURCE_COMPUTED)
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(cache.get(self.key + ':lock'))
+
+
+class RecommendIdempotencyViewTests(SimpleTestCase):
+    """/recommend/ Idempotency-Key 처리"""
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def post(self, request_text):
+        return self.client.post(reverse('recommend_connection'), {'user_id': 1, 'request_text': request_text},
+                                content_type='application/json', HTTP_IDEMPOTENCY_KEY='abc')
+
+    def test_reused_key_with_different_body_returns_422(self):
+        result = (201, {'request_id': 7, 'recommendations': [], 'partial': False}, {})
+        with mock.patch('ai.views.RecommendConnectionView._recommend', return_value=result) as recommend:
+            first = self.post('전기 수리')
+            replayed = self.post('전기 수리')
+            mismatched = self.post('청소')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(replayed['Idempotent-Replayed'], SOURCE_REPLAYED)
+        self.assertEqual(mismatched.status_code, 422)
+        self.assertEqual(recommend.call_count, 1)
+
+
+class LocalTokenBucketStoreTests(SimpleTestCase):
+    """워커 메모리 토큰 버킷"""
+
+    def test_take_and_refund(self):
+        store = LocalTokenBucketStore()
+        self.assertEqual([store.take('k', 0.001, 2) for _ in range(2)], [0.0, 0.0])
+        self.assertGreater(store.take('k', 0.001, 2), 0)
+        store.refund('k', 0.001, 2)
+        self.assertEqual(store.take('k', 0.001, 2), 0.0)
+
+    def test_refund_never_exceeds_burst(self):
+        store = LocalTokenBucketStore()
+        store.take('k', 0.001, 1)
+        store.refund('k', 0.001, 1)
+        store.refund('k', 0.001, 1)
+        self.assertEqual(store.take('k', 0.001, 1), 0.0)
+        self.assertGreater(store.take('k', 0.001, 1), 0)
+
+    def test_prunes_full_buckets_only(self):
+        store = LocalTokenBucketStore(prune_interval=0.0)
+        store.take('refilled', 1000.0, 1)
+        store.take('drained', 0.001, 1)
+        time.sleep(0.01)
+        store.take('new', 1000.0, 1)
+        self.assertNotIn('refilled', store._buckets)
+        self.assertIn('drained', store._buckets)
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    """/recommend/ 요청 허용 순서"""
+
+    def make_controller(self, **kwargs):
+        self.store = LocalTokenBucketStore()
+        options = dict(user_rate=0.001, user_burst=1, global_rate=0.001, global_burst=10, max_inflight=4)
+        options.update(kwargs)
+        return AdmissionController(self.store, **options)
+
+    def test_user_limit_returns_429_without_using_global_token(self):
+        controller = self.make_controller(global_burst=2)
+        self.assertTrue(controller.try_admit(1).allowed)
+        decision = controller.try_admit(1)
+        self.assertEqual((decision.status_code, decision.reason), (429, 'user_rate'))
+        # 사용자 한도에서 거절된 요청은 전체 토큰을 쓰지 않음
+        self.assertTrue(controller.try_admit(2).allowed)
+
+    def test_global_limit_returns_503_and_refunds_user_token(self):
+        controller = self.make_controller(global_burst=1)
+        self.assertTrue(controller.try_admit(1).allowed)
+        decision = controller.try_admit(2)
+        self.assertEqual((decision.status_code, decision.reason), (503, 'global_rate'))
+        self.assertEqual(self.store.take('user:2', 0.001, 1), 0.0)
+
+    def test_inflight_limit_and_release(self):
+        controller = self.make_controller(user_burst=10, max_inflight=1)
+        admitted = controller.try_admit(1)
+        self.assertEqual(controller.try_admit(2).reason, 'inflight')
+        admitted.release()
+        self.assertTrue(controller.try_admit(2).allowed)
+
+
+class RedisTokenBucketStoreTests(SimpleTestCase):
+    """Redis Lua 토큰 버킷 (AI_TEST_REDIS_URL이 있으면 실제 Redis, 없으면 fakeredis로 스크립트 실행)"""
+
+    def setUp(self):
+        url = os.getenv('AI_TEST_REDIS_URL')
+        if url:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        else:
+            try:
+                import fakeredis
+            except ImportError:
+                self.skipTest("AI_TEST_REDIS_URL도 fakeredis도 없습니다.")
+            client = fakeredis.FakeRedis()
+        self.client = client
+        self.store = RedisTokenBucketStore(client=client, key_prefix=f'ai:test:admission:{os.getpid()}:')
+        self.addCleanup(lambda: [client.delete(key) for key in client.keys(self.store.key_prefix + '*')])
+
+    def test_take_refund_and_expiry(self):
+        self.assertEqual([self.store.take('k', 1.0, 2) for _ in range(2)], [0.0, 0.0])
+        wait = self.store.take('k', 1.0, 2)
+        self.assertGreater(wait, 0.0)
+        self.assertLessEqual(wait, 1.0)
+        self.store.refund('k', 1.0, 2)
+        self.assertEqual(self.store.take('k', 1.0, 2), 0.0)
+        # 가득 차는 시간(burst / rate) + 1초 뒤 만료
+        self.assertGreater(self.client.pttl(self.store.key_prefix + 'k'), 0)
+        self.assertLessEqual(self.client.pttl(self.store.key_prefix + 'k'), 3000)
+
+    def test_refund_of_missing_bucket_does_nothing(self):
+        self.store.refund('missing', 1.0, 2)
+        self.assertFalse(self.client.exists(self.store.key_prefix + 'missing'))
+
+    def test_refills_over_time(self):
+        self.store.take('k', 100.0, 1)
+        self.assertGreater(self.store.take('k', 100.0, 1), 0.0)
+        time.sleep(0.05)
+        self.assertEqual(self.store.take('k', 100.0, 1), 0.0)
@@ -9,6 +9,9 @@ urlpatterns = [
     # path('', views.modern_interface, name='ai_home'),
     path('', include(router.urls)),
     path('recommend/', views.RecommendConnectionView.as_view(), name='recommend_connection'),
+    path('recommend/bulk/', views.BulkRecommendConnectionView.as_view(), name='recommend_connection_bulk'),
     path('feedback/', views.ConnectionFeedbackView.as_view(), name='connection_feedback'),
     path('requests/', views.ConnectionRequestView.as_view(), name='connection_requests'),
+    path('export/', views.ExportView.as_view(), name='export_recommendations'),
+    path('metrics/', views.MetricsView.as_view(), name='service_metrics'),
 ]
\ No newline at end of file
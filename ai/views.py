@@ -1,7 +1,10 @@
+import json
+import logging
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from .models import ConnectionRequest, RecommendationLog, ConnectionFeedback
 from .serializers import (
@@ -9,9 +12,18 @@ from .serializers import (
     RecommendationLogSerializer,
     ConnectionFeedbackSerializer,
     RecommendationRequestSerializer,
-    RecommendationResponseSerializer
+    BulkRecommendationRequestSerializer,
+    recommendation_response_data,
+    bulk_recommendation_response_data
 )
 from .services import AIRecommendationService
+from .admission import get_admission_controller
+from .idempotency import SOURCE_COMPUTED, SOURCE_MISMATCH, get_request_coalescer
+from .deadline import Deadline
+from .exports import EXPORT_FORMATS, export_watermark, iter_export, parse_since
+from . import metrics
+
+logger = logging.getLogger(__name__)
 
 class RecommendConnectionView(APIView):
     """AI 기반 연결 추천 API"""
@@ -20,27 +32,100 @@ class RecommendConnectionView(APIView):
         # DEBUG용
         print(f"[DEBUG] API 요청이 RecommendConnectionView에 들어왔습니다. 요청 데이터: {request.data}")
         
+        # 요청 단위 마감 시간 (각 단계는 남은 시간만큼만 기다림)
+        deadline = Deadline.from_settings()
+        
         serializer = RecommendationRequestSerializer(data=request.data)
-        if serializer.is_valid():
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = serializer.validated_data
+        coalescer = get_request_coalescer()
+        if coalescer is None:
+            return self._to_response(self._recommend(data, deadline))
+        
+        # 같은 요청(Idempotency-Key 또는 같은 내용)이 처리 중이면 결과를 공유하고, 방금 끝났으면 저장된 응답 재전송
+        key = coalescer.key_for(data['user_id'], data['request_text'], data['max_recommendations'],
+                                request.headers.get('Idempotency-Key'), location=data['location'])
+        fingerprint = coalescer.fingerprint_for(data['request_text'], data['max_recommendations'], data['location'])
+        result, source = coalescer.run(key, lambda: self._recommend(data, deadline),
+                                       timeout=deadline.remaining() + 1.0, fingerprint=fingerprint)
+        if source == SOURCE_MISMATCH:
+            return Response({'error': '같은 Idempotency-Key로 내용이 다른 요청을 보낼 수 없습니다.'},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if result is None:
+            return Response({'error': '같은 요청을 처리 중입니다. 잠시 후 다시 시도해주세요.'},
+                            status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+        response = self._to_response(result)
+        if source != SOURCE_COMPUTED:
+            response['Idempotent-Replayed'] = source
+        return response
+    
+    def _recommend(self, data, deadline):
+        """추천 생성 후 (상태 코드, 응답 본문, 헤더) 반환"""
+        # 사용자별/전체 요청량과 워커 동시 처리 수를 넘으면 대기 없이 바로 거절
+        admission = get_admission_controller().try_admit(data['user_id'])
+        if not admission.allowed:
+            return self._reject(admission)
+        
+        try:
             ai_service = AIRecommendationService()
+            result = ai_service.create_recommendation_request(
+                user_id=data['user_id'],
+                request_text=data['request_text'],
+                max_recommendations=data['max_recommendations'],
+                location=data['location'] or None,
+                deadline=deadline
+            )
+            
+            # 서비스가 만든 결과이므로 Serializer 대신 같은 형태의 dict를 바로 생성
+            return status.HTTP_201_CREATED, recommendation_response_data(result), {}
             
-            try:
-                result = ai_service.create_recommendation_request(
-                    user_id=serializer.validated_data['user_id'],
-                    request_text=serializer.validated_data['request_text'],
-                    max_recommendations=serializer.validated_data['max_recommendations']
-                )
-                
-                response_serializer = RecommendationResponseSerializer(result)
-                return Response(response_serializer.data, status=status.HTTP_201_CREATED)
-                
-            except Exception as e:
-                return Response(
-                    {'error': f'추천 생성 중 오류가 발생했습니다: {str(e)}'}, 
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        except Exception as e:
+            return (status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    {'error': f'추천 생성 중 오류가 발생했습니다: {str(e)}'}, {})
+        finally:
+            admission.release()
+    
+    @staticmethod
+    def _reject(admission):
+        if admission.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            message = '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'
+        else:
+            message = '서버가 혼잡합니다. 잠시 후 다시 시도해주세요.'
+        return (admission.status_code, {'error': message, 'reason': admission.reason},
+                {'Retry-After': admission.retry_after_header})
+    
+    @staticmethod
+    def _to_response(result):
+        status_code, body, headers = result
+        return Response(body, status=status_code, headers=headers)
+
+class BulkRecommendConnectionView(APIView):
+    """여러 요청자의 추천을 한 번에 생성해 NDJSON으로 스트리밍하는 API (배치 작업용)"""
+    
+    def post(self, request):
+        serializer = BulkRecommendationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ai_service = AIRecommendationService()
+        results = ai_service.create_bulk_recommendations(
+            items=serializer.validated_data['requests'],
+            max_recommendations=serializer.validated_data['max_recommendations']
+        )
+        return StreamingHttpResponse(self._stream(results), content_type='application/x-ndjson')
+    
+    @staticmethod
+    def _stream(results):
+        """요청자별 결과를 한 줄씩 JSON으로 출력 (도중 오류는 마지막 줄에 기록)"""
+        try:
+            for result in results:
+                data = bulk_recommendation_response_data(result)
+                yield json.dumps(data, ensure_ascii=False) + '\n'
+        except Exception as e:
+            logger.error(f"일괄 추천 생성 중 오류 발생: {e}")
+            yield json.dumps({'error': f'추천 생성 중 오류가 발생했습니다: {str(e)}'}, ensure_ascii=False) + '\n'
 
 class ConnectionRequestView(APIView):
     """연결 요청 관리 API"""
@@ -102,6 +187,39 @@ class ConnectionFeedbackView(APIView):
         serializer = ConnectionFeedbackSerializer(feedbacks, many=True)
         return Response(serializer.data)
 
+class ExportView(APIView):
+    """추천 로그/피드백 분석용 스트리밍 내보내기 API (export_format=ndjson 또는 csv)
+
+    since(ISO 8601)를 주면 그 이후 요청/추천 로그/피드백이 생긴 요청을 (현재 상태로) 내보내고,
+    응답 헤더 X-Export-Watermark 값을 다음 내보내기의 since로 사용하면 됩니다.
+    같은 request_id가 여러 번 나올 수 있으므로 받는 쪽은 request_id 기준으로 덮어씁니다.
+    """
+    
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f'export_format은 {", ".join(EXPORT_FORMATS)} 중 하나여야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            since = parse_since(request.query_params.get('since'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        until = export_watermark()
+        content_type = 'application/x-ndjson' if export_format == 'ndjson' else 'text/csv; charset=utf-8'
+        response = StreamingHttpResponse(iter_export(export_format, since=since, until=until),
+                                         content_type=content_type)
+        response['X-Export-Watermark'] = until.isoformat()
+        return response
+
+class MetricsView(APIView):
+    """워커 단위 서비스 지표 조회 API"""
+    
+    def get(self, request):
+        return Response(metrics.snapshot())
+
 def modern_interface(request):
     """AI 인맥 추천 서비스 메인 페이지"""
     return render(request, 'modern_interface.html')
@@ -0,0 +1,40 @@
+import logging
+import time
+
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """요청 처리에 필요한 무거운 모듈/모델을 미리 로딩
+
+    gunicorn preload_app 마스터에서 워커를 fork하기 전에 호출하면 워커는 이미 로딩된 상태를
+    물려받으므로, 워커 시작/재시작(max_requests) 직후 첫 요청이 모델 로딩을 기다리지 않습니다.
+    fork 후 공유하면 안 되는 것(DB 연결, Gemini/Redis 클라이언트)은 만들지 않습니다.
+    """
+    started = time.perf_counter()
+
+    # URLConf는 첫 요청 때 import되므로 미리 불러옴 (views -> services -> numpy/requests 등)
+    get_resolver().url_patterns
+
+    from .features import load_model_bundle
+    from .llm_gateway import llm_setting
+    from .profile_features import get_profile_feature_cache
+    from .semantic import get_semantic_matcher
+    from .services import default_model_path
+
+    try:
+        load_model_bundle(default_model_path())  # joblib/sklearn import + 모델 역직렬화 (프로세스당 캐시)
+    except Exception as e:
+        logger.error(f"추천 모델 사전 로딩 실패 (요청 시 다시 시도합니다): {e}")
+    get_semantic_matcher()
+    get_profile_feature_cache()
+    if llm_setting('BACKEND', 'gemini') == 'gemini':
+        # 모듈 import만 미리 하고 클라이언트는 워커에서 처음 사용할 때 생성
+        import google.generativeai  # noqa: F401
+
+    # 마스터에서 연 DB 연결이 워커에 공유되지 않도록 정리
+    connections.close_all()
+    logger.info(f"사전 로딩 완료: {time.perf_counter() - started:.2f}초")
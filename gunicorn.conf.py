@@ -0,0 +1,23 @@
+# gunicorn 설정 (gunicorn은 실행 디렉토리의 gunicorn.conf.py를 자동으로 읽습니다)
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# 마스터에서 앱을 한 번 로딩하고 워커는 fork로 물려받음 (워커 시작/재시작 시 import/모델 로딩 생략)
+preload_app = True
+
+# 메모리 누수 대비 워커 재시작 (jitter로 워커들이 동시에 재시작하지 않도록 분산)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+
+def when_ready(server):
+    """워커 fork 전 마스터에서 모델/모듈 사전 로딩"""
+    from ai.warmup import warm_up
+
+    warm_up()
+    # 사전 로딩한 객체를 GC 대상에서 제외해 워커에서 copy-on-write로 메모리가 복사되는 것을 줄임
+    gc.freeze()
@@ -0,0 +1,46 @@
+# bench_feature_encoding.py
+# 기존 pandas 인코딩 경로와 FeatureEncoder의 인코딩 처리량 비교
+import os
+import sys
+import random
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai.features import FeatureEncoder, DEFAULT_VOCABULARY
+
+# --- 설정 ---
+BATCH_SIZE = 1000
+REPEAT = 5
+
+encoder = FeatureEncoder.default()
+model_columns = encoder.feature_names
+
+rows = [{
+    'relationship_degree': random.choice([1, 2, 3]),
+    'category': random.choice(DEFAULT_VOCABULARY['category']),
+    'requester_age': random.choice(DEFAULT_VOCABULARY['requester_age']),
+    'candidate_gender': random.choice(DEFAULT_VOCABULARY['candidate_gender']),
+} for _ in range(BATCH_SIZE)]
+
+
+def pandas_encode(batch):
+    """기존 서빙 경로: DataFrame 생성 -> get_dummies -> reindex"""
+    return pd.get_dummies(pd.DataFrame(batch)).reindex(columns=model_columns, fill_value=0).to_numpy(dtype=np.float64)
+
+
+# 두 경로의 결과가 같은지 먼저 확인
+assert np.array_equal(pandas_encode(rows), encoder.encode_batch(rows))
+
+out = np.zeros((BATCH_SIZE, encoder.n_features))
+results = {
+    'pandas 단일 행': min(timeit.repeat(lambda: [pandas_encode([row]) for row in rows[:100]], number=1, repeat=REPEAT)) / 100,
+    'encoder 단일 행': min(timeit.repeat(lambda: [encoder.encode_one(row) for row in rows[:100]], number=1, repeat=REPEAT)) / 100,
+    f'pandas 배치({BATCH_SIZE})': min(timeit.repeat(lambda: pandas_encode(rows), number=1, repeat=REPEAT)),
+    f'encoder 배치({BATCH_SIZE})': min(timeit.repeat(lambda: encoder.encode_batch(rows, out=out), number=1, repeat=REPEAT)),
+}
+
+for name, seconds in results.items():
+    print(f"{name:<20} {seconds * 1e6:>12.1f} us")
@@ -0,0 +1,123 @@
+# bench_location_index.py
+# 지역 조건이 있는 추천에서 지역 색인(후보 생성 단계 제외)과 기존 방식(전체 후보 조회 후 city_name 필터) 비교
+# 여러 시/군/구에 사용자가 퍼져 있는 합성 그래프에서 조회/점수 계산 대상 수와 소요 시간을 측정합니다.
+# 사용법: python scripts/bench_location_index.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AI_service.settings')
+os.environ.setdefault('SECRET_KEY', 'bench')
+os.environ.setdefault('AI_LLM_BACKEND', 'fake')
+
+import django
+
+django.setup()
+
+from ai.location_index import LocationIndex
+from ai.profile_table import ProfileTable
+from ai.services import AIRecommendationService
+
+# --- 설정 ---
+REGIONS = {
+    '서울특별시': ['강남구', '서초구', '송파구', '마포구', '용산구', '종로구'],
+    '부산광역시': ['해운대구', '수영구', '동래구', '부산진구'],
+    '인천광역시': ['연수구', '남동구', '부평구'],
+    '대구광역시': ['수성구', '달서구', '중구'],
+    '경기도': ['수원시', '성남시', '고양시', '용인시'],
+}
+# (사용자 수, 요청자 1촌 수, 1촌당 친구 수)
+SCENARIOS = [(20000, 50, 40), (100000, 200, 100), (300000, 400, 200)]
+LOCATIONS = ['강남구', '부산광역시', '수원시']
+REPEAT = 3
+INTROS = ['전기 수리 전문 기사입니다', '입주청소 깔끔하게 해드려요', '바퀴벌레 방역 경험 많아요',
+          '컴퓨터 설치와 와이파이 점검', '반려동물 산책과 심부름', '병원 동행과 통역 지원']
+CITIES = [(province, city) for province, cities in REGIONS.items() for city in cities]
+
+
+class NoLocationIndex(LocationIndex):
+    """기존 방식: 색인하지 않고 프로필을 받은 뒤 city_name만 필터"""
+
+    def ingest(self, profiles):
+        pass
+
+
+def make_users(n):
+    rng = random.Random(7)
+    users = []
+    for user_id in range(1, n + 1):
+        province, city = rng.choice(CITIES)
+        users.append({
+            'id': user_id, 'username': f'user{user_id}', 'name': f'사용자{user_id}',
+            'province_name': province, 'city_name': city, 'gender': rng.choice(['male', 'female']),
+            'age_band': rng.choice(['20s', '30s', '40s']), 'intro': rng.choice(INTROS),
+            'manner_temperature': rng.randint(30, 90),
+        })
+    return users
+
+
+def make_edges(n, first_degree, fanout):
+    """요청자(1) -> 1촌 first_degree명 -> 1촌마다 친구 fanout명"""
+    rng = random.Random(11)
+    friends = rng.sample(range(2, n + 1), first_degree)
+    edges = [{'source': 1, 'target': friend} for friend in friends]
+    for friend in friends:
+        edges.extend({'source': friend, 'target': rng.randint(2, n)} for _ in range(fanout))
+    return edges
+
+
+def run(users, graph_candidates, location, index):
+    """추천 1회 실행 후 (소요 시간, 프로필 캐시에 들어온 사용자 수, 점수 계산한 후보 수, 추천 목록)
+
+    그래프 탐색은 두 방식이 같으므로 미리 계산한 결과를 사용하고 그 이후 단계만 측정합니다.
+    """
+    service = AIRecommendationService()
+    service.location_index = index
+    service._fetch_all_user_profiles_from_core_service = lambda deadline=None, user_ids=None: \
+        ProfileTable.from_profiles(user for user in users if user_ids is None or user['id'] in user_ids)
+    service._generate_candidates = lambda *args, **kwargs: graph_candidates
+    scored = []
+    score_candidates = service.score_candidates
+
+    def counting_score_candidates(candidate_profiles, *args, **kwargs):
+        scored.append(len(candidate_profiles))
+        return score_candidates(candidate_profiles, *args, **kwargs)
+
+    service.score_candidates = counting_score_candidates
+    started = time.perf_counter()
+    recommendations = service.find_potential_connections(1, 'repair', '전기 수리', location=location,
+                                                         requester_profile=users[0])
+    elapsed = time.perf_counter() - started
+    return elapsed, len(service._profile_cache), sum(scored), recommendations
+
+
+print(f"{'사용자':>8} {'후보':>7} {'지역':<8} {'방식':<6} {'조회 프로필':>10} {'점수 계산':>9} {'시간(ms)':>9}")
+for n_users, first_degree, fanout in SCENARIOS:
+    users = make_users(n_users)
+    edges = make_edges(n_users, first_degree, fanout)
+    graph_candidates = AIRecommendationService()._find_second_degree_candidates(1, edges)
+    n_candidates = len(graph_candidates[0])
+    warm_index = LocationIndex()
+    started = time.perf_counter()
+    warm_index.ingest(users)
+    ingest_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    warm_index.ingest(users)
+    refresh_ms = (time.perf_counter() - started) * 1000
+    for location in LOCATIONS:
+        results = {}
+        for name, make_index in (('기존', NoLocationIndex), ('색인', lambda: warm_index)):
+            best = None
+            for _ in range(REPEAT):
+                outcome = run(users, graph_candidates, location, make_index())
+                if best is None or outcome[0] < best[0]:
+                    best = outcome
+            results[name] = best
+            elapsed, fetched, scored, _ = best
+            print(f"{n_users:>8} {n_candidates:>7} {location:<8} {name:<6} {fetched:>10} {scored:>9} "
+                  f"{elapsed * 1000:>9.1f}")
+        assert [r['recommended_user_id'] for r in results['기존'][3]] == \
+            [r['recommended_user_id'] for r in results['색인'][3]], "추천 결과가 다릅니다"
+    print(f"{'':>8} 색인 최초 구축 {ingest_ms:.1f} ms, 변경 없는 재수집 {refresh_ms:.1f} ms (REFRESH_SECONDS마다 한 번)")
@@ -0,0 +1,104 @@
+# bench_profile_parsing.py
+# /users/all 응답 처리 방식별 최대 메모리와 파싱 시간 비교 (사용자 10만/100만 명)
+#  - 기존: 본문 전체를 받아 response.json()으로 전체 사용자 dict 리스트 생성
+#  - 스트리밍(일부): 64KB 조각으로 파싱하며 요청한 사용자만 보관 (추천 요청 1건)
+#  - 스트리밍(전체): 64KB 조각으로 파싱하며 전체 사용자를 컬럼형 ProfileTable에 보관 (배치 작업)
+# 사용법: python scripts/bench_profile_parsing.py [사용자 수 ...]
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.profile_table import ProfileTable, iter_json_array
+
+# --- 설정 ---
+USER_COUNTS = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+CHUNK_SIZE = 64 * 1024
+WANTED = 2_000      # 추천 요청 1건에서 필요한 사용자 수 (요청자 + 후보 + 소개자)
+REPEAT = 3
+REGIONS = {
+    '서울특별시': ['강남구', '서초구', '송파구', '마포구'],
+    '부산광역시': ['해운대구', '수영구', '동래구'],
+    '인천광역시': ['연수구', '남동구', '미추홀구'],
+    '경기도': ['수원시', '성남시', '고양시'],
+}
+INTROS = ['전기 수리 전문 기사입니다', '입주청소 깔끔하게 해드려요', '바퀴벌레 방역 경험 많아요',
+          '컴퓨터 설치와 와이파이 점검', '반려동물 산책과 심부름', '병원 동행과 통역 지원', '']
+
+
+def make_body(n):
+    """Core 서비스 /users/all 형태의 응답 본문 (DRF 페이지네이션 형식)"""
+    rng = random.Random(3)
+    cities = [(province, city) for province, names in REGIONS.items() for city in names]
+    users = []
+    for user_id in range(1, n + 1):
+        province, city = rng.choice(cities)
+        users.append({
+            'id': user_id, 'username': f'user{user_id}', 'name': f'사용자{user_id}',
+            'email': f'user{user_id}@example.com', 'province_name': province, 'city_name': city,
+            'gender': rng.choice(['male', 'female']), 'age_band': rng.choice(['20s', '30s', '40s', '50s']),
+            'intro': rng.choice(INTROS), 'manner_temperature': round(rng.uniform(30, 90), 1),
+        })
+    return json.dumps({'count': n, 'next': None, 'previous': None, 'results': users}, ensure_ascii=False).encode()
+
+
+def iter_chunks(body):
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield bytes(view[start:start + CHUNK_SIZE])
+
+
+def parse_json(body, wanted):
+    # requests의 response.json()은 본문 전체(response.content)를 모은 뒤 파싱
+    content = b''.join(iter_chunks(body))
+    users = json.loads(content).get('results', [])
+    return [user for user in users if user.get('id') in wanted] if wanted is not None else users
+
+
+def parse_stream(body, wanted):
+    profiles = ProfileTable()
+    for user in iter_json_array(iter_chunks(body), 'results'):
+        if wanted is None or user.get('id') in wanted:
+            profiles.append(user)
+    return profiles
+
+
+def measure(func, body, wanted):
+    """(최소 소요 초, 최대 메모리 바이트, 결과가 유지하는 메모리 바이트) - 시간은 tracemalloc 없이 따로 측정"""
+    elapsed = float('inf')
+    for _ in range(REPEAT):
+        gc.collect()
+        started = time.perf_counter()
+        result = func(body, wanted)
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = func(body, wanted)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak, retained
+
+
+CASES = [
+    ('기존 json() 전체', parse_json, False),
+    ('기존 json() 후 일부', parse_json, True),
+    ('스트리밍 일부', parse_stream, True),
+    ('스트리밍 전체(표)', parse_stream, False),
+]
+
+for n in USER_COUNTS:
+    body = make_body(n)
+    wanted = set(random.Random(5).sample(range(1, n + 1), WANTED))
+    print(f"\n사용자 {n:,}명, 본문 {len(body) / 2 ** 20:.1f} MiB, 필요한 사용자 {WANTED:,}명")
+    print(f"{'방식':<18} {'시간(s)':>8} {'최대 메모리(MiB)':>14} {'유지 메모리(MiB)':>14}")
+    for name, func, partial in CASES:
+        elapsed, peak, retained = measure(func, body, wanted if partial else None)
+        print(f"{name:<18} {elapsed:>8.2f} {peak / 2 ** 20:>14.1f} {retained / 2 ** 20:>14.1f}")
+    del body
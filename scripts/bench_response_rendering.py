@@ -0,0 +1,59 @@
+# bench_response_rendering.py
+# RecommendationResponseSerializer와 plain dict 렌더링 경로의 응답 1건당 직렬화 비용 비교
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AI_service.settings')
+os.environ.setdefault('SECRET_KEY', 'bench')
+
+import django
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from ai.serializers import RecommendationResponseSerializer, recommendation_response_data
+
+# --- 설정 ---
+RECOMMENDATION_COUNTS = [1, 5, 10]
+NUMBER = 200
+REPEAT = 5
+
+
+def make_profile(user_id):
+    return {
+        'id': user_id, 'username': f'user{user_id}', 'name': f'사용자{user_id}', 'email': f'user{user_id}@example.com',
+        'province_name': '서울특별시', 'city_name': '강남구', 'gender': 'M', 'age_band': '30대',
+        'intro': '전기 수리와 배관 정비 경험이 많습니다.', 'manner_temperature': 65,
+    }
+
+
+def make_result(n):
+    return {
+        'request_id': 1,
+        'recommendations': [{
+            'id': i, 'recommended_user': make_profile(100 + i), 'introducer_user': make_profile(200 + i),
+            'relationship_degree': 2, 'ai_score': 0.8123,
+        } for i in range(n)],
+        'inferred_category': 'repair',
+        'scorer': 'ml',
+        'partial': False,
+    }
+
+
+renderer = JSONRenderer()
+print(f"{'추천 수':>6} {'Serializer':>14} {'plain dict':>14} {'+JSON 렌더링':>14} {'배속':>8}")
+for n in RECOMMENDATION_COUNTS:
+    result = make_result(n)
+    # 두 경로의 JSON이 같은지 먼저 확인
+    assert renderer.render(RecommendationResponseSerializer(result).data) == renderer.render(
+        recommendation_response_data(result))
+
+    drf = min(timeit.repeat(lambda: RecommendationResponseSerializer(result).data,
+                            number=NUMBER, repeat=REPEAT)) / NUMBER
+    fast = min(timeit.repeat(lambda: recommendation_response_data(result), number=NUMBER, repeat=REPEAT)) / NUMBER
+    rendered = min(timeit.repeat(lambda: renderer.render(recommendation_response_data(result)),
+                                 number=NUMBER, repeat=REPEAT)) / NUMBER
+    print(f"{n:>6} {drf * 1e6:>12.1f}us {fast * 1e6:>12.1f}us {rendered * 1e6:>12.1f}us {drf / fast:>7.1f}x")
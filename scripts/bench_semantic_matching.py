@@ -0,0 +1,85 @@
+# bench_semantic_matching.py
+# 키워드 매칭과 의미 매칭(char n-gram TF-IDF + LSA)의 지연 시간과 품질 비교
+import os
+import sys
+import random
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai.profile_features import ProfileFeatureCache
+from ai.semantic import SemanticIntroIndex, SemanticMatcher
+
+# --- 설정 ---
+NUM_USERS = [1000, 10000, 50000]
+random.seed(42)
+np.random.seed(42)
+
+# 카테고리별 intro 문구 (일부는 키워드 사전에 없는 표현)
+PHRASES = {
+    'repair': ['콘센트 갈아드려요', '싱크대 막힘 뚫어드립니다', '형광등 교체 가능', '문고리 손봐드려요', '누수 잡아드립니다', '전기 수리 경력 10년'],
+    'cleaning': ['집안 구석구석 닦아드려요', '곰팡이 제거 전문', '이사 후 먼지 털어드립니다', '욕실 물때 제거', '입주청소 합니다'],
+    'pest_control': ['벌레 잡아드립니다', '흰개미 퇴치', '모기 없는 집 만들어드려요', '바퀴 약 놓아드립니다', '방역 소독 경험 많아요'],
+    'tech_service': ['공유기 세팅해드려요', '노트북 느려진 것 고쳐드립니다', '프린터 연결 도와드려요', '와이파이 설치', '스마트폰 사용법 알려드려요'],
+    'life_helper': ['강아지 산책시켜드려요', '장보기 대신 해드립니다', '무거운 짐 옮겨드려요', '택배 대신 받아드립니다', '심부름 가능'],
+    'senior_support': ['어르신 병원 모셔다 드려요', '주민센터 서류 같이 떼드립니다', '영어 중국어 통역', '외국인 생활 안내', '약 타다 드려요'],
+}
+FILLERS = ['친절하게', '성실합니다', '주말 가능', '동네 주민입니다', '연락 주세요', '꼼꼼해요']
+QUERIES = {
+    'repair': ['싱크대가 막혔어요', '콘센트가 안 돼요', '화장실 누수가 있어요'],
+    'cleaning': ['욕실 곰팡이 좀 없애주세요', '이사 나가기 전에 먼지 청소'],
+    'pest_control': ['집에 벌레가 너무 많아요', '흰개미가 나왔어요'],
+    'tech_service': ['공유기 연결이 안 돼요', '노트북이 너무 느려요'],
+    'life_helper': ['강아지 산책 부탁드려요', '무거운 짐 좀 옮겨주세요'],
+    'senior_support': ['어머니 병원 동행해주실 분', '주민센터 서류 발급 도와주세요'],
+}
+
+
+def make_profiles(n):
+    profiles = []
+    for user_id in range(1, n + 1):
+        category = random.choice(list(PHRASES))
+        intro = ' '.join(random.sample(PHRASES[category], 2) + random.sample(FILLERS, 2))
+        profiles.append({'id': user_id, 'intro': intro, 'manner_temperature': 50, 'category': category})
+    return profiles
+
+
+def r_precision(scores, profiles, category):
+    """정답 카테고리 후보 수(R)만큼 상위 후보를 뽑았을 때의 정밀도 (동점은 무작위 순서)"""
+    relevant = np.array([p['category'] == category for p in profiles])
+    order = np.lexsort((np.random.random(len(scores)), -scores))
+    return relevant[order[:relevant.sum()]].mean()
+
+
+for n in NUM_USERS:
+    profiles = make_profiles(n)
+    ids = [p['id'] for p in profiles]
+
+    started = time.perf_counter()
+    keyword_cache = ProfileFeatureCache()
+    keyword_cache.ingest(profiles)
+    keyword_build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = SemanticMatcher(SemanticIntroIndex.build(profiles))
+    semantic_build = time.perf_counter() - started
+
+    keyword_times, semantic_times, keyword_quality, semantic_quality = [], [], [], []
+    for category, queries in QUERIES.items():
+        for query in queries:
+            started = time.perf_counter()
+            keyword_scores = keyword_cache.match_scores(query, category, profiles)
+            keyword_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            semantic_scores = matcher.match_scores(query, ids, keyword_scores)
+            semantic_times.append(time.perf_counter() - started)
+
+            keyword_quality.append(r_precision(keyword_scores, profiles, category))
+            semantic_quality.append(r_precision(semantic_scores, profiles, category))
+
+    print(f"[{n}명] 인덱스 생성: 키워드 {keyword_build * 1000:.0f}ms / 의미 {semantic_build * 1000:.0f}ms")
+    print(f"  요청당 지연 (중앙값): 키워드 {np.median(keyword_times) * 1000:.2f}ms / "
+          f"키워드+의미 {np.median(keyword_times) * 1000 + np.median(semantic_times) * 1000:.2f}ms")
+    print(f"  R-precision: 키워드 {np.mean(keyword_quality):.2f} / 키워드+의미 {np.mean(semantic_quality):.2f}")
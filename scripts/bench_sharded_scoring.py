@@ -0,0 +1,78 @@
+# bench_sharded_scoring.py
+# 대량 후보(기본 50,000명) 점수 계산: 인라인 vs 프로세스 풀 샤딩 (1~16 프로세스) 비교
+# 사용법: python scripts/bench_sharded_scoring.py [후보 수]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AI_service.settings')
+os.environ.setdefault('SECRET_KEY', 'bench')
+os.environ.setdefault('AI_LLM_BACKEND', 'fake')
+
+import django
+
+django.setup()
+
+from ai.degradation import SCORER_ML
+from ai.services import AIRecommendationService
+from ai.sharded_scoring import ShardedScoringExecutor
+
+# --- 설정 ---
+N_CANDIDATES = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+PROCESS_COUNTS = [1, 2, 4, 8, 16]
+TOP_K = 5
+REPEAT = 3
+REQUEST_TEXT = '에어컨 수리 잘하시는 기사님 찾아요'
+CATEGORY = 'repair'
+
+random.seed(42)
+INTROS = ['전기 수리 전문 기사입니다', '입주청소 깔끔하게 해드려요', '바퀴벌레 방역 경험 많아요', '',
+          '컴퓨터 설치와 와이파이 점검', '반려동물 산책과 심부름', '병원 동행과 통역 지원', '보일러 교체 숙련 기사']
+profiles = [{
+    'id': 100 + i,
+    'gender': random.choice(['male', 'female']),
+    'intro': f'{random.choice(INTROS)} {random.choice(INTROS)}',
+    'manner_temperature': random.randint(30, 90),
+} for i in range(N_CANDIDATES)]
+requester = {'id': 1, 'age_band': '30s'}
+
+service = AIRecommendationService()
+if service.model is None:
+    sys.exit("ml_models/recommendation_model.joblib 이 필요합니다 (scripts/train_model.py)")
+service.profile_features.ingest(profiles)
+
+
+def inline_top_k():
+    """현재 인라인 경로: 전체 점수 계산 후 정렬"""
+    n = len(profiles)
+    features = service._pair_features(profiles, [requester] * n, [CATEGORY] * n, 2)
+    match = service._profile_match_scores(profiles, [CATEGORY] * n, [REQUEST_TEXT] * n)
+    scores = [round(float(score), 3) for score in service._ml_scores(features, match)]
+    order = sorted(range(n), key=lambda i: -scores[i])[:TOP_K]
+    return [(i, scores[i]) for i in order]
+
+
+def best_of(func):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+print(f"후보 {N_CANDIDATES}명, CPU {os.cpu_count()}개 (프로세스 수가 CPU보다 많으면 속도 향상 없음)")
+baseline, expected = best_of(inline_top_k)
+print(f"{'인라인':<10} {baseline * 1000:>9.1f} ms")
+for processes in PROCESS_COUNTS:
+    executor = ShardedScoringExecutor(service, processes=processes, min_shard_size=1000)
+    try:
+        executor.top_k(profiles[:2000], requester, CATEGORY, REQUEST_TEXT, 2, SCORER_ML, TOP_K)  # 워커 준비
+        elapsed, result = best_of(
+            lambda: executor.top_k(profiles, requester, CATEGORY, REQUEST_TEXT, 2, SCORER_ML, TOP_K)[0])
+    finally:
+        executor.close()
+    assert result == expected, "샤딩 결과가 인라인 결과와 다릅니다"
+    print(f"{processes:>3} 프로세스 {elapsed * 1000:>9.1f} ms  (x{baseline / elapsed:.2f})")
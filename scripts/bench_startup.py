@@ -0,0 +1,64 @@
+# bench_startup.py
+# 워커가 첫 요청을 처리할 수 있을 때까지 걸리는 시간 측정
+#  - cold: 새 프로세스에서 앱 로딩 후 첫 요청 (preload 없이 워커를 띄우는 경우)
+#  - preload: 사전 로딩한 마스터에서 fork한 워커의 첫 요청 (gunicorn preload_app + max_requests 재시작)
+# 첫 요청은 URLConf import와 AIRecommendationService 생성(모델 로딩)까지 포함합니다.
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 5
+
+WORKER = r'''
+import os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AI_service.settings')
+os.environ.setdefault('SECRET_KEY', 'bench')
+os.environ.setdefault('AI_LLM_BACKEND', 'fake')
+import warnings; warnings.filterwarnings('ignore')
+from django.core.wsgi import get_wsgi_application
+
+
+def first_request():
+    """워커의 첫 요청 (URL 해석 + 추천 서비스 초기화)"""
+    from django.test import Client
+    Client().get('/api/ai/metrics/')
+    from ai.services import AIRecommendationService
+    AIRecommendationService()
+
+
+application = get_wsgi_application()
+if {preload}:
+    from ai.warmup import warm_up
+    warm_up()
+    import gc; gc.freeze()
+    pid = os.fork()
+    if pid == 0:
+        forked = time.perf_counter()
+        first_request()
+        print(time.perf_counter() - forked)
+        os._exit(0)
+    os.waitpid(pid, 0)
+else:
+    first_request()
+    print(time.perf_counter() - started)
+'''
+
+
+def measure(preload: bool) -> float:
+    # 인터프리터 시작 시간까지 포함하기 위해 바깥에서도 측정 (preload는 fork 시점부터)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', WORKER.format(root=ROOT, preload=preload)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    total = time.perf_counter() - started
+    return float(output.strip().splitlines()[-1]) if preload else total
+
+
+for name, preload in [('cold 워커', False), ('preload fork 워커', True)]:
+    samples = [measure(preload) for _ in range(REPEAT)]
+    print(f"{name:<18} 첫 요청까지 중앙값 {statistics.median(samples) * 1000:>8.1f} ms "
+          f"(최소 {min(samples) * 1000:.1f} ms)")
@@ -1,12 +1,18 @@
 # create_dummy_data.py
+import os
+import sys
 import pandas as pd
 import random
 
+# 학습/서빙과 같은 어휘를 사용하기 위해 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai.features import DEFAULT_VOCABULARY
+
 # --- 설정 ---
 NUM_SAMPLES = 5000  # 생성할 데이터 샘플 수
-CATEGORIES = ['repair', 'cleaning', 'pest_control', 'tech_service', 'life_helper', 'senior_support']
-AGE_BANDS = ['20s', '30s', '40s', '50s+']
-GENDERS = ['male', 'female']
+CATEGORIES = DEFAULT_VOCABULARY['category']
+AGE_BANDS = DEFAULT_VOCABULARY['requester_age']
+GENDERS = DEFAULT_VOCABULARY['candidate_gender']
 CITIES = ['미추홀구']
 
 # --- 데이터 생성 ---
@@ -0,0 +1,38 @@
+# profile_imports.py
+# 서비스 import 비용 프로파일: python -X importtime 결과를 누적 시간 순으로 정리
+# 사용법: python scripts/profile_imports.py [--top 30] [--module ai.urls]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--top', type=int, default=30, help="출력할 모듈 수")
+parser.add_argument('--module', default='ai.urls', help="django.setup() 후 import할 모듈")
+args = parser.parse_args()
+
+code = f"import django; django.setup(); import {args.module}"
+env = dict(os.environ)
+env.setdefault('DJANGO_SETTINGS_MODULE', 'AI_service.settings')
+env.setdefault('SECRET_KEY', 'profile')
+result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                        capture_output=True, text=True)
+if result.returncode != 0:
+    sys.stderr.write(result.stderr)
+    sys.exit(result.returncode)
+
+rows = []
+for line in result.stderr.splitlines():
+    if not line.startswith('import time:') or 'self [us]' in line:
+        continue
+    self_us, cumulative_us, name = line[len('import time:'):].split('|')
+    rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+# 최상위 모듈(들여쓰기 없음)의 누적 시간 합 = 전체 import 시간
+total_us = sum(cumulative for cumulative, _, name in rows if not name.startswith('  '))
+print(f"전체 import 시간: {total_us / 1000:.1f} ms\n")
+print(f"{'누적(ms)':>10} {'자체(ms)':>10}  모듈")
+for cumulative, self_us, name in sorted(rows, reverse=True)[:args.top]:
+    print(f"{cumulative / 1000:>10.1f} {self_us / 1000:>10.1f}  {name}")
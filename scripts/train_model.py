@@ -1,18 +1,27 @@
 # train_model.py
+import os
+import sys
+
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 import joblib
 
+# 서빙 코드와 같은 인코더를 사용하기 위해 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai.features import FeatureEncoder, NUMERIC_FEATURES, CATEGORICAL_FEATURES
+
 # 1. 데이터 로드
 # 이 CSV 파일은 1단계에서 생성한 데이터라고 가정합니다.
 data = pd.read_csv('./data/recommendation_logs.csv')
 
 # 2. 데이터 전처리
-# 모델이 학습할 수 있도록 텍스트 데이터를 숫자로 변환합니다 (One-Hot Encoding).
-features = pd.get_dummies(data[['relationship_degree', 'category', 'requester_age', 'candidate_gender']])
-labels = data['is_successful'] # 'is_successful'은 0 또는 1의 값을 가짐
+# 학습 어휘로 인코더를 만들고, 서빙과 동일한 방식으로 원-핫 인코딩합니다.
+records = data[list(NUMERIC_FEATURES + CATEGORICAL_FEATURES)].to_dict('records')
+encoder = FeatureEncoder.fit(records)
+features = encoder.encode_batch(records)
+labels = data['is_successful'].to_numpy() # 'is_successful'은 0 또는 1의 값을 가짐
 
 # 3. 학습/테스트 데이터 분리
 X_train, X_test, y_train, y_test = train_test_split(features, labels, test_size=0.2, random_state=42)
@@ -24,7 +33,8 @@ model.fit(X_train, y_train)
 # 5. 모델 평가
 predictions = model.predict(X_test)
 print(f"모델 정확도: {accuracy_score(y_test, predictions):.2f}")
+print(f"Features: {encoder.feature_names}")
 
-# 6. 학습된 모델 파일로 저장
-joblib.dump(model, 'recommendation_model.joblib')
-print("모델이 'recommendation_model.joblib' 파일로 저장되었습니다.")
\ No newline at end of file
+# 6. 학습된 모델을 인코더와 함께 파일로 저장
+joblib.dump({'model': model, 'feature_encoder': encoder.to_dict()}, 'recommendation_model.joblib')
+print("모델이 'recommendation_model.joblib' 파일로 저장되었습니다.")